@@ -1,7 +1,9 @@
 # app/__init__.py
 from flask import Flask, jsonify
-from app.extensions import db, jwt, limiter, cache, cors, mail, migrate
+from app.extensions import db, jwt, cache, cors, mail, migrate
+from app.middleware.rate_limiter import limiter
 from app.config import get_config
+from app.utils.json_provider import get_json_provider
 
 
 def create_app(config_name='development'):
@@ -11,6 +13,7 @@ def create_app(config_name='development'):
     # Configuration
     config = get_config(config_name)
     app.config.from_object(config)
+    app.json = get_json_provider(app)
     
     # Initialisation des extensions
     init_extensions(app)
@@ -81,13 +84,11 @@ def register_error_handlers(app):
 
 def setup_jwt_callbacks(app):
     """Configuration des callbacks JWT"""
-    # from flask_jwt_extended import get_jwt
-    # from app.services.token_service import TokenService
+    from app.services.token_service import TokenService
     
-    # @jwt.token_in_blocklist_loader
-    # def check_if_token_revoked(jwt_header, jwt_payload):
-    #    jti = jwt_payload['jti']
-    #    return TokenService.is_token_blacklisted(jti)
+    @jwt.token_in_blocklist_loader
+    def check_if_token_revoked(jwt_header, jwt_payload):
+        return TokenService.is_token_revoked(jwt_payload)
     
     @jwt.expired_token_loader
     def expired_token_callback(jwt_header, jwt_payload):
@@ -0,0 +1,103 @@
+# app/asgi.py
+"""Mode ASGI: lectures de taux en asyncio, le reste de l'API servi par l'application WSGI"""
+import asyncio
+import io
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from flask import current_app
+from app import create_app
+from app.services.async_rate_service import AsyncRateService
+
+
+class AsgiApp:
+    """Application ASGI devant l'application Flask
+    
+    Les routes de ASYNC_ROUTES (lectures de taux, limitées par le réseau) sont
+    des vues asyncio exécutées sur la boucle d'événements, dans un contexte de
+    requête Flask (before/after_request, g, extensions); un worker sert ainsi
+    de nombreuses connexions concurrentes. Les autres routes passent par
+    WsgiToAsgi, comme sous Gunicorn.
+    """
+    
+    def __init__(self, flask_app, routes):
+        self.flask_app = flask_app
+        self.routes = routes
+        self.wsgi = WsgiToAsgi(flask_app)
+        flask_app.extensions['asgi'] = True
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self.lifespan(receive, send)
+        
+        view = self.routes.get((scope.get('method'), scope.get('path'))) if scope['type'] == 'http' else None
+        if view is None:
+            return await self.wsgi(scope, receive, send)
+        
+        return await self.dispatch(view, scope, receive, send)
+    
+    async def dispatch(self, view, scope, receive, send):
+        """Exécute une vue asyncio dans un contexte de requête Flask"""
+        body = io.BytesIO()
+        while True:
+            message = await receive()
+            body.write(message.get('body', b''))
+            if not message.get('more_body'):
+                break
+        body.seek(0)
+        
+        # Même environ WSGI que pour les routes transmises à l'application Flask
+        instance = WsgiToAsgiInstance(self.flask_app)
+        instance.scope = scope
+        environ = instance.build_environ(scope, body)
+        
+        with self.flask_app.request_context(environ):
+            try:
+                response = self.flask_app.preprocess_request()
+                if response is None:
+                    response = await view()
+                response = self.flask_app.make_response(response)
+            except Exception as e:
+                response = self.flask_app.make_response(self.flask_app.handle_user_exception(e))
+            response = self.flask_app.process_response(response)
+            data = response.get_data()
+        
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in response.headers.items()
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': data})
+    
+    async def lifespan(self, receive, send):
+        """Démarrage et arrêt du worker (fermeture des connexions asyncio)"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                with self.flask_app.app_context():
+                    await close_async_resources()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+async def close_async_resources():
+    """Ferme le client HTTP, le client Redis et les engines asyncio de la boucle courante"""
+    loop = asyncio.get_running_loop()
+    await AsyncRateService.close()
+    
+    client = current_app.extensions.get('async_redis', {}).pop(loop, None)
+    if client is not None:
+        await client.aclose()
+    
+    for engine in current_app.extensions.get('async_engines', {}).pop(loop, {}).values():
+        await engine.dispose()
+
+
+def create_asgi_app(config_name='production'):
+    """Crée l'application ASGI (uvicorn asgi:app)"""
+    from app.routes.async_rates import ASYNC_ROUTES
+    
+    return AsgiApp(create_app(config_name), ASYNC_ROUTES)
@@ -1,6 +1,32 @@
 # app/config/base.py
 import os
 from datetime import timedelta
+from app.database import REPLICA_BIND_PREFIX, engine_options
+
+
+def _bind_options(url, prefix):
+    """Options de pool d'un bind lues depuis l'environnement (DB_POOL_SIZE, DB_REPLICA_POOL_SIZE...)"""
+    def env(name, default=None):
+        return os.environ.get(f'{prefix}{name}', os.environ.get(f'DB_{name}', default))
+    
+    return engine_options(
+        url,
+        pre_ping=env('POOL_PRE_PING', 'true').lower() == 'true',
+        recycle=int(env('POOL_RECYCLE', 1800)),
+        pool_size=int(env('POOL_SIZE', 0)) or None,
+        max_overflow=int(env('MAX_OVERFLOW')) if env('MAX_OVERFLOW') else None,
+        timeout=int(env('POOL_TIMEOUT', 0)) or None
+    )
+
+
+def _replica_binds(urls):
+    """Binds des réplicas en lecture (DATABASE_REPLICA_URLS, séparées par des virgules)"""
+    urls = [url.strip() for url in (urls or '').split(',') if url.strip()]
+    return {
+        f'{REPLICA_BIND_PREFIX}{index}': {'url': url, **_bind_options(url, 'DB_REPLICA_')}
+        for index, url in enumerate(urls, start=1)
+    }
+
 
 class BaseConfig:
     """Configuration de base"""
@@ -11,6 +37,11 @@ class BaseConfig:
     # Database
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _bind_options(SQLALCHEMY_DATABASE_URI, 'DB_')
+    
+    # Réplicas en lecture: les vues en lecture seule y envoient leurs SELECT
+    SQLALCHEMY_BINDS = _replica_binds(os.environ.get('DATABASE_REPLICA_URLS'))
+    DB_REPLICA_STICKINESS = int(os.environ.get('DB_REPLICA_STICKINESS', 10))  # Relecture du primaire après écriture (secondes)
     
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-change-in-production')
@@ -22,14 +53,35 @@ class BaseConfig:
     # Session Configuration
     SESSION_TIMEOUT = timedelta(days=30)
     MAX_SESSIONS_PER_USER = 5
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'sql')  # sql ou redis (sessions actives dans Redis)
+    SESSION_ACTIVITY_FLUSH_BATCH = 1000   # Activités de sessions reportées en base par lot (backend redis)
     
     # Cache Configuration (Redis)
     CACHE_TYPE = "redis"
     CACHE_REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
     CACHE_DEFAULT_TIMEOUT = 300
     
-    # Rate Limiting
-    RATELIMIT_STORAGE_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/1')
+    # Redis (structures hors cache: popularité des paires...)
+    REDIS_URL = os.environ.get('REDIS_URL', 'redis://localhost:6379/0')
+    REDIS_SOCKET_TIMEOUT = 0.5            # Secondes, avant repli sur la base
+    
+    # Révocation des tokens (filtre de Bloom local synchronisé par un flux Redis)
+    REVOCATION_STREAM = 'revocations'
+    REVOCATION_SYNC_INTERVAL = 1.0        # Secondes entre deux lectures du flux par worker
+    REVOCATION_FILTER_CAPACITY = 100000   # Révocations actives attendues
+    REVOCATION_FILTER_ERROR_RATE = 0.001  # Faux positifs (confirmés dans Redis)
+    
+    # Popularité des paires (sorted sets Redis horaires)
+    POPULARITY_RETENTION_DAYS = 30        # Durée de vie des buckets horaires
+    POPULARITY_WINDOW_CACHE = 60          # Cache des unions de fenêtres (secondes)
+    POPULAR_PAIRS_REFRESH_LIMIT = 30      # Paires classées rafraîchies et préchauffées en plus de POPULAR_PAIRS
+    
+    # Rate Limiting: compteurs locaux reportés dans Redis par lots (redis:// pour un aller-retour par requête)
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI', 'local+redis://localhost:6379/1')
+    RATELIMIT_STORAGE_OPTIONS = {
+        'sync_interval': float(os.environ.get('RATELIMIT_SYNC_INTERVAL', 0.1)),  # Secondes entre deux reports
+        'sync_hits': int(os.environ.get('RATELIMIT_SYNC_HITS', 20)),  # Coups locaux max par clé avant report
+    }
     RATELIMIT_DEFAULT = "1000 per hour"
     
     # Email Configuration
@@ -43,6 +95,16 @@ class BaseConfig:
     # Currency API Keys
     FIXER_API_KEY = os.environ.get('FIXER_API_KEY')
     EXCHANGERATE_API_KEY = os.environ.get('EXCHANGERATE_API_KEY')
+    FIXER_API_URL = os.environ.get('FIXER_API_URL')  # Défaut: URL publique du provider
+    ECB_API_URL = os.environ.get('ECB_API_URL')
+    
+    # Mode ASGI (asgi.py): lectures de taux servies en asyncio
+    ASYNC_RATES_CACHE_TTL = int(os.environ.get('ASYNC_RATES_CACHE_TTL', 60))  # Table de taux du provider gardée dans Redis (secondes)
+    ASYNC_HTTP_MAX_CONNECTIONS = int(os.environ.get('ASYNC_HTTP_MAX_CONNECTIONS', 100))  # Connexions sortantes simultanées vers les providers, par worker
+    
+    # Réponses JSON: 'orjson' (si installé) ou 'json'; Decimal en 'float', 'string' ou 'number' exact
+    JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson')
+    JSON_DECIMAL_MODE = os.environ.get('JSON_DECIMAL_MODE', 'float')
     
     # Currency Configuration
     DEFAULT_BASE_CURRENCY = 'USD'
@@ -50,8 +112,52 @@ class BaseConfig:
     RATE_CACHE_TIMEOUT = 600    # 10 minutes
     CONVERSION_FEE_RATE = 0.01  # 1%
     
+    # Graphe des devises (paires multi-sauts)
+    RATE_GRAPH_MAX_HOPS = 3
+    RATE_GRAPH_MAX_AGE = 3600             # Arêtes plus anciennes ignorées (secondes)
+    RATE_GRAPH_REFRESH_INTERVAL = 300     # Reconstruction du graphe (secondes)
+    
+    # Historique des taux ("as of")
+    RATE_HISTORY_WINDOW_DAYS = 7          # Fenêtre gardée en mémoire par paire
+    RATE_HISTORY_MAX_PAIRS = 50           # Nombre de paires gardées en mémoire (LRU)
+    RATE_HISTORY_REFRESH_INTERVAL = 300   # Rechargement des séries (secondes)
+    
+    # Compaction de l'historique des taux (paliers de résolution)
+    RATE_FULL_RESOLUTION_DAYS = 7         # Tous les taux
+    RATE_HOURLY_RESOLUTION_DAYS = 90      # Un taux par heure, puis un par jour au-delà
+    
+    # Export analytique (Parquet, requirements/analytics.txt)
+    EXPORT_DIR = os.environ.get('EXPORT_DIR', 'exports')
+    EXPORT_BATCH_SIZE = 50000             # Lignes lues par lot et tamponnées avant écriture
+    EXPORT_LAG = int(os.environ.get('EXPORT_LAG', 300))  # Lignes plus récentes (secondes) reportées au prochain export
+    
+    # Rétention et partitionnement (PostgreSQL, partitions mensuelles sur created_at)
+    RATE_RETENTION_DAYS = 365
+    CANDLE_RETENTION_DAYS = {'1m': 7, '5m': 90}  # Par intervalle; 1h et 1d conservées
+    CONVERSION_RETENTION_DAYS = int(os.environ.get('CONVERSION_RETENTION_DAYS', 0)) or None  # None: conservées
+    PARTITION_MONTHS_AHEAD = 3            # Partitions créées à l'avance
+    PARTITION_RETENTION_MODE = os.environ.get('PARTITION_RETENTION_MODE', 'drop')  # drop ou detach
+    RETENTION_BATCH_SIZE = 1000           # Lignes par lot de suppression
+    RETENTION_BATCH_PAUSE = 0.05          # Pause entre deux lots (secondes)
+    
+    # Identifiants des lignes
+    ID_GENERATOR = os.environ.get('ID_GENERATOR', 'uuid7')   # uuid7 (ordonné dans le temps) ou uuid4
+    ID_STORAGE = os.environ.get('ID_STORAGE', 'string')      # binary (uuid natif / 16 octets) ou string; voir scripts/migrate_ids.py
+    
     # Security
-    BCRYPT_LOG_ROUNDS = 12
+    PASSWORD_HASH_ALGORITHM = os.environ.get('PASSWORD_HASH_ALGORITHM', 'bcrypt')  # bcrypt, pbkdf2 ou scrypt
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    PBKDF2_ITERATIONS = 600000
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0))  # 0: un thread par cœur
+    PASSWORD_HASH_QUEUE_LIMIT = 32        # Calculs en attente au-delà desquels la connexion est refusée (503)
+    PASSWORD_HASH_TIMEOUT = 5             # Attente maximale d'un calcul (secondes)
+    
+    # Clés API des clients machine (en-tête X-API-Key)
+    API_KEY_HEADER = 'X-API-Key'
+    API_KEY_CACHE_SIZE = 10000            # Empreintes gardées en mémoire par worker (LRU)
+    API_KEY_NEGATIVE_CACHE_SIZE = 1000    # Empreintes inconnues, dans un LRU séparé
+    API_KEY_CACHE_TTL = 60                # Relecture en base après ce délai (secondes)
+    API_KEY_DEFAULT_RATE_LIMIT = os.environ.get('API_KEY_DEFAULT_RATE_LIMIT', '10000 per hour')
     
     # CORS
     CORS_ORIGINS = ["http://localhost:3000", "http://localhost:5000"]
\ No newline at end of file
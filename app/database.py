@@ -0,0 +1,172 @@
+# app/database.py
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+import random
+import weakref
+from flask import current_app, g, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql import Select
+
+
+REPLICA_BIND_PREFIX = 'replica_'
+
+# Drivers asyncio des dialectes supportés en mode ASGI (requirements/async.txt)
+ASYNC_DRIVERS = {'postgresql': 'asyncpg', 'sqlite': 'aiosqlite'}
+
+# Actif dans les routes et appels de service marqués en lecture seule
+_read_only = ContextVar('db_read_only', default=False)
+
+
+def engine_options(url, pre_ping=True, recycle=1800, pool_size=None, max_overflow=None, timeout=None):
+    """Options d'engine SQLAlchemy d'un bind (pool dimensionné hors SQLite)"""
+    options = {
+        'pool_pre_ping': pre_ping,
+        'pool_recycle': recycle
+    }
+
+    if not url.startswith('sqlite'):
+        options.update({
+            'pool_size': pool_size or 10,
+            'max_overflow': 20 if max_overflow is None else max_overflow,
+            'pool_timeout': timeout or 30
+        })
+
+    return options
+
+
+class RoutingSession(Session):
+    """Session qui envoie les SELECT des sections en lecture seule vers un réplica
+
+    Les écritures, les flush, les SELECT ... FOR UPDATE et les requêtes textuelles
+    restent sur le primaire. Un utilisateur qui vient d'écrire relit le primaire
+    pendant DB_REPLICA_STICKINESS secondes (read-your-writes).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and _read_only.get() and not self._flushing
+                and isinstance(clause, Select) and clause._for_update_arg is None):
+            replicas = [
+                engine for key, engine in self._db.engines.items()
+                if key and key.startswith(REPLICA_BIND_PREFIX)
+            ]
+            if replicas and not is_sticky():
+                return random.choice(replicas)
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@contextmanager
+def read_only():
+    """Route les lectures du bloc (ou de la vue/fonction décorée) vers les réplicas
+
+    Utilisable en décorateur: @read_only()
+    """
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+def get_async_engine(read_only=False):
+    """Engine asyncio de la boucle d'événements courante (mode ASGI)
+
+    Même base et mêmes options de pool que l'engine synchrone du bind; en
+    lecture seule, un réplica s'il y en a. Les connexions asyncio sont liées
+    à leur boucle: un jeu d'engines par boucle.
+    """
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.extensions import db
+
+    replicas = [key for key in db.engines if key and key.startswith(REPLICA_BIND_PREFIX)]
+    key = random.choice(replicas) if read_only and replicas else None
+
+    engines = current_app.extensions.setdefault('async_engines', weakref.WeakKeyDictionary())
+    loop_engines = engines.setdefault(asyncio.get_running_loop(), {})
+
+    engine = loop_engines.get(key)
+    if engine is None:
+        url = db.engines[key].url
+        url = url.set(drivername=f"{url.get_backend_name()}+{ASYNC_DRIVERS[url.get_backend_name()]}")
+        if key is None:
+            options = current_app.config['SQLALCHEMY_ENGINE_OPTIONS']
+        else:
+            options = {name: value for name, value in current_app.config['SQLALCHEMY_BINDS'][key].items() if name != 'url'}
+        engine = loop_engines[key] = create_async_engine(url, **options)
+
+    return engine
+
+
+@contextmanager
+def unit_of_work():
+    """Exécute le bloc dans une seule transaction: un commit à la sortie, rollback sur erreur
+
+    Les modèles y sont enregistrés avec save(commit=False) (flush sans commit).
+    """
+    from app.extensions import db
+
+    try:
+        yield db.session
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def _current_user_id():
+    """Identité JWT de la requête en cours, si déjà vérifiée (sans décoder le token)"""
+    if not has_request_context():
+        return None
+
+    context = g.get('auth_context')
+    return context.user_id if context else None
+
+
+def mark_write():
+    """Enregistre une écriture: la requête et l'utilisateur relisent le primaire"""
+    if not has_request_context():
+        return
+
+    g.db_wrote = True
+
+    user_id = _current_user_id()
+    if user_id:
+        from app.extensions import cache
+        cache.set(f"db_sticky:{user_id}", True,
+                  timeout=current_app.config.get('DB_REPLICA_STICKINESS', 10))
+
+
+def is_sticky():
+    """Vérifie si la requête ou l'utilisateur doit relire le primaire"""
+    if not has_request_context():
+        return False
+
+    if g.get('db_wrote'):
+        return True
+
+    user_id = _current_user_id()
+    if not user_id:
+        return False
+
+    # Une lecture du cache par requête, quel que soit le nombre de requêtes SQL
+    sticky = g.get('db_sticky')
+    if sticky is None:
+        from app.extensions import cache
+        sticky = g.db_sticky = bool(cache.get(f"db_sticky:{user_id}"))
+    return sticky
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _mark_flush_write(session, flush_context):
+    """Les flush ORM comptent comme écritures"""
+    if session.new or session.dirty or session.deleted:
+        mark_write()
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _mark_statement_write(orm_execute_state):
+    """Les INSERT/UPDATE/DELETE exécutés directement comptent comme écritures"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mark_write()
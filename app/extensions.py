@@ -1,16 +1,14 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from flask_caching import Cache
 from flask_cors import CORS
 from flask_mail import Mail
 from flask_migrate import Migrate
+from app.database import RoutingSession
 
 # Initialisation des extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
-limiter = Limiter(key_func=get_remote_address)
 cache = Cache()
 cors = CORS()
 mail = Mail()
@@ -1,6 +1,11 @@
 # app/middleware/__init__.py
-from app.middleware.auth_middleware import token_required, optional_auth
+from app.middleware.auth_middleware import (
+    token_required, optional_auth, auth_required, scope_required, get_auth_context, current_user_id
+)
 from app.middleware.rate_limiter import limiter
 from app.middleware.cors import cors
 
-__all__ = ['token_required', 'optional_auth', 'limiter', 'cors']
+__all__ = [
+    'token_required', 'optional_auth', 'auth_required', 'scope_required',
+    'get_auth_context', 'current_user_id', 'limiter', 'cors'
+]
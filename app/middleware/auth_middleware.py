@@ -1,19 +1,122 @@
 # app/middleware/auth_middleware.py
 from functools import wraps
-from flask import request, jsonify
+from flask import current_app, g, jsonify, request
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt
 from app.utils.exceptions import AuthenticationError
 
 
+class AuthContext:
+    """Identité et claims du token d'accès de la requête en cours
+    
+    Le token est décodé et vérifié (signature, expiration, révocation) une
+    seule fois par requête: la clé du rate limiter, les décorateurs et les
+    routes lisent ensuite ce contexte, mis en cache sur g. Une requête portant
+    une clé API (en-tête API_KEY_HEADER) est authentifiée par la clé, sans JWT.
+    """
+    
+    __slots__ = ('user_id', 'claims', 'error', 'api_key')
+    
+    def __init__(self, user_id=None, claims=None, error=None, api_key=None):
+        self.user_id = user_id
+        self.claims = claims or {}
+        self.error = error  # Exception levée par la vérification d'un token invalide
+        self.api_key = api_key  # ApiKeyIdentity des clients machine
+    
+    @property
+    def is_authenticated(self):
+        return self.user_id is not None
+
+
+def get_auth_context():
+    """Contexte d'authentification de la requête (décodé au premier appel)"""
+    if 'auth_context' not in g:
+        raw_key = request.headers.get(current_app.config['API_KEY_HEADER'])
+        if raw_key:
+            g.auth_context = _api_key_context(raw_key)
+        else:
+            try:
+                verify_jwt_in_request(optional=True)
+                g.auth_context = AuthContext(get_jwt_identity(), get_jwt())
+            except Exception as e:
+                g.auth_context = AuthContext(error=e)
+    
+    return g.auth_context
+
+
+def _api_key_context(raw_key):
+    """Contexte d'une requête authentifiée par clé API"""
+    from app.services.api_key_service import ApiKeyService
+    
+    identity = ApiKeyService.authenticate(raw_key)
+    if identity is None:
+        return AuthContext(error=AuthenticationError('Clé API invalide ou révoquée'))
+    return AuthContext(identity.user_id, api_key=identity)
+
+
+def current_user_id():
+    """ID de l'utilisateur authentifié, None si anonyme ou token invalide"""
+    return get_auth_context().user_id
+
+
+def current_api_key():
+    """ApiKeyIdentity de la requête (None hors authentification par clé API)"""
+    return get_auth_context().api_key
+
+
+def current_claims():
+    """Claims du token d'accès de la requête ({} si anonyme)"""
+    return get_auth_context().claims
+
+
+def auth_required(f):
+    """Décorateur équivalent à @jwt_required() s'appuyant sur le contexte de la requête
+    
+    Les erreurs de vérification sont relancées telles quelles: les réponses
+    restent celles des callbacks JWT (token expiré, invalide, révoqué). Les
+    clés API ne donnent pas accès à ces routes (voir scope_required).
+    """
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        context = get_auth_context()
+        if context.api_key is not None or isinstance(context.error, AuthenticationError):
+            return jsonify({'error': 'Route réservée aux utilisateurs connectés'}), 401
+        if context.error is not None:
+            raise context.error
+        if not context.is_authenticated:
+            verify_jwt_in_request()  # Token absent: NoAuthorizationError (sauf méthodes exemptées)
+        return f(*args, **kwargs)
+    return decorated
+
+
+def scope_required(scope):
+    """Décorateur ouvrant une route aux clés API portant le scope
+    
+    Sans clé API, la requête passe inchangée (utilisateur connecté ou anonyme);
+    une clé invalide ou sans le scope est refusée.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            context = get_auth_context()
+            
+            if isinstance(context.error, AuthenticationError):
+                return jsonify({'error': str(context.error)}), 401
+            
+            if context.api_key is not None and not context.api_key.has_scope(scope):
+                return jsonify({'error': f'Scope requis: {scope}'}), 403
+            
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
+
+
 def token_required(f):
     """Décorateur pour exiger un token valide"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        try:
-            verify_jwt_in_request()
-            return f(*args, **kwargs)
-        except Exception as e:
+        if not get_auth_context().is_authenticated:
             return jsonify({'error': 'Token invalide ou manquant'}), 401
+        return f(*args, **kwargs)
     return decorated
 
 
@@ -21,10 +124,7 @@ def optional_auth(f):
     """Décorateur pour authentification optionnelle"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        try:
-            verify_jwt_in_request(optional=True)
-        except Exception:
-            pass  # Ignorer les erreurs d'authentification
+        get_auth_context()  # Les erreurs d'authentification sont ignorées
         return f(*args, **kwargs)
     return decorated
 
@@ -33,14 +133,13 @@ def admin_required(f):
     """Décorateur pour exiger les droits admin"""
     @wraps(f)
     def decorated(*args, **kwargs):
-        try:
-            verify_jwt_in_request()
-            claims = get_jwt()
-            
-            if not claims.get('is_admin', False):
-                return jsonify({'error': 'Droits administrateur requis'}), 403
-            
-            return f(*args, **kwargs)
-        except Exception as e:
+        context = get_auth_context()
+        
+        if not context.is_authenticated:
             return jsonify({'error': 'Token invalide ou manquant'}), 401
+        
+        if not context.claims.get('is_admin', False):
+            return jsonify({'error': 'Droits administrateur requis'}), 403
+        
+        return f(*args, **kwargs)
     return decorated
@@ -0,0 +1,212 @@
+# app/middleware/rate_limit_storage.py
+import logging
+import os
+import threading
+import time
+import redis
+from limits.storage import Storage
+
+logger = logging.getLogger(__name__)
+
+# Incrémente un compteur, pose son expiration à la création et retourne (valeur, ttl en ms)
+INCR_EXPIRE_SCRIPT = """
+local current = redis.call('incrby', KEYS[1], ARGV[2])
+if current == tonumber(ARGV[2]) then
+    redis.call('expire', KEYS[1], ARGV[1])
+end
+return {current, redis.call('pttl', KEYS[1])}
+"""
+
+
+class _Window:
+    """Fenêtre locale d'une clé: total global connu et coups non encore reportés"""
+    
+    __slots__ = ('expires_at', 'expiry', 'synced', 'pending')
+    
+    def __init__(self, expiry, now):
+        self.expiry = int(expiry)
+        self.expires_at = now + expiry
+        self.synced = 0
+        self.pending = 0
+
+
+class LocalBucketStorage(Storage):
+    """Stockage flask-limiter: compteurs en mémoire réconciliés avec Redis par lots
+    
+    Chaque coup est compté localement (aucun aller-retour réseau); les coups
+    en attente de toutes les clés sont reportés dans Redis en un seul pipeline
+    toutes les sync_interval secondes, ou dès qu'une clé accumule sync_hits
+    coups. La réponse de Redis donne le total global de la fenêtre, utilisé
+    pour les décisions suivantes.
+    
+    Dépassement borné: un processus admet au plus sync_hits coups non reportés
+    par clé (un thread qui atteint ce seuil attend le report en cours), soit
+    au plus (nombre de processus x sync_hits) requêtes de trop par fenêtre
+    tant que Redis répond. Si Redis est injoignable, chaque processus applique
+    la limite seul (jusqu'à nombre de processus x limite par fenêtre) et les
+    coups sont reportés au retour de Redis.
+    
+    URI: local+redis://host:port/db (stratégie fixed-window).
+    """
+    
+    STORAGE_SCHEME = ['local+redis', 'local+rediss']
+    KEY_PREFIX = 'ratelimit'
+    PURGE_INTERVAL = 10  # Secondes entre deux purges des fenêtres expirées
+    RETRY_DELAY = 1.0    # Secondes sans tentative de report après une erreur Redis
+    
+    def __init__(self, uri, wrap_exceptions=False, sync_interval=0.1, sync_hits=20,
+                 socket_timeout=0.5, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self.sync_interval = float(sync_interval)
+        self.sync_hits = int(sync_hits)
+        self.client = redis.from_url(
+            uri.split('+', 1)[1], socket_timeout=socket_timeout, decode_responses=True
+        )
+        self.script = self.client.register_script(INCR_EXPIRE_SCRIPT)
+        self._reset_state()
+    
+    def _reset_state(self):
+        """État local du processus courant (réinitialisé après un fork des workers)"""
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.sync_lock = threading.Lock()
+        self.windows = {}
+        self.dirty = set()
+        self.synced_at = time.time()
+        self.purged_at = self.synced_at
+        self.retry_at = 0
+    
+    @property
+    def base_exceptions(self):
+        return redis.RedisError
+    
+    def _window(self, key, expiry, now):
+        """Fenêtre courante d'une clé (nouvelle si absente ou expirée), sous self.lock"""
+        window = self.windows.get(key)
+        if window is None or window.expires_at <= now:
+            window = self.windows[key] = _Window(expiry, now)
+            self.dirty.discard(key)
+        return window
+    
+    def incr(self, key, expiry, elastic_expiry=False, amount=1):
+        if self.pid != os.getpid():
+            self._reset_state()
+        
+        now = time.time()
+        with self.lock:
+            window = self._window(key, expiry, now)
+            window.pending += amount
+            self.dirty.add(key)
+            full = window.pending >= self.sync_hits
+            due = full or now - self.synced_at >= self.sync_interval
+            value = window.synced + window.pending
+        
+        if not due:
+            return value
+        
+        # Seuil atteint: attendre le report en cours plutôt que d'admettre au-delà de sync_hits
+        self.sync(wait=full)
+        with self.lock:
+            window = self._window(key, expiry, time.time())
+            return window.synced + window.pending
+    
+    def sync(self, wait=False):
+        """Reporte les coups en attente dans Redis et relit les totaux globaux
+        
+        Sans wait, rend la main si un report est déjà en cours: le thread
+        continue sur l'estimation locale. Avec wait, attend la fin de ce
+        report puis reporte les coups restants.
+        """
+        # Un seul report à la fois
+        if not self.sync_lock.acquire(blocking=wait):
+            return
+        
+        try:
+            now = time.time()
+            if now < self.retry_at:
+                return
+            
+            with self.lock:
+                self.synced_at = now
+                batch = []
+                for key in self.dirty:
+                    window = self.windows[key]
+                    batch.append((key, window, window.pending))
+                    # En vol: compté dans le total connu jusqu'à la réponse de Redis
+                    window.synced += window.pending
+                    window.pending = 0
+                self.dirty.clear()
+                
+                if now - self.purged_at >= self.PURGE_INTERVAL:
+                    self._purge(now)
+            
+            if not batch:
+                return
+            
+            try:
+                pipeline = self.client.pipeline(transaction=False)
+                for key, window, pending in batch:
+                    self.script(keys=[f"{self.KEY_PREFIX}:{key}"], args=[window.expiry, pending], client=pipeline)
+                results = pipeline.execute()
+            except redis.RedisError as e:
+                logger.warning(f"Report des limites de débit impossible: {e}")
+                self.retry_at = time.time() + self.RETRY_DELAY
+                with self.lock:
+                    for key, window, pending in batch:
+                        window.synced -= pending
+                        window.pending += pending
+                        if self.windows.get(key) is window:
+                            self.dirty.add(key)
+                return
+            
+            now = time.time()
+            with self.lock:
+                for (key, window, pending), (current, ttl) in zip(batch, results):
+                    window.synced = int(current)
+                    if ttl > 0:
+                        # Fenêtre alignée sur celle de Redis, partagée par tous les processus
+                        window.expires_at = now + ttl / 1000
+        finally:
+            self.sync_lock.release()
+    
+    def _purge(self, now):
+        """Supprime les fenêtres expirées sans coup en attente, sous self.lock"""
+        self.purged_at = now
+        expired = [
+            key for key, window in self.windows.items()
+            if window.expires_at <= now and key not in self.dirty
+        ]
+        for key in expired:
+            del self.windows[key]
+    
+    def get(self, key):
+        with self.lock:
+            window = self.windows.get(key)
+            if window is None or window.expires_at <= time.time():
+                return 0
+            return window.synced + window.pending
+    
+    def get_expiry(self, key):
+        with self.lock:
+            window = self.windows.get(key)
+            return window.expires_at if window else time.time()
+    
+    def check(self):
+        try:
+            return bool(self.client.ping())
+        except redis.RedisError:
+            return False
+    
+    def reset(self):
+        with self.lock:
+            self.windows.clear()
+            self.dirty.clear()
+        
+        keys = list(self.client.scan_iter(match=f"{self.KEY_PREFIX}:*"))
+        return self.client.delete(*keys) if keys else 0
+    
+    def clear(self, key):
+        with self.lock:
+            self.windows.pop(key, None)
+            self.dirty.discard(key)
+        self.client.delete(f"{self.KEY_PREFIX}:{key}")
@@ -1,23 +1,34 @@
 # app/middleware/rate_limiter.py
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask import request
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from app.middleware.auth_middleware import get_auth_context
+from app.middleware import rate_limit_storage  # noqa: F401 (enregistre le schéma local+redis://)
 
 
 def get_user_id():
-    """Récupère l'ID utilisateur pour le rate limiting personnalisé"""
-    try:
-        verify_jwt_in_request(optional=True)
-        user_id = get_jwt_identity()
-        return user_id if user_id else get_remote_address()
-    except:
-        return get_remote_address()
+    """Récupère l'ID utilisateur pour le rate limiting personnalisé (contexte de la requête)
+    
+    Les requêtes par clé API sont comptées par clé (quota propre à chaque clé).
+    """
+    context = get_auth_context()
+    if context.api_key is not None:
+        return f"api_key:{context.api_key.id}"
+    return context.user_id or get_remote_address()
 
 
-# Configuration du rate limiter
+def api_key_limit(default):
+    """Limite d'une route: quota de la clé API de la requête, sinon la limite par défaut
+    
+    Usage: @limiter.limit(api_key_limit("100 per hour"))
+    """
+    def limit():
+        api_key = get_auth_context().api_key
+        return api_key.rate_limit if api_key is not None else default
+    return limit
+
+
+# Configuration du rate limiter (stockage: RATELIMIT_STORAGE_URI, voir LocalBucketStorage)
 limiter = Limiter(
     key_func=get_user_id,
-    default_limits=["1000 per hour"],
-    storage_uri="redis://localhost:6379/1"
+    default_limits=["1000 per hour"]
 )
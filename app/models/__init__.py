@@ -4,10 +4,16 @@ from app.models.session import Session
 from app.models.refresh_token import RefreshToken
 from app.models.currency import Currency
 from app.models.exchange_rate import ExchangeRate
+from app.models.latest_exchange_rate import LatestExchangeRate
+from app.models.rate_candle import RateCandle
+from app.models.rate_compaction_watermark import RateCompactionWatermark
 from app.models.conversion import Conversion
+from app.models.conversion_rollup import UserConversionDaily, PairConversionHourly
 from app.models.user_favorite_currency import UserFavoriteCurrency
+from app.models.api_key import ApiKey
 
 __all__ = [
     'User', 'Session', 'RefreshToken', 'Currency', 
-    'ExchangeRate', 'Conversion', 'UserFavoriteCurrency'
+    'ExchangeRate', 'LatestExchangeRate', 'RateCandle', 'RateCompactionWatermark', 'Conversion',
+    'UserConversionDaily', 'PairConversionHourly', 'UserFavoriteCurrency', 'ApiKey'
 ]
@@ -0,0 +1,111 @@
+# app/models/api_key.py
+from datetime import datetime
+import hashlib
+import secrets
+from app.extensions import db
+from app.models.base import BaseModel, IdType
+
+
+KEY_PREFIX = 'cck_'
+
+
+def digest_key(raw_key):
+    """Empreinte SHA-256 d'une clé API (clé aléatoire de 256 bits: pas besoin d'un hash lent)"""
+    return hashlib.sha256(raw_key.encode()).hexdigest()
+
+
+class ApiKey(BaseModel):
+    """Clé API d'un client machine (services internes)
+    
+    Seule l'empreinte de la clé est stockée; la clé complète n'est affichée
+    qu'à la création.
+    """
+    __tablename__ = 'api_keys'
+    
+    user_id = db.Column(IdType(), db.ForeignKey('users.id'), nullable=False, index=True)
+    name = db.Column(db.String(100), nullable=False)
+    prefix = db.Column(db.String(12), nullable=False)  # Début de la clé, pour l'identifier dans les listes
+    key_hash = db.Column(db.String(64), unique=True, nullable=False, index=True)
+    scopes = db.Column(db.String(255), nullable=False, default='')  # Séparés par des espaces
+    rate_limit = db.Column(db.String(50))  # Ex: "10000 per hour", API_KEY_DEFAULT_RATE_LIMIT si vide
+    is_active = db.Column(db.Boolean, default=True, nullable=False)
+    expires_at = db.Column(db.DateTime)
+    
+    def __init__(self, user_id, name, scopes=(), rate_limit=None, expires_at=None, **kwargs):
+        super().__init__(**kwargs)
+        self.user_id = user_id
+        self.name = name
+        self.scopes = ' '.join(sorted(set(scopes)))
+        self.rate_limit = rate_limit
+        self.expires_at = expires_at
+    
+    def generate_key(self):
+        """Génère la clé et enregistre son empreinte
+        
+        Returns:
+            La clé complète, à transmettre au client (non récupérable ensuite)
+        """
+        raw_key = KEY_PREFIX + secrets.token_urlsafe(32)
+        self.prefix = raw_key[:12]
+        self.key_hash = digest_key(raw_key)
+        return raw_key
+    
+    def get_scopes(self):
+        """Liste des scopes accordés"""
+        return self.scopes.split() if self.scopes else []
+    
+    def is_expired(self):
+        """Vérifie si la clé est expirée"""
+        return self.expires_at is not None and datetime.utcnow() > self.expires_at
+    
+    @classmethod
+    def find_active_by_hash(cls, key_hash):
+        """Trouve une clé active d'un compte actif par empreinte, avec le statut premium du propriétaire
+        
+        Returns:
+            Tuple (ApiKey, is_premium) ou None, en une requête
+        """
+        from app.models.user import User
+        
+        return db.session.query(cls, User.is_premium).join(
+            User, User.id == cls.user_id
+        ).filter(
+            cls.key_hash == key_hash, cls.is_active.is_(True), User.is_active.is_(True)
+        ).first()
+    
+    @classmethod
+    def deactivate(cls, key_id, user_id=None):
+        """Désactive une clé (sans commit)
+        
+        Returns:
+            True si une clé active a été désactivée
+        """
+        query = cls.query.filter_by(id=key_id, is_active=True)
+        if user_id is not None:
+            query = query.filter_by(user_id=user_id)
+        return query.update({'is_active': False}, synchronize_session=False) == 1
+    
+    @classmethod
+    def deactivate_for_user(cls, user_id):
+        """Désactive toutes les clés actives d'un utilisateur (sans commit)
+        
+        Returns:
+            Liste des ids des clés désactivées
+        """
+        key_ids = [key_id for key_id, in db.session.query(cls.id).filter_by(user_id=user_id, is_active=True)]
+        if key_ids:
+            cls.query.filter(cls.id.in_(key_ids)).update({'is_active': False}, synchronize_session=False)
+        return key_ids
+    
+    def to_dict(self):
+        """Convertit en dictionnaire (sans empreinte)"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'prefix': self.prefix,
+            'scopes': self.get_scopes(),
+            'rate_limit': self.rate_limit,
+            'is_active': self.is_active,
+            'expires_at': self.expires_at,
+            'created_at': self.created_at
+        }
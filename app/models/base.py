@@ -1,21 +1,62 @@
 # app/models/base.py
 from datetime import datetime
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.types import LargeBinary, String, TypeDecorator
+from app.config.base import BaseConfig
 from app.extensions import db
+from app.utils.ids import new_id
 import uuid
 
 
+class IdType(TypeDecorator):
+    """Identifiant UUID manipulé en chaîne côté Python
+    
+    Stockage selon ID_STORAGE: 'binary' (uuid natif sous PostgreSQL, 16 octets
+    ailleurs) ou 'string' (VARCHAR(36), schéma historique).
+    """
+    impl = String(36)
+    cache_ok = True
+    
+    def __init__(self, storage=None):
+        super().__init__()
+        self.storage = storage or BaseConfig.ID_STORAGE
+    
+    def load_dialect_impl(self, dialect):
+        if self.storage != 'binary':
+            return dialect.type_descriptor(String(36))
+        if dialect.name == 'postgresql':
+            return dialect.type_descriptor(postgresql.UUID(as_uuid=False))
+        return dialect.type_descriptor(LargeBinary(16))
+    
+    def process_bind_param(self, value, dialect):
+        # Strict: les identifiants reçus des clients sont validés en amont (routes <uuid:...>, curseurs)
+        if value is None or self.storage != 'binary' or dialect.name == 'postgresql':
+            return value
+        return bytes.fromhex(str(value).replace('-', ''))
+    
+    def process_result_value(self, value, dialect):
+        if value is None or self.storage != 'binary':
+            return value
+        if dialect.name == 'postgresql':
+            return str(value)
+        return str(uuid.UUID(bytes=bytes(value)))
+
+
 class BaseModel(db.Model):
     """Modèle de base avec champs communs"""
     __abstract__ = True
     
-    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = db.Column(IdType(), primary_key=True, default=new_id)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
-    def save(self):
-        """Sauvegarde l'objet en base"""
+    def save(self, commit=True):
+        """Sauvegarde l'objet en base (flush seul si commit=False, voir unit_of_work)"""
         db.session.add(self)
-        db.session.commit()
+        if commit:
+            db.session.commit()
+        else:
+            db.session.flush()
         return self
     
     def delete(self):
@@ -26,3 +67,35 @@ class BaseModel(db.Model):
     def to_dict(self):
         """Convertit l'objet en dictionnaire"""
         return {c.name: getattr(self, c.name) for c in self.__table__.columns}
+
+
+
+def upsert_statement(table, values, index_elements, set_, where=None):
+    """Construit un INSERT ... ON CONFLICT DO UPDATE natif (PostgreSQL ou SQLite)
+    
+    Args:
+        table: Table cible
+        values: Valeurs à insérer
+        index_elements: Colonnes de la contrainte d'unicité
+        set_: Dict des colonnes à mettre à jour, ou callable(excluded) -> dict
+        where: Condition optionnelle de mise à jour, ou callable(excluded) -> condition
+    """
+    dialect = db.session.get_bind().dialect.name
+    
+    if dialect == 'postgresql':
+        statement = postgresql.insert(table).values(values)
+    elif dialect == 'sqlite':
+        statement = sqlite.insert(table).values(values)
+    else:
+        raise NotImplementedError(f"Upsert non supporté pour le dialecte {dialect}")
+    
+    if callable(set_):
+        set_ = set_(statement.excluded)
+    if callable(where):
+        where = where(statement.excluded)
+    
+    return statement.on_conflict_do_update(
+        index_elements=index_elements,
+        set_=set_,
+        where=where
+    )
@@ -1,16 +1,16 @@
 # app/models/conversion.py
 from decimal import Decimal
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, IdType
 
 
 class Conversion(BaseModel):
     """Modèle historique des conversions"""
     __tablename__ = 'conversions'
     
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)  # Null pour utilisateurs anonymes
-    from_currency = db.Column(db.String(3), nullable=False, index=True)
-    to_currency = db.Column(db.String(3), nullable=False, index=True)
+    user_id = db.Column(IdType(), db.ForeignKey('users.id'), nullable=True)  # Null pour utilisateurs anonymes
+    from_currency = db.Column(db.String(3), nullable=False)
+    to_currency = db.Column(db.String(3), nullable=False)
     original_amount = db.Column(db.Numeric(precision=20, scale=8), nullable=False)
     converted_amount = db.Column(db.Numeric(precision=20, scale=8), nullable=False)
     exchange_rate = db.Column(db.Numeric(precision=20, scale=8), nullable=False)
@@ -22,8 +22,8 @@ class Conversion(BaseModel):
     
     # Index pour optimiser les requêtes
     __table_args__ = (
-        db.Index('idx_user_conversions', 'user_id', 'created_at'),
-        db.Index('idx_currency_pair_conversions', 'from_currency', 'to_currency'),
+        # Historique et pagination par curseur sur (created_at, id)
+        db.Index('idx_user_conversions_keyset', 'user_id', 'created_at', 'id'),
         db.Index('idx_conversion_date', 'created_at'),
     )
     
@@ -48,63 +48,57 @@ class Conversion(BaseModel):
         return self.converted_amount - self.fee_amount
     
     @classmethod
-    def get_user_history(cls, user_id, limit=50):
-        """Récupère l'historique des conversions d'un utilisateur"""
-        return cls.query.filter_by(user_id=user_id)\
-                       .order_by(cls.created_at.desc())\
-                       .limit(limit).all()
-    
-    @classmethod
-    def get_popular_pairs(cls, days=30):
-        """Récupère les paires de devises les plus converties"""
-        from datetime import datetime, timedelta
-        from sqlalchemy import func
+    def get_user_history(cls, user_id, limit=50, since=None):
+        """Récupère l'historique des conversions d'un utilisateur
+        
+        Sur une table partitionnée, le tri sur created_at parcourt les partitions
+        de la plus récente à la plus ancienne et s'arrête dès la limite atteinte;
+        since restreint en plus la lecture aux partitions postérieures.
+        """
+        query = cls.query.filter_by(user_id=user_id)
         
-        start_date = datetime.utcnow() - timedelta(days=days)
+        if since is not None:
+            query = query.filter(cls.created_at >= since)
         
-        result = db.session.query(
-            cls.from_currency,
-            cls.to_currency,
-            func.count().label('conversion_count'),
-            func.sum(cls.original_amount).label('total_volume')
-        ).filter(
-            cls.created_at >= start_date
-        ).group_by(
-            cls.from_currency, 
-            cls.to_currency
-        ).order_by(
-            func.count().desc()
-        ).limit(10).all()
+        return query.order_by(cls.created_at.desc(), cls.id.desc())\
+                    .limit(limit).all()
+    
+    @classmethod
+    def get_user_history_page(cls, user_id, limit=50, cursor=None):
+        """Récupère une page de l'historique d'un utilisateur (pagination par curseur)
         
-        return result
+        Returns:
+            KeysetPage (items, next_cursor, has_more)
+        """
+        from app.utils.pagination import keyset_paginate
+        return keyset_paginate(cls.query.filter_by(user_id=user_id), cls, limit, cursor)
+    
+    @classmethod
+    def get_user_stats(cls, user_id, start_date, limit=5):
+        """Statistiques de conversion d'un utilisateur depuis une date (lecture des agrégats)"""
+        from app.models.conversion_rollup import UserConversionDaily
+        return UserConversionDaily.get_user_summary(user_id, start_date, limit=limit)
+    
+    @classmethod
+    def get_popular_pairs(cls, days=30):
+        """Récupère les paires de devises les plus converties (lecture des agrégats)"""
+        from app.models.conversion_rollup import PairConversionHourly
+        return PairConversionHourly.get_popular_pairs(days=days)
     
     @classmethod
     def get_volume_stats(cls, currency_code=None, days=30):
-        """Statistiques de volume pour une devise"""
+        """Statistiques de volume pour une devise (lecture des agrégats)"""
+        from app.models.conversion_rollup import PairConversionHourly
+        return PairConversionHourly.get_volume_stats(currency_code, days=days)
+    
+    @classmethod
+    def cleanup_old_conversions(cls, days, **options):
+        """Nettoie les anciennes conversions (partitions entières si partitionné, puis par lots)"""
         from datetime import datetime, timedelta
-        from sqlalchemy import func, or_
-        
-        start_date = datetime.utcnow() - timedelta(days=days)
-        query = cls.query.filter(cls.created_at >= start_date)
+        from app.services.partition_service import PartitionService
         
-        if currency_code:
-            currency_code = currency_code.upper()
-            query = query.filter(
-                or_(cls.from_currency == currency_code, 
-                    cls.to_currency == currency_code)
-            )
-        
-        stats = query.with_entities(
-            func.count().label('total_conversions'),
-            func.sum(cls.original_amount).label('total_volume'),
-            func.avg(cls.original_amount).label('avg_amount')
-        ).first()
-        
-        return {
-            'total_conversions': stats.total_conversions or 0,
-            'total_volume': float(stats.total_volume or 0),
-            'average_amount': float(stats.avg_amount or 0)
-        }
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        return PartitionService.purge_before(cls, cutoff_date, **options)
     
     def to_dict(self):
         """Convertit en dictionnaire"""
@@ -112,12 +106,12 @@ class Conversion(BaseModel):
             'id': self.id,
             'from_currency': self.from_currency,
             'to_currency': self.to_currency,
-            'original_amount': float(self.original_amount),
-            'converted_amount': float(self.converted_amount),
-            'net_amount': float(self.net_amount),
-            'exchange_rate': float(self.exchange_rate),
-            'fee_amount': float(self.fee_amount),
-            'fee_rate': float(self.fee_rate),
+            'original_amount': self.original_amount,
+            'converted_amount': self.converted_amount,
+            'net_amount': self.net_amount,
+            'exchange_rate': self.exchange_rate,
+            'fee_amount': self.fee_amount,
+            'fee_rate': self.fee_rate,
             'provider': self.provider,
-            'timestamp': self.created_at.isoformat()
+            'timestamp': self.created_at
         }
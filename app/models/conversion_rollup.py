@@ -0,0 +1,236 @@
+# app/models/conversion_rollup.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import event, func
+from app.extensions import db
+from app.models.base import IdType, upsert_statement
+from app.models.conversion import Conversion
+
+
+class UserConversionDaily(db.Model):
+    """Agrégat des conversions par utilisateur, paire et jour
+    
+    Maintenu par upsert à chaque conversion enregistrée; les statistiques
+    utilisateur lisent au plus (paires x jours) lignes, quel que soit le
+    volume de l'historique.
+    """
+    __tablename__ = 'user_conversion_daily'
+    
+    user_id = db.Column(IdType(), db.ForeignKey('users.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    from_currency = db.Column(db.String(3), primary_key=True)
+    to_currency = db.Column(db.String(3), primary_key=True)
+    conversion_count = db.Column(db.Integer, default=0, nullable=False)
+    total_volume = db.Column(db.Numeric(precision=20, scale=8), default=0, nullable=False)
+    total_fees = db.Column(db.Numeric(precision=20, scale=8), default=0, nullable=False)
+    
+    @classmethod
+    def record(cls, connection, conversion):
+        """Ajoute une conversion à l'agrégat (dans la transaction en cours)"""
+        if not conversion.user_id:
+            return
+        
+        values = {
+            'user_id': conversion.user_id,
+            'day': conversion.created_at.date(),
+            'from_currency': conversion.from_currency,
+            'to_currency': conversion.to_currency,
+            'conversion_count': 1,
+            'total_volume': conversion.original_amount,
+            'total_fees': conversion.fee_amount or 0
+        }
+        
+        connection.execute(upsert_statement(
+            cls.__table__,
+            values,
+            index_elements=['user_id', 'day', 'from_currency', 'to_currency'],
+            set_=lambda excluded: {
+                'conversion_count': cls.__table__.c.conversion_count + excluded.conversion_count,
+                'total_volume': cls.__table__.c.total_volume + excluded.total_volume,
+                'total_fees': cls.__table__.c.total_fees + excluded.total_fees
+            }
+        ))
+    
+    @classmethod
+    def get_user_summary(cls, user_id, start_date, limit=5):
+        """Statistiques d'un utilisateur depuis une date (granularité: le jour), en une requête
+        
+        Returns:
+            Dict {'total_conversions', 'total_volume', 'total_fees',
+                  'currencies_used', 'popular_pairs'}
+        """
+        pairs = db.session.query(
+            cls.from_currency,
+            cls.to_currency,
+            func.sum(cls.conversion_count).label('count'),
+            func.sum(cls.total_volume).label('total_volume'),
+            func.sum(cls.total_fees).label('total_fees')
+        ).filter(
+            cls.user_id == user_id,
+            cls.day >= start_date.date()
+        ).group_by(
+            cls.from_currency,
+            cls.to_currency
+        ).all()
+        
+        popular_pairs = sorted(pairs, key=lambda pair: pair.count, reverse=True)[:limit]
+        
+        return {
+            'total_conversions': sum(pair.count for pair in pairs),
+            'total_volume': sum((Decimal(pair.total_volume) for pair in pairs), Decimal('0')),
+            'total_fees': sum((Decimal(pair.total_fees) for pair in pairs), Decimal('0')),
+            'currencies_used': len({pair.from_currency for pair in pairs}),
+            'popular_pairs': [
+                {
+                    'from_currency': pair.from_currency,
+                    'to_currency': pair.to_currency,
+                    'count': pair.count
+                }
+                for pair in popular_pairs
+            ]
+        }
+    
+    @classmethod
+    def get_user_total(cls, user_id):
+        """Nombre total de conversions d'un utilisateur (approximatif: les purges
+        de l'historique ne sont pas décomptées)"""
+        return db.session.query(
+            func.coalesce(func.sum(cls.conversion_count), 0)
+        ).filter(cls.user_id == user_id).scalar()
+
+
+class PairConversionHourly(db.Model):
+    """Agrégat global des conversions par paire et par heure"""
+    __tablename__ = 'pair_conversion_hourly'
+    
+    hour = db.Column(db.DateTime, primary_key=True)
+    from_currency = db.Column(db.String(3), primary_key=True)
+    to_currency = db.Column(db.String(3), primary_key=True)
+    conversion_count = db.Column(db.Integer, default=0, nullable=False)
+    total_volume = db.Column(db.Numeric(precision=20, scale=8), default=0, nullable=False)
+    
+    @classmethod
+    def record(cls, connection, conversion):
+        """Ajoute une conversion à l'agrégat (dans la transaction en cours)"""
+        values = {
+            'hour': conversion.created_at.replace(minute=0, second=0, microsecond=0),
+            'from_currency': conversion.from_currency,
+            'to_currency': conversion.to_currency,
+            'conversion_count': 1,
+            'total_volume': conversion.original_amount
+        }
+        
+        connection.execute(upsert_statement(
+            cls.__table__,
+            values,
+            index_elements=['hour', 'from_currency', 'to_currency'],
+            set_=lambda excluded: {
+                'conversion_count': cls.__table__.c.conversion_count + excluded.conversion_count,
+                'total_volume': cls.__table__.c.total_volume + excluded.total_volume
+            }
+        ))
+    
+    @classmethod
+    def get_popular_pairs(cls, days=30, limit=10):
+        """Paires les plus converties sur la période (granularité: l'heure)"""
+        start_hour = (datetime.utcnow() - timedelta(days=days)).replace(minute=0, second=0, microsecond=0)
+        
+        return db.session.query(
+            cls.from_currency,
+            cls.to_currency,
+            func.sum(cls.conversion_count).label('conversion_count'),
+            func.sum(cls.total_volume).label('total_volume')
+        ).filter(
+            cls.hour >= start_hour
+        ).group_by(
+            cls.from_currency,
+            cls.to_currency
+        ).order_by(
+            func.sum(cls.conversion_count).desc()
+        ).limit(limit).all()
+    
+    @classmethod
+    def get_volume_stats(cls, currency_code=None, days=30):
+        """Volume des conversions sur la période, éventuellement pour une devise"""
+        start_hour = (datetime.utcnow() - timedelta(days=days)).replace(minute=0, second=0, microsecond=0)
+        query = db.session.query(
+            func.sum(cls.conversion_count).label('total_conversions'),
+            func.sum(cls.total_volume).label('total_volume')
+        ).filter(cls.hour >= start_hour)
+        
+        if currency_code:
+            currency_code = currency_code.upper()
+            query = query.filter(
+                db.or_(cls.from_currency == currency_code,
+                       cls.to_currency == currency_code)
+            )
+        
+        stats = query.first()
+        total_conversions = stats.total_conversions or 0
+        total_volume = float(stats.total_volume or 0)
+        
+        return {
+            'total_conversions': total_conversions,
+            'total_volume': total_volume,
+            'average_amount': total_volume / total_conversions if total_conversions else 0.0
+        }
+
+
+def rebuild_conversion_rollups():
+    """Reconstruit les agrégats depuis l'historique des conversions (migration)
+    
+    Deux INSERT ... SELECT ensemblistes: aucune conversion n'est chargée en mémoire.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        hour = func.date_trunc('hour', Conversion.created_at)
+    else:
+        hour = func.strftime('%Y-%m-%d %H:00:00.000000', Conversion.created_at)
+    
+    db.session.query(UserConversionDaily).delete()
+    db.session.query(PairConversionHourly).delete()
+    
+    db.session.execute(db.insert(UserConversionDaily).from_select(
+        ['user_id', 'day', 'from_currency', 'to_currency',
+         'conversion_count', 'total_volume', 'total_fees'],
+        db.select(
+            Conversion.user_id,
+            func.date(Conversion.created_at),
+            Conversion.from_currency,
+            Conversion.to_currency,
+            func.count(),
+            func.sum(Conversion.original_amount),
+            func.sum(func.coalesce(Conversion.fee_amount, 0))
+        ).where(
+            Conversion.user_id.isnot(None)
+        ).group_by(
+            Conversion.user_id,
+            func.date(Conversion.created_at),
+            Conversion.from_currency,
+            Conversion.to_currency
+        )
+    ))
+    
+    db.session.execute(db.insert(PairConversionHourly).from_select(
+        ['hour', 'from_currency', 'to_currency', 'conversion_count', 'total_volume'],
+        db.select(
+            hour,
+            Conversion.from_currency,
+            Conversion.to_currency,
+            func.count(),
+            func.sum(Conversion.original_amount)
+        ).group_by(
+            hour,
+            Conversion.from_currency,
+            Conversion.to_currency
+        )
+    ))
+    
+    db.session.commit()
+    return Conversion.query.count()
+
+
+@event.listens_for(Conversion, 'after_insert')
+def record_conversion_rollups(mapper, connection, conversion):
+    """Met à jour les agrégats dans la transaction qui insère la conversion"""
+    UserConversionDaily.record(connection, conversion)
+    PairConversionHourly.record(connection, conversion)
@@ -1,8 +1,11 @@
 # app/models/exchange_rate.py
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from decimal import Decimal
 from app.extensions import db
 from app.models.base import BaseModel
+from app.models.latest_exchange_rate import LatestExchangeRate
+from app.models.rate_candle import RateCandle
 
 
 class ExchangeRate(BaseModel):
@@ -19,6 +22,7 @@ class ExchangeRate(BaseModel):
     __table_args__ = (
         db.Index('idx_currency_pair', 'from_currency', 'to_currency'),
         db.Index('idx_rate_timestamp', 'created_at'),
+        db.Index('idx_rate_pair_timestamp', 'from_currency', 'to_currency', 'created_at'),
     )
     
     def __init__(self, from_currency, to_currency, rate, provider, **kwargs):
@@ -35,16 +39,67 @@ class ExchangeRate(BaseModel):
     
     @classmethod
     def get_latest_rate(cls, from_currency, to_currency):
-        """Récupère le taux le plus récent pour une paire"""
-        return cls.query.filter_by(
-            from_currency=from_currency.upper(),
-            to_currency=to_currency.upper(),
-            is_active=True
+        """Récupère le taux le plus récent pour une paire (lecture par clé primaire)"""
+        return LatestExchangeRate.get_latest(from_currency, to_currency)
+    
+    @classmethod
+    def get_rate_as_of(cls, from_currency, to_currency, as_of):
+        """Récupère le dernier taux connu à une date donnée (ou avant)"""
+        return cls.query.filter(
+            cls.from_currency == from_currency.upper(),
+            cls.to_currency == to_currency.upper(),
+            cls.created_at <= as_of,
+            cls.is_active == True
         ).order_by(cls.created_at.desc()).first()
     
+    @classmethod
+    def get_rate_series(cls, from_currency, to_currency, start_date, end_date=None):
+        """Récupère la série (timestamp, taux, provider) d'une paire, triée par date"""
+        query = cls.query.with_entities(
+            cls.created_at, cls.rate, cls.provider
+        ).filter(
+            cls.from_currency == from_currency.upper(),
+            cls.to_currency == to_currency.upper(),
+            cls.created_at >= start_date,
+            cls.is_active == True
+        )
+        
+        if end_date is not None:
+            query = query.filter(cls.created_at <= end_date)
+        
+        return query.order_by(cls.created_at).all()
+    
+    @classmethod
+    def get_rates_as_of(cls, from_currency, to_currency, timestamps):
+        """Récupère en lot les taux à plusieurs dates (deux requêtes quel que soit le nombre de dates)
+        
+        Returns:
+            Liste alignée sur timestamps de tuples (timestamp, taux, provider) ou None
+        """
+        if not timestamps:
+            return []
+        
+        start, end = min(timestamps), max(timestamps)
+        
+        # Point d'ancrage: dernier taux connu avant la première date demandée
+        anchor = cls.get_rate_as_of(from_currency, to_currency, start)
+        series = cls.get_rate_series(from_currency, to_currency, start, end)
+        
+        points = [(anchor.created_at, anchor.rate, anchor.provider)] if anchor else []
+        points.extend((row.created_at, row.rate, row.provider) for row in series)
+        
+        times = [point[0] for point in points]
+        results = []
+        for timestamp in timestamps:
+            index = bisect_right(times, timestamp) - 1
+            results.append(points[index] if index >= 0 else None)
+        
+        return results
+    
     @classmethod
     def get_historical_rates(cls, from_currency, to_currency, days=30):
-        """Récupère l'historique des taux"""
+        """Récupère l'historique des taux (borné sur created_at: seules les partitions
+        des derniers jours sont lues)"""
         start_date = datetime.utcnow() - timedelta(days=days)
         return cls.query.filter(
             cls.from_currency == from_currency.upper(),
@@ -55,25 +110,32 @@ class ExchangeRate(BaseModel):
     
     @classmethod
     def update_or_create(cls, from_currency, to_currency, rate, provider='system'):
-        """Met à jour ou crée un nouveau taux"""
+        """Ajoute le taux à l'historique, met à jour le dernier taux connu et les bougies de la paire"""
         exchange_rate = cls(
             from_currency=from_currency,
             to_currency=to_currency,
             rate=rate,
-            provider=provider
+            provider=provider,
+            created_at=datetime.utcnow()
+        )
+        db.session.add(exchange_rate)
+        
+        LatestExchangeRate.upsert(
+            from_currency, to_currency, rate, provider,
+            timestamp=exchange_rate.created_at
         )
-        return exchange_rate.save()
+        RateCandle.record(from_currency, to_currency, rate, exchange_rate.created_at)
+        db.session.commit()
+        
+        return exchange_rate
     
     @classmethod
-    def cleanup_old_rates(cls, days=365):
-        """Nettoie les anciens taux"""
-        cutoff_date = datetime.utcnow() - timedelta(days=days)
-        old_rates = cls.query.filter(cls.created_at < cutoff_date).all()
-        
-        for rate in old_rates:
-            rate.delete()
+    def cleanup_old_rates(cls, days=365, **options):
+        """Nettoie les anciens taux (partitions entières si partitionné, puis par lots)"""
+        from app.services.partition_service import PartitionService
         
-        return len(old_rates)
+        cutoff_date = datetime.utcnow() - timedelta(days=days)
+        return PartitionService.purge_before(cls, cutoff_date, **options)
     
     def to_dict(self):
         """Convertit en dictionnaire"""
@@ -81,7 +143,7 @@ class ExchangeRate(BaseModel):
             'id': self.id,
             'from_currency': self.from_currency,
             'to_currency': self.to_currency,
-            'rate': float(self.rate),
+            'rate': self.rate,
             'provider': self.provider,
-            'timestamp': self.created_at.isoformat()
+            'timestamp': self.created_at
         }
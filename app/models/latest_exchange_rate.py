@@ -0,0 +1,111 @@
+# app/models/latest_exchange_rate.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.extensions import db
+from app.models.base import upsert_statement
+
+
+class LatestExchangeRate(db.Model):
+    """Dernier taux connu par paire et par provider (une ligne par clé)
+    
+    L'historique complet reste dans exchange_rates; cette table est maintenue
+    par upsert et sert les lectures ponctuelles par clé primaire.
+    """
+    __tablename__ = 'latest_exchange_rates'
+    
+    from_currency = db.Column(db.String(3), primary_key=True)
+    to_currency = db.Column(db.String(3), primary_key=True)
+    provider = db.Column(db.String(50), primary_key=True)
+    rate = db.Column(db.Numeric(precision=20, scale=8), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        # Dernier taux d'une paire tous providers confondus, sans tri
+        db.Index('idx_latest_rate_pair_updated', 'from_currency', 'to_currency', 'updated_at'),
+    )
+    
+    def is_stale(self, minutes=10):
+        """Vérifie si le taux est obsolète"""
+        threshold = datetime.utcnow() - timedelta(minutes=minutes)
+        return self.updated_at < threshold
+    
+    @classmethod
+    def upsert(cls, from_currency, to_currency, rate, provider, timestamp=None):
+        """Insère ou met à jour le dernier taux d'une paire (sans commit)
+        
+        Une écriture plus ancienne que la ligne existante est ignorée.
+        """
+        values = {
+            'from_currency': from_currency.upper(),
+            'to_currency': to_currency.upper(),
+            'provider': provider,
+            'rate': Decimal(str(rate)),
+            'updated_at': timestamp or datetime.utcnow()
+        }
+        
+        statement = upsert_statement(
+            cls.__table__,
+            values,
+            index_elements=['from_currency', 'to_currency', 'provider'],
+            set_=lambda excluded: {
+                'rate': excluded.rate,
+                'updated_at': excluded.updated_at
+            },
+            where=lambda excluded: cls.__table__.c.updated_at <= excluded.updated_at
+        )
+        db.session.execute(statement)
+    
+    @classmethod
+    def get_latest(cls, from_currency, to_currency):
+        """Récupère le taux le plus récent d'une paire, tous providers confondus"""
+        return cls.query.filter_by(
+            from_currency=from_currency.upper(),
+            to_currency=to_currency.upper()
+        ).order_by(cls.updated_at.desc()).first()
+    
+    @classmethod
+    def rebuild_from_history(cls):
+        """Reconstruit la table depuis l'historique (migration des données existantes)"""
+        from sqlalchemy import func
+        from app.models.exchange_rate import ExchangeRate
+        
+        latest = db.session.query(
+            ExchangeRate.from_currency,
+            ExchangeRate.to_currency,
+            ExchangeRate.provider,
+            func.max(ExchangeRate.created_at).label('updated_at')
+        ).filter(
+            ExchangeRate.is_active == True
+        ).group_by(
+            ExchangeRate.from_currency,
+            ExchangeRate.to_currency,
+            ExchangeRate.provider
+        ).subquery()
+        
+        rows = db.session.query(ExchangeRate).join(
+            latest,
+            db.and_(
+                ExchangeRate.from_currency == latest.c.from_currency,
+                ExchangeRate.to_currency == latest.c.to_currency,
+                ExchangeRate.provider == latest.c.provider,
+                ExchangeRate.created_at == latest.c.updated_at
+            )
+        )
+        
+        count = 0
+        for row in rows.all():
+            cls.upsert(row.from_currency, row.to_currency, row.rate, row.provider, row.created_at)
+            count += 1
+        
+        db.session.commit()
+        return count
+    
+    def to_dict(self):
+        """Convertit en dictionnaire"""
+        return {
+            'from_currency': self.from_currency,
+            'to_currency': self.to_currency,
+            'rate': self.rate,
+            'provider': self.provider,
+            'timestamp': self.updated_at
+        }
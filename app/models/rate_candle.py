@@ -0,0 +1,176 @@
+# app/models/rate_candle.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.extensions import db
+from app.models.base import upsert_statement
+
+
+EPOCH = datetime(1970, 1, 1)
+
+# Intervalles des bougies et durée d'un bucket
+CANDLE_INTERVALS = {
+    '1m': timedelta(minutes=1),
+    '5m': timedelta(minutes=5),
+    '1h': timedelta(hours=1),
+    '1d': timedelta(days=1),
+}
+
+
+def bucket_start(timestamp, interval):
+    """Début du bucket d'un intervalle contenant la date"""
+    seconds = int(CANDLE_INTERVALS[interval].total_seconds())
+    elapsed = int((timestamp - EPOCH).total_seconds())
+    return EPOCH + timedelta(seconds=elapsed - elapsed % seconds)
+
+
+class RateCandle(db.Model):
+    """Bougie OHLC d'une paire pour un intervalle (une ligne par bucket)
+    
+    Maintenue par upsert à chaque taux ingéré: un graphique journalier sur un
+    an lit 365 lignes au lieu de l'historique brut.
+    """
+    __tablename__ = 'rate_candles'
+    
+    from_currency = db.Column(db.String(3), primary_key=True)
+    to_currency = db.Column(db.String(3), primary_key=True)
+    interval = db.Column(db.String(3), primary_key=True)
+    bucket_start = db.Column(db.DateTime, primary_key=True)
+    open = db.Column(db.Numeric(precision=20, scale=8), nullable=False)
+    high = db.Column(db.Numeric(precision=20, scale=8), nullable=False)
+    low = db.Column(db.Numeric(precision=20, scale=8), nullable=False)
+    close = db.Column(db.Numeric(precision=20, scale=8), nullable=False)
+    sample_count = db.Column(db.Integer, default=1, nullable=False)
+    open_at = db.Column(db.DateTime, nullable=False)   # Date du taux d'ouverture
+    close_at = db.Column(db.DateTime, nullable=False)  # Date du taux de clôture
+    
+    @classmethod
+    def record(cls, from_currency, to_currency, rate, timestamp):
+        """Ajoute un taux aux bougies de tous les intervalles (sans commit)
+        
+        Un taux arrivé en retard ne remplace l'ouverture ou la clôture que s'il
+        est plus ancien, respectivement plus récent, que celles du bucket.
+        """
+        table = cls.__table__
+        rate = Decimal(str(rate))
+        
+        for interval in CANDLE_INTERVALS:
+            values = {
+                'from_currency': from_currency.upper(),
+                'to_currency': to_currency.upper(),
+                'interval': interval,
+                'bucket_start': bucket_start(timestamp, interval),
+                'open': rate,
+                'high': rate,
+                'low': rate,
+                'close': rate,
+                'sample_count': 1,
+                'open_at': timestamp,
+                'close_at': timestamp
+            }
+            
+            db.session.execute(upsert_statement(
+                table,
+                values,
+                index_elements=['from_currency', 'to_currency', 'interval', 'bucket_start'],
+                set_=lambda excluded: {
+                    'open': db.case((excluded.open_at < table.c.open_at, excluded.open), else_=table.c.open),
+                    'open_at': db.case((excluded.open_at < table.c.open_at, excluded.open_at), else_=table.c.open_at),
+                    'high': db.case((excluded.high > table.c.high, excluded.high), else_=table.c.high),
+                    'low': db.case((excluded.low < table.c.low, excluded.low), else_=table.c.low),
+                    'close': db.case((excluded.close_at >= table.c.close_at, excluded.close), else_=table.c.close),
+                    'close_at': db.case((excluded.close_at >= table.c.close_at, excluded.close_at), else_=table.c.close_at),
+                    'sample_count': table.c.sample_count + 1
+                }
+            ))
+    
+    @classmethod
+    def get_candles(cls, from_currency, to_currency, interval, start_date, end_date=None, limit=1000):
+        """Bougies d'une paire sur une période, triées par date (lecture par clé primaire)"""
+        query = cls.query.filter(
+            cls.from_currency == from_currency.upper(),
+            cls.to_currency == to_currency.upper(),
+            cls.interval == interval,
+            cls.bucket_start >= bucket_start(start_date, interval)
+        )
+        
+        if end_date is not None:
+            query = query.filter(cls.bucket_start <= end_date)
+        
+        return query.order_by(cls.bucket_start).limit(limit).all()
+    
+    @classmethod
+    def cleanup_old_candles(cls, retention_days, **options):
+        """Supprime par lots les bougies expirées, intervalle par intervalle
+        
+        Args:
+            retention_days: {intervalle: jours conservés}; intervalles absents conservés
+            options: voir RetentionService.process
+        """
+        from app.services.retention_service import RetentionService
+        
+        removed = 0
+        for interval, days in retention_days.items():
+            cutoff = datetime.utcnow() - timedelta(days=days)
+            report = RetentionService.process(
+                cls, [cls.interval == interval, cls.bucket_start < cutoff],
+                name=f"{cls.__tablename__}:{interval}", **options
+            )
+            removed += report['rows']
+        
+        return removed
+    
+    @classmethod
+    def rebuild_from_history(cls):
+        """Reconstruit les bougies depuis l'historique des taux, paire par paire (migration)"""
+        from app.models.exchange_rate import ExchangeRate
+        
+        pairs = db.session.query(
+            ExchangeRate.from_currency, ExchangeRate.to_currency
+        ).distinct().all()
+        
+        count = 0
+        for from_currency, to_currency in pairs:
+            points = ExchangeRate.get_rate_series(from_currency, to_currency, EPOCH)
+            candles = {}
+            
+            for timestamp, rate, _ in points:
+                for interval in CANDLE_INTERVALS:
+                    key = (interval, bucket_start(timestamp, interval))
+                    candle = candles.get(key)
+                    if candle is None:
+                        candles[key] = {
+                            'from_currency': from_currency,
+                            'to_currency': to_currency,
+                            'interval': interval,
+                            'bucket_start': key[1],
+                            'open': rate, 'high': rate, 'low': rate, 'close': rate,
+                            'sample_count': 1,
+                            'open_at': timestamp,
+                            'close_at': timestamp
+                        }
+                    else:
+                        # Série triée par date: le taux courant est la nouvelle clôture
+                        candle['high'] = max(candle['high'], rate)
+                        candle['low'] = min(candle['low'], rate)
+                        candle['close'] = rate
+                        candle['close_at'] = timestamp
+                        candle['sample_count'] += 1
+            
+            cls.query.filter_by(from_currency=from_currency, to_currency=to_currency).delete()
+            if candles:
+                db.session.execute(cls.__table__.insert(), list(candles.values()))
+            db.session.commit()
+            count += len(candles)
+        
+        return count
+    
+    def to_dict(self):
+        """Convertit en dictionnaire"""
+        return {
+            'timestamp': self.bucket_start,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'samples': self.sample_count
+        }
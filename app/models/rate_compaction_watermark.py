@@ -0,0 +1,23 @@
+# app/models/rate_compaction_watermark.py
+from app.extensions import db
+
+
+class RateCompactionWatermark(db.Model):
+    """Avancement de la compaction de l'historique d'une paire
+    
+    Les jours antérieurs à hourly_until (respectivement daily_until) sont déjà
+    réduits à un taux par heure (par jour): la compaction suivante repart de
+    ces dates au lieu de relire l'historique depuis le premier taux.
+    """
+    __tablename__ = 'rate_compaction_watermarks'
+    
+    from_currency = db.Column(db.String(3), primary_key=True)
+    to_currency = db.Column(db.String(3), primary_key=True)
+    hourly_until = db.Column(db.DateTime, nullable=False)
+    daily_until = db.Column(db.DateTime, nullable=False)
+    
+    def __init__(self, from_currency, to_currency, start):
+        self.from_currency = from_currency
+        self.to_currency = to_currency
+        self.hourly_until = start
+        self.daily_until = start
@@ -1,7 +1,9 @@
 # app/models/refresh_token.py
 from datetime import datetime, timedelta
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, IdType
 import secrets
 
 
@@ -9,13 +11,19 @@ class RefreshToken(BaseModel):
     """Modèle de refresh token"""
     __tablename__ = 'refresh_tokens'
     
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
-    session_id = db.Column(db.String(36), db.ForeignKey('sessions.id'), nullable=False)
+    user_id = db.Column(IdType(), db.ForeignKey('users.id'), nullable=False)
+    session_id = db.Column(IdType(), db.ForeignKey('sessions.id'), nullable=False)
     token_hash = db.Column(db.String(255), unique=True, nullable=False, index=True)
     jti = db.Column(db.String(36), unique=True, nullable=False, index=True)  # JWT ID
     is_revoked = db.Column(db.Boolean, default=False, nullable=False)
     expires_at = db.Column(db.DateTime, nullable=False)
     
+    __table_args__ = (
+        db.Index('idx_refresh_token_session', 'session_id', 'is_revoked'),
+        db.Index('idx_refresh_token_user', 'user_id', 'is_revoked'),
+        db.Index('idx_refresh_token_expiry', 'expires_at'),
+    )
+    
     # Relations
     session = db.relationship('Session', backref='refresh_tokens')
     
@@ -41,10 +49,29 @@ class RefreshToken(BaseModel):
         """Vérifie si le token est expiré"""
         return datetime.utcnow() > self.expires_at
     
-    def revoke(self):
+    def revoke(self, commit=True):
         """Révoque le token"""
         self.is_revoked = True
-        db.session.commit()
+        if commit:
+            db.session.commit()
+    
+    def claim(self):
+        """Révoque le token s'il ne l'est pas déjà, par un UPDATE conditionnel (sans commit)
+        
+        Deux rafraîchissements concurrents du même token ne peuvent pas aboutir tous les deux.
+        
+        Returns:
+            True si le token a été révoqué par cet appel
+        """
+        result = db.session.execute(
+            db.update(RefreshToken).where(
+                RefreshToken.id == self.id,
+                RefreshToken.is_revoked == False
+            ).values(is_revoked=True),
+            execution_options={'synchronize_session': False}
+        )
+        set_committed_value(self, 'is_revoked', True)
+        return result.rowcount == 1
     
     def is_valid(self):
         """Vérifie si le token est valide"""
@@ -56,13 +83,19 @@ class RefreshToken(BaseModel):
         return cls.query.filter_by(jti=jti).first()
     
     @classmethod
-    def cleanup_expired_tokens(cls):
-        """Nettoie les tokens expirés"""
-        expired_tokens = cls.query.filter(
-            cls.expires_at < datetime.utcnow()
-        ).all()
+    def find_for_refresh(cls, jti):
+        """Trouve un token par son JTI avec sa session et son utilisateur, en une requête"""
+        from app.models.session import Session
         
-        for token in expired_tokens:
-            token.delete()
+        return cls.query.options(
+            joinedload(cls.session).joinedload(Session.user)
+        ).filter_by(jti=jti).first()
+    
+    @classmethod
+    def cleanup_expired_tokens(cls, **options):
+        """Supprime les tokens expirés par lots (options: voir RetentionService.process)"""
+        from app.services.retention_service import RetentionService
         
-        return len(expired_tokens)
\ No newline at end of file
+        return RetentionService.process(
+            cls, [cls.expires_at < datetime.utcnow()], **options
+        )['rows']
\ No newline at end of file
@@ -1,14 +1,14 @@
 # app/models/session.py
 from datetime import datetime, timedelta
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, IdType
 
 
 class Session(BaseModel):
     """Modèle de session utilisateur"""
     __tablename__ = 'sessions'
     
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(IdType(), db.ForeignKey('users.id'), nullable=False)
     session_token = db.Column(db.String(255), unique=True, nullable=False, index=True)
     ip_address = db.Column(db.String(45))  # IPv6 compatible
     user_agent = db.Column(db.Text)
@@ -17,6 +17,15 @@ class Session(BaseModel):
     expires_at = db.Column(db.DateTime, nullable=False)
     last_activity = db.Column(db.DateTime, default=datetime.utcnow)
     
+    __table_args__ = (
+        # Comptage et liste des sessions actives d'un utilisateur
+        db.Index('idx_user_active_sessions', 'user_id', 'is_active', 'last_activity'),
+        # Index partiel: seules les sessions actives sont candidates à l'expiration
+        db.Index('idx_active_session_expiry', 'expires_at',
+                 postgresql_where=db.text('is_active'),
+                 sqlite_where=db.text('is_active = 1')),
+    )
+    
     def __init__(self, user_id, session_token, **kwargs):
         super().__init__(**kwargs)
         self.user_id = user_id
@@ -32,10 +41,11 @@ class Session(BaseModel):
         """Vérifie si la session est expirée"""
         return datetime.utcnow() > self.expires_at
     
-    def refresh_activity(self):
+    def refresh_activity(self, commit=True):
         """Met à jour l'activité de la session"""
         self.last_activity = datetime.utcnow()
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
     def deactivate(self):
         """Désactive la session"""
@@ -51,13 +61,13 @@ class Session(BaseModel):
         ).first()
     
     @classmethod
-    def cleanup_expired_sessions(cls):
-        """Nettoie les sessions expirées"""
-        expired_sessions = cls.query.filter(
-            cls.expires_at < datetime.utcnow()
-        ).all()
-        
-        for session in expired_sessions:
-            session.deactivate()
+    def cleanup_expired_sessions(cls, **options):
+        """Désactive les sessions expirées par lots (options: voir RetentionService.process)"""
+        from app.services.retention_service import RetentionService
         
-        return len(expired_sessions)
+        return RetentionService.process(
+            cls,
+            [cls.expires_at < datetime.utcnow(), cls.is_active == True],
+            values={'is_active': False},
+            **options
+        )['rows']
@@ -1,7 +1,8 @@
 # app/models/user.py
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_jwt_extended import create_access_token, create_refresh_token
 from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload, with_expression
 from app.extensions import db
 from app.models.base import BaseModel
 
@@ -19,6 +20,9 @@ class User(BaseModel):
     is_premium = db.Column(db.Boolean, default=False, nullable=False)
     last_login = db.Column(db.DateTime)
     
+    # Incrémentée pour révoquer tous les tokens de l'utilisateur (claim gen)
+    token_generation = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Préférences utilisateur pour les devises
     preferred_currency = db.Column(db.String(3), default='USD')
     
@@ -26,7 +30,10 @@ class User(BaseModel):
     sessions = db.relationship('Session', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     refresh_tokens = db.relationship('RefreshToken', backref='user', lazy='dynamic', cascade='all, delete-orphan')
     conversions = db.relationship('Conversion', backref='user', lazy='dynamic', cascade='all, delete-orphan')
-    favorite_currencies = db.relationship('UserFavoriteCurrency', backref='user', lazy='dynamic', cascade='all, delete-orphan')
+    favorite_currencies = db.relationship('UserFavoriteCurrency', backref='user', lazy='select', cascade='all, delete-orphan')
+    
+    # Nombre de sessions actives, chargé avec l'utilisateur par get_profile
+    active_sessions_count = db.query_expression()
     
     def __init__(self, email, password, first_name, last_name, **kwargs):
         super().__init__(**kwargs)
@@ -37,25 +44,44 @@ class User(BaseModel):
     
     def set_password(self, password):
         """Hash et définit le mot de passe"""
-        self.password_hash = generate_password_hash(password)
+        from app.services.password_service import PasswordService
+        self.password_hash = PasswordService.hash(password)
     
-    def check_password(self, password):
-        """Vérifie le mot de passe"""
-        return check_password_hash(self.password_hash, password)
+    def check_password(self, password, rehash=False):
+        """Vérifie le mot de passe
+        
+        Avec rehash=True, un hash d'un autre algorithme ou d'un autre coût est
+        recalculé (enregistré au prochain commit). Un mot de passe historique de
+        plus de MAX_BYTES octets garde son hash: bcrypt en ignorerait la fin.
+        """
+        from app.services.password_service import PasswordService
+        
+        if not PasswordService.verify(password, self.password_hash):
+            return False
+        
+        if (rehash and len(password.encode()) <= PasswordService.MAX_BYTES
+                and PasswordService.needs_rehash(self.password_hash)):
+            self.set_password(password)
+        return True
     
     def get_full_name(self):
         """Retourne le nom complet"""
         return f"{self.first_name} {self.last_name}"
     
-    def update_last_login(self):
+    def update_last_login(self, commit=True):
         """Met à jour la date de dernière connexion"""
         self.last_login = datetime.utcnow()
-        db.session.commit()
+        if commit:
+            db.session.commit()
     
-    def generate_tokens(self, session_id):
-        """Génère les tokens JWT pour l'utilisateur"""
+    def generate_tokens(self, session_id, refresh_jti=None):
+        """Génère les tokens JWT pour l'utilisateur
+        
+        refresh_jti fixe le JTI du refresh token (évite de redécoder le token pour l'enregistrer).
+        """
         additional_claims = {
             'session_id': session_id,
+            'gen': self.token_generation or 0,
             'email': self.email,
             'is_premium': self.is_premium
         }
@@ -66,13 +92,15 @@ class User(BaseModel):
         )
         refresh_token = create_refresh_token(
             identity=self.id,
-            additional_claims=additional_claims
+            additional_claims=dict(additional_claims, **({'jti': refresh_jti} if refresh_jti else {}))
         )
         
         return access_token, refresh_token
     
     def get_active_sessions_count(self):
-        """Retourne le nombre de sessions actives"""
+        """Retourne le nombre de sessions actives (sans requête si chargé par get_profile)"""
+        if self.active_sessions_count is not None:
+            return self.active_sessions_count
         return self.sessions.filter_by(is_active=True).count()
     
     def can_create_session(self):
@@ -117,6 +145,52 @@ class User(BaseModel):
         """Trouve un utilisateur par email"""
         return cls.query.filter_by(email=email.lower().strip()).first()
     
+    @classmethod
+    def get_profile(cls, user_id):
+        """Charge un utilisateur avec ses favoris et son nombre de sessions actives
+        
+        Deux requêtes au total (utilisateur + sous-requête de comptage, favoris):
+        to_dict(include_sensitive=True) n'en émet ensuite aucune.
+        """
+        return cls.query.options(
+            selectinload(cls.favorite_currencies),
+            with_expression(cls.active_sessions_count, cls._active_sessions_expression())
+        ).filter(cls.id == user_id).execution_options(populate_existing=True).first()
+    
+    @classmethod
+    def increment_token_generation(cls, user_id):
+        """Incrémente la génération de tokens (sans commit): les tokens émis avant sont révoqués
+        
+        Returns:
+            Nouvelle génération, ou None si l'utilisateur n'existe pas
+        """
+        return db.session.execute(
+            db.update(cls).where(cls.id == user_id).values(
+                token_generation=cls.token_generation + 1
+            ).returning(cls.token_generation),
+            execution_options={'synchronize_session': False}
+        ).scalar()
+    
+    @classmethod
+    def find_for_login(cls, email, count_sessions=True):
+        """Trouve un utilisateur par email, avec son nombre de sessions actives, en une requête"""
+        query = cls.query.filter_by(email=email.lower().strip())
+        if count_sessions:
+            query = query.options(
+                with_expression(cls.active_sessions_count, cls._active_sessions_expression())
+            )
+        return query.execution_options(populate_existing=True).first()
+    
+    @classmethod
+    def _active_sessions_expression(cls):
+        """Sous-requête corrélée comptant les sessions actives de l'utilisateur"""
+        from app.models.session import Session
+        
+        return db.select(func.count(Session.id)).where(
+            Session.user_id == cls.id,
+            Session.is_active == True
+        ).correlate(cls).scalar_subquery()
+    
     @classmethod
     def create_user(cls, email, password, first_name, last_name):
         """Crée un nouvel utilisateur"""
@@ -143,8 +217,8 @@ class User(BaseModel):
             'is_verified': self.is_verified,
             'is_premium': self.is_premium,
             'preferred_currency': self.preferred_currency,
-            'created_at': self.created_at.isoformat(),
-            'last_login': self.last_login.isoformat() if self.last_login else None
+            'created_at': self.created_at,
+            'last_login': self.last_login
         }
         
         if include_sensitive:
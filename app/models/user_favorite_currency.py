@@ -1,13 +1,13 @@
 # app/models/user_favorite_currency.py
 from app.extensions import db
-from app.models.base import BaseModel
+from app.models.base import BaseModel, IdType
 
 
 class UserFavoriteCurrency(BaseModel):
     """Modèle des devises favorites par utilisateur"""
     __tablename__ = 'user_favorite_currencies'
     
-    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(IdType(), db.ForeignKey('users.id'), nullable=False)
     currency_code = db.Column(db.String(3), nullable=False)
     order_index = db.Column(db.Integer, default=0)  # Pour l'ordre d'affichage
     
@@ -59,5 +59,5 @@ class UserFavoriteCurrency(BaseModel):
         return {
             'currency_code': self.currency_code,
             'order_index': self.order_index,
-            'added_at': self.created_at.isoformat()
+            'added_at': self.created_at
         }
\ No newline at end of file
@@ -1,11 +1,16 @@
 # app/providers/base_provider.py
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+try:
+    import httpx
+except ImportError:  # Dépendance optionnelle du mode ASGI: requirements/async.txt
+    httpx = None
+
 
 class BaseProvider(ABC):
     """Classe de base pour les providers de taux de change"""
@@ -47,6 +52,36 @@ class BaseProvider(ABC):
         """Retourne la liste des devises supportées"""
         return []
     
+    def rates_request(self, base_currency: str) -> Tuple[str, Dict]:
+        """URL et paramètres de la requête de tous les taux (clients sync et async)"""
+        raise NotImplementedError
+    
+    def parse_rates(self, response) -> Dict[str, Decimal]:
+        """Extrait les taux d'une réponse HTTP (requests ou httpx)"""
+        raise NotImplementedError
+    
+    async def fetch_rates_async(self, client, base_currency: str = 'EUR') -> Dict[str, Decimal]:
+        """Récupère tous les taux avec un httpx.AsyncClient (sans retry: le fallback
+        passe au provider suivant)"""
+        url, params = self.rates_request(base_currency)
+        
+        try:
+            response = await client.get(url, params=params, timeout=self.timeout)
+        except httpx.TimeoutException:
+            raise Exception(f"Timeout lors de la requête vers {self.name}")
+        except httpx.HTTPError:
+            raise Exception(f"Erreur de connexion vers {self.name}")
+        
+        self._handle_response_errors(response)
+        return self.parse_rates(response)
+    
+    @staticmethod
+    def cross_rate(rates: Dict[str, Decimal], from_currency: str, to_currency: str) -> Decimal:
+        """Taux d'une paire depuis une table de taux sur une même base"""
+        if from_currency not in rates or to_currency not in rates:
+            raise Exception(f"Paire {from_currency}/{to_currency} non supportée")
+        return rates[to_currency] / rates[from_currency]
+    
     def _make_request(self, url: str, params: Dict = None) -> Dict:
         """Effectue une requête HTTP avec gestion d'erreurs"""
         try:
@@ -64,7 +99,7 @@ class BaseProvider(ABC):
         except Exception as e:
             raise Exception(f"Erreur {self.name}: {str(e)}")
     
-    def _handle_response_errors(self, response: requests.Response) -> None:
+    def _handle_response_errors(self, response) -> None:
         """Gère les erreurs de réponse HTTP"""
         if response.status_code == 200:
             return
@@ -8,9 +8,9 @@ from app.providers.base_provider import BaseProvider
 class ECBProvider(BaseProvider):
     """Provider pour la Banque Centrale Européenne (gratuit)"""
     
-    def __init__(self):
+    def __init__(self, base_url: str = None):
         super().__init__()
-        self.base_url = "https://www.ecb.europa.eu/stats/eurofxref"
+        self.base_url = base_url or "https://www.ecb.europa.eu/stats/eurofxref"
         self.name = "European Central Bank"
         self.rate_limit = float('inf')  # Pas de limite
     
@@ -45,37 +45,42 @@ class ECBProvider(BaseProvider):
     
     def fetch_rates(self, base_currency: str = 'EUR') -> Dict[str, Decimal]:
         """Récupère tous les taux depuis ECB"""
-        if base_currency != 'EUR':
-            raise Exception("ECB supporte uniquement EUR comme devise de base")
-        
-        url = f"{self.base_url}/eurofxref-daily.xml"
+        url, params = self.rates_request(base_currency)
         
         try:
-            response = self.session.get(url, timeout=self.timeout)
+            response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
-            
-            # Parser le XML
+            return self.parse_rates(response)
+        except Exception as e:
+            raise Exception(f"Erreur ECB: {str(e)}")
+    
+    def rates_request(self, base_currency: str = 'EUR'):
+        """URL du fichier quotidien des taux ECB"""
+        if base_currency != 'EUR':
+            raise Exception("ECB supporte uniquement EUR comme devise de base")
+        return f"{self.base_url}/eurofxref-daily.xml", {}
+    
+    def parse_rates(self, response) -> Dict[str, Decimal]:
+        """Parse le XML ECB"""
+        try:
             root = ET.fromstring(response.content)
-            
-            rates = {'EUR': Decimal('1')}  # EUR = 1 par définition
-            
-            # Namespace ECB
-            ns = {'ecb': 'http://www.ecb.int/vocabulary/2002-08-01/eurofxref'}
-            
-            # Trouver les taux
-            for cube in root.findall('.//ecb:Cube[@currency]', ns):
-                currency = cube.get('currency')
-                rate = cube.get('rate')
-                
-                if currency and rate:
-                    rates[currency] = self._convert_to_decimal(rate)
-            
-            return rates
-        
         except ET.ParseError:
             raise Exception("Erreur lors du parsing des données ECB")
-        except Exception as e:
-            raise Exception(f"Erreur ECB: {str(e)}")
+        
+        rates = {'EUR': Decimal('1')}  # EUR = 1 par définition
+        
+        # Namespace ECB
+        ns = {'ecb': 'http://www.ecb.int/vocabulary/2002-08-01/eurofxref'}
+        
+        # Trouver les taux
+        for cube in root.findall('.//ecb:Cube[@currency]', ns):
+            currency = cube.get('currency')
+            rate = cube.get('rate')
+            
+            if currency and rate:
+                rates[currency] = self._convert_to_decimal(rate)
+        
+        return rates
     
     def is_available(self) -> bool:
         """Vérifie si ECB est disponible"""
@@ -7,9 +7,9 @@ from app.providers.base_provider import BaseProvider
 class FixerProvider(BaseProvider):
     """Provider pour Fixer.io API"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, base_url: str = None):
         super().__init__(api_key)
-        self.base_url = "http://data.fixer.io/api"
+        self.base_url = base_url or "http://data.fixer.io/api"
         self.name = "Fixer.io"
         self.rate_limit = 1000  # 1000 requêtes/mois pour le plan gratuit
     
@@ -47,17 +47,25 @@ class FixerProvider(BaseProvider):
     
     def fetch_rates(self, base_currency: str = 'EUR') -> Dict[str, Decimal]:
         """Récupère tous les taux pour une devise de base"""
+        url, params = self.rates_request(base_currency)
+        return self._parse_data(self._make_request(url, params))
+    
+    def rates_request(self, base_currency: str = 'EUR'):
+        """URL et paramètres de la requête des derniers taux"""
         if base_currency != 'EUR':
             raise Exception("Fixer.io supporte uniquement EUR comme devise de base")
         
-        url = f"{self.base_url}/latest"
-        params = {
+        return f"{self.base_url}/latest", {
             'access_key': self.api_key,
             'base': base_currency
         }
-        
-        data = self._make_request(url, params)
-        
+    
+    def parse_rates(self, response) -> Dict[str, Decimal]:
+        """Extrait les taux d'une réponse Fixer"""
+        return self._parse_data(response.json())
+    
+    def _parse_data(self, data: dict) -> Dict[str, Decimal]:
+        """Convertit les taux du JSON Fixer en Decimal"""
         if not data.get('success', False):
             error = data.get('error', {})
             raise Exception(f"Erreur Fixer: {error.get('info', 'Erreur inconnue')}")
@@ -0,0 +1,115 @@
+# app/routes/async_rates.py
+"""Vues asyncio des lectures de taux, servies par le mode ASGI (asgi.py)
+
+Mêmes chemins, paramètres et réponses que les routes de app/routes/currencies.py;
+en mode WSGI ce sont ces dernières qui répondent.
+"""
+import asyncio
+from datetime import datetime
+from flask import request, jsonify
+from limits import parse
+from app.middleware.rate_limiter import get_user_id, limiter
+from app.services.async_rate_service import AsyncRateService
+from app.services.rate_history_service import RateHistoryService
+from app.utils.exceptions import ValidationError
+from app.utils.helpers import parse_datetime
+
+
+def rate_limited(limit):
+    """Compte la requête dans une limite du rate limiter (stockage partagé avec le mode WSGI)
+    
+    Returns:
+        Réponse 429 si la limite est atteinte, sinon None
+    """
+    if not limiter.enabled:
+        return None
+    
+    if not limiter.limiter.hit(parse(limit), request.path, get_user_id()):
+        return jsonify({'error': f'Limite de requêtes atteinte ({limit})'}), 429
+    return None
+
+
+def rates_as_of(base_currency, symbols, as_of):
+    """Derniers taux connus à la date as_of (appel synchrone, dans un thread)"""
+    rates = {}
+    for symbol in symbols:
+        if symbol != base_currency:
+            rate_data = RateHistoryService.get_rate_as_of(base_currency, symbol, as_of)
+            if rate_data:
+                rates[symbol] = rate_data['rate']
+    return rates
+
+
+async def get_latest_rates():
+    """
+    Taux de change actuels (ou historiques avec as_of)
+    ---
+    GET /api/currencies/rates?base=USD&symbols=EUR,GBP,JPY&as_of=2024-03-15T16:00:00Z
+    """
+    limited = rate_limited("1000 per hour")
+    if limited:
+        return limited
+    
+    try:
+        base_currency = request.args.get('base', 'USD').upper()
+        symbols = request.args.get('symbols', '').upper().split(',')
+        symbols = [s.strip() for s in symbols if s.strip()]
+        
+        # Si aucun symbole spécifié, récupérer les taux populaires
+        if not symbols:
+            symbols = ['EUR', 'GBP', 'JPY', 'CHF', 'CAD', 'AUD']
+        
+        try:
+            as_of = parse_datetime(request.args.get('as_of'))
+        except ValidationError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Taux historiques: RateHistoryService lit la base en synchrone, hors de la boucle
+        if as_of:
+            rates = await asyncio.to_thread(rates_as_of, base_currency, symbols, as_of)
+            
+            return jsonify({
+                'base': base_currency,
+                'rates': rates,
+                'as_of': as_of
+            }), 200
+        
+        rates = await AsyncRateService.get_latest_rates(base_currency, symbols)
+        
+        return jsonify({
+            'base': base_currency,
+            'rates': rates,
+            'timestamp': datetime.utcnow()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Erreur lors de la récupération des taux'}), 500
+
+
+async def get_providers_status():
+    """
+    Statut des providers de taux
+    ---
+    GET /api/currencies/providers/status
+    """
+    limited = rate_limited("100 per hour")
+    if limited:
+        return limited
+    
+    try:
+        status = await AsyncRateService.get_providers_status()
+        
+        return jsonify({
+            'providers': status,
+            'available_providers': [name for name, result in status.items() if result['available']]
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Erreur lors de la vérification des providers'}), 500
+
+
+# Routes servies en asyncio: (méthode, chemin) -> vue
+ASYNC_ROUTES = {
+    ('GET', '/api/currencies/rates'): get_latest_rates,
+    ('GET', '/api/currencies/providers/status'): get_providers_status,
+}
@@ -1,14 +1,16 @@
 # app/routes/auth.py
+import time
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from marshmallow import ValidationError
 from app.services.auth_service import AuthService
+from app.services.token_service import TokenService
 from app.schemas.auth_schemas import (
     RegisterSchema, LoginSchema, RefreshTokenSchema, 
     ChangePasswordSchema
 )
+from app.middleware.auth_middleware import auth_required, current_user_id, current_claims
 from app.middleware.rate_limiter import limiter
-from app.utils.exceptions import AuthenticationError, ValidationError as CustomValidationError
+from app.utils.exceptions import AuthenticationError, ServiceBusyError, ValidationError as CustomValidationError
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
 
@@ -51,6 +53,8 @@ def register():
         
     except (AuthenticationError, CustomValidationError) as e:
         return jsonify({'error': str(e)}), 400
+    except ServiceBusyError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': 'Erreur lors de la création du compte'}), 500
 
@@ -92,6 +96,8 @@ def login():
         
     except AuthenticationError as e:
         return jsonify({'error': str(e)}), 401
+    except ServiceBusyError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '1'}
     except Exception as e:
         return jsonify({'error': 'Erreur lors de la connexion'}), 500
 
@@ -137,7 +143,7 @@ def refresh():
 
 
 @auth_bp.route('/logout', methods=['POST'])
-@jwt_required()
+@auth_required
 def logout():
     """
     Déconnexion utilisateur
@@ -146,12 +152,15 @@ def logout():
     Headers: Authorization: Bearer <access_token>
     """
     try:
-        user_id = get_jwt_identity()
-        claims = get_jwt()
+        user_id = current_user_id()
+        claims = current_claims()
         session_id = claims.get('session_id')
         
         AuthService.logout_user(user_id, session_id)
         
+        # Le token d'accès courant est révoqué jusqu'à son expiration
+        TokenService.blacklist_token(claims['jti'], claims['exp'] - time.time())
+        
         return jsonify({'message': 'Déconnexion réussie'}), 200
         
     except Exception as e:
@@ -159,7 +168,7 @@ def logout():
 
 
 @auth_bp.route('/logout-all', methods=['POST'])
-@jwt_required()
+@auth_required
 def logout_all():
     """
     Déconnexion de toutes les sessions
@@ -168,7 +177,7 @@ def logout_all():
     Headers: Authorization: Bearer <access_token>
     """
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         AuthService.logout_user(user_id)  # Sans session_id = toutes les sessions
         
         return jsonify({'message': 'Déconnexion de toutes les sessions réussie'}), 200
@@ -178,7 +187,7 @@ def logout_all():
 
 
 @auth_bp.route('/change-password', methods=['POST'])
-@jwt_required()
+@auth_required
 @limiter.limit("3 per minute")
 def change_password():
     """
@@ -198,7 +207,7 @@ def change_password():
         return jsonify({'errors': err.messages}), 400
     
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         
         AuthService.change_password(
             user_id=user_id,
@@ -215,7 +224,7 @@ def change_password():
 
 
 @auth_bp.route('/profile', methods=['GET'])
-@jwt_required()
+@auth_required
 def get_profile():
     """
     Récupération du profil utilisateur
@@ -226,7 +235,7 @@ def get_profile():
     try:
         from app.models.user import User
         
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         user = User.query.get(user_id)
         
         if not user:
@@ -241,7 +250,7 @@ def get_profile():
 
 
 @auth_bp.route('/sessions', methods=['GET'])
-@jwt_required()
+@auth_required
 def get_sessions():
     """
     Liste des sessions actives
@@ -252,7 +261,7 @@ def get_sessions():
     try:
         from app.services.session_service import SessionService
         
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         sessions = SessionService.get_user_sessions(user_id, active_only=True)
         
         sessions_data = []
@@ -262,9 +271,9 @@ def get_sessions():
                 'device_type': session.device_type,
                 'ip_address': session.ip_address,
                 'user_agent': session.user_agent,
-                'created_at': session.created_at.isoformat(),
-                'last_activity': session.last_activity.isoformat(),
-                'is_current': session.id == get_jwt().get('session_id')
+                'created_at': session.created_at,
+                'last_activity': session.last_activity,
+                'is_current': session.id == current_claims().get('session_id')
             })
         
         return jsonify({'sessions': sessions_data}), 200
@@ -273,19 +282,21 @@ def get_sessions():
         return jsonify({'error': 'Erreur lors de la récupération des sessions'}), 500
 
 
-@auth_bp.route('/sessions/<session_id>', methods=['DELETE'])
-@jwt_required()
+@auth_bp.route('/sessions/<uuid:session_id>', methods=['DELETE'])
+@auth_required
 def delete_session(session_id):
     """
     Suppression d'une session spécifique
     ---
     DELETE /api/auth/sessions/<session_id>
     Headers: Authorization: Bearer <access_token>
+    Un identifiant qui n'est pas un UUID donne un 404 sans requête SQL.
     """
     try:
         from app.services.session_service import SessionService
         
-        user_id = get_jwt_identity()
+        session_id = str(session_id)
+        user_id = current_user_id()
         
         # Vérifier que la session appartient à l'utilisateur
         from app.models.session import Session
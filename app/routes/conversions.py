@@ -1,26 +1,31 @@
 # app/routes/conversions.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity, jwt_required
 from marshmallow import ValidationError
 from app.services.conversion_service import ConversionService
-from app.schemas.conversion_schemas import ConversionRequestSchema, ConversionResponseSchema
-from app.middleware.rate_limiter import limiter
+from app.schemas.conversion_schemas import ConversionRequestSchema
+from app.middleware.auth_middleware import auth_required, current_api_key, current_user_id, scope_required
+from app.middleware.rate_limiter import api_key_limit, limiter
 from app.utils.exceptions import CurrencyError, ValidationError as CustomValidationError
+from app.utils.helpers import parse_datetime
+from app.database import read_only
 
 conversions_bp = Blueprint('conversions', __name__, url_prefix='/api/conversions')
 
 
 @conversions_bp.route('/convert', methods=['POST'])
-@limiter.limit("100 per hour")
+@limiter.limit(api_key_limit("100 per hour"))
+@scope_required('conversions')
 def convert_currency():
     """
     Conversion de devise
     ---
     POST /api/conversions/convert
+    Headers (clients machine): X-API-Key: <clé API avec le scope conversions>
     {
         "amount": 100.00,
         "from_currency": "USD",
-        "to_currency": "EUR"
+        "to_currency": "EUR",
+        "as_of": "2024-03-15T16:00:00Z"   (optionnel, taux historique)
     }
     """
     schema = ConversionRequestSchema()
@@ -31,25 +36,22 @@ def convert_currency():
         return jsonify({'errors': err.messages}), 400
     
     try:
-        # Récupérer l'utilisateur si authentifié
-        user_id = None
-        try:
-            from flask_jwt_extended import verify_jwt_in_request
-            verify_jwt_in_request(optional=True)
-            user_id = get_jwt_identity()
-        except:
-            pass  # Utilisateur non authentifié, c'est OK
+        # Récupérer l'utilisateur si authentifié (None si anonyme, c'est OK)
+        user_id = current_user_id()
+        # Clé API: statut premium du propriétaire déjà en cache
+        api_key = current_api_key()
         
         conversion_service = ConversionService()
         result = conversion_service.convert(
             amount=data['amount'],
             from_currency=data['from_currency'],
             to_currency=data['to_currency'],
-            user_id=user_id
+            user_id=user_id,
+            as_of=data.get('as_of'),
+            is_premium=api_key.is_premium if api_key else None
         )
         
-        response_schema = ConversionResponseSchema()
-        return jsonify(response_schema.dump(result)), 200
+        return jsonify(result), 200
         
     except (CurrencyError, CustomValidationError) as e:
         return jsonify({'error': str(e)}), 400
@@ -58,7 +60,8 @@ def convert_currency():
 
 
 @conversions_bp.route('/batch', methods=['POST'])
-@limiter.limit("20 per hour")
+@limiter.limit(api_key_limit("20 per hour"))
+@scope_required('conversions')
 def batch_convert():
     """
     Conversion en lot
@@ -67,7 +70,8 @@ def batch_convert():
     {
         "amount": 100.00,
         "from_currency": "USD",
-        "to_currencies": ["EUR", "GBP", "JPY"]
+        "to_currencies": ["EUR", "GBP", "JPY"],
+        "as_of": "2024-03-15T16:00:00Z"   (optionnel, taux historique)
     }
     """
     try:
@@ -82,14 +86,14 @@ def batch_convert():
         if len(to_currencies) > 10:
             return jsonify({'error': 'Maximum 10 devises de destination'}), 400
         
-        # Récupérer l'utilisateur si authentifié
-        user_id = None
         try:
-            from flask_jwt_extended import verify_jwt_in_request
-            verify_jwt_in_request(optional=True)
-            user_id = get_jwt_identity()
-        except:
-            pass
+            as_of = parse_datetime(data.get('as_of'))
+        except CustomValidationError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Récupérer l'utilisateur si authentifié
+        user_id = current_user_id()
+        api_key = current_api_key()
         
         conversion_service = ConversionService()
         results = []
@@ -100,7 +104,9 @@ def batch_convert():
                     amount=amount,
                     from_currency=from_currency,
                     to_currency=to_currency,
-                    user_id=user_id
+                    user_id=user_id,
+                    as_of=as_of,
+                    is_premium=api_key.is_premium if api_key else None
                 )
                 results.append(result)
             except Exception as e:
@@ -117,32 +123,37 @@ def batch_convert():
 
 
 @conversions_bp.route('/history', methods=['GET'])
-@jwt_required()
+@auth_required
+@read_only()
 def get_conversion_history():
     """
     Historique des conversions de l'utilisateur
     ---
-    GET /api/conversions/history?limit=50
+    GET /api/conversions/history?limit=50&cursor=<next_cursor>&total=true
     Headers: Authorization: Bearer <access_token>
     """
     try:
-        user_id = get_jwt_identity()
-        limit = min(int(request.args.get('limit', 50)), 100)  # Max 100
+        user_id = current_user_id()
+        limit = min(int(request.args.get('limit', 50)), 100)  # Max 100 par page
+        cursor = request.args.get('cursor')
+        with_total = request.args.get('total', 'false').lower() == 'true'
         
         conversion_service = ConversionService()
-        history = conversion_service.get_user_conversion_history(user_id, limit)
+        page = conversion_service.get_user_conversion_page(
+            user_id, limit=limit, cursor=cursor, with_total=with_total
+        )
         
-        return jsonify({
-            'history': history,
-            'count': len(history)
-        }), 200
+        return jsonify(page), 200
         
+    except CustomValidationError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': 'Erreur lors de la récupération de l\'historique'}), 500
 
 
 @conversions_bp.route('/stats', methods=['GET'])
-@jwt_required()
+@auth_required
+@read_only()
 def get_conversion_stats():
     """
     Statistiques de conversion de l'utilisateur
@@ -151,51 +162,23 @@ def get_conversion_stats():
     Headers: Authorization: Bearer <access_token>
     """
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         days = min(int(request.args.get('days', 30)), 365)  # Max 1 an
         
         from app.models.conversion import Conversion
-        from sqlalchemy import func
         from datetime import datetime, timedelta
         
         start_date = datetime.utcnow() - timedelta(days=days)
         
-        # Statistiques générales
-        stats = Conversion.query.filter(
-            Conversion.user_id == user_id,
-            Conversion.created_at >= start_date
-        ).with_entities(
-            func.count().label('total_conversions'),
-            func.sum(Conversion.original_amount).label('total_volume'),
-            func.sum(Conversion.fee_amount).label('total_fees')
-        ).first()
-        
-        # Paires les plus utilisées
-        popular_pairs = Conversion.query.filter(
-            Conversion.user_id == user_id,
-            Conversion.created_at >= start_date
-        ).with_entities(
-            Conversion.from_currency,
-            Conversion.to_currency,
-            func.count().label('count')
-        ).group_by(
-            Conversion.from_currency,
-            Conversion.to_currency
-        ).order_by(func.count().desc()).limit(5).all()
+        # Statistiques générales et paires les plus utilisées (une lecture des agrégats)
+        stats = Conversion.get_user_stats(user_id, start_date, limit=5)
         
         return jsonify({
             'period_days': days,
-            'total_conversions': stats.total_conversions or 0,
-            'total_volume': float(stats.total_volume or 0),
-            'total_fees': float(stats.total_fees or 0),
-            'popular_pairs': [
-                {
-                    'from_currency': pair.from_currency,
-                    'to_currency': pair.to_currency,
-                    'count': pair.count
-                }
-                for pair in popular_pairs
-            ]
+            'total_conversions': stats['total_conversions'],
+            'total_volume': stats['total_volume'],
+            'total_fees': stats['total_fees'],
+            'popular_pairs': stats['popular_pairs']
         }), 200
         
     except Exception as e:
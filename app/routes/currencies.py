@@ -1,17 +1,28 @@
 # app/routes/currencies.py
 import datetime
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.currency import Currency
 from app.models.exchange_rate import ExchangeRate
+from app.models.rate_candle import CANDLE_INTERVALS, RateCandle
 from app.services.rate_fetcher_service import RateFetcherService
+from app.services.currency_graph_service import CurrencyGraphService
+from app.services.rate_history_service import RateHistoryService
+from app.middleware.auth_middleware import auth_required, current_user_id
 from app.middleware.rate_limiter import limiter
+from app.utils.exceptions import ValidationError
+from app.utils.helpers import parse_datetime
+from app.database import read_only
 
 currencies_bp = Blueprint('currencies', __name__, url_prefix='/api/currencies')
 
+# Nombre de buckets renvoyés par défaut par l'historique OHLC
+CANDLE_DEFAULT_BUCKETS = 100
+CANDLE_MAX_BUCKETS = 1000  # Par réponse; au-delà, next_start donne la suite
+
 
 @currencies_bp.route('', methods=['GET'])
 @limiter.limit("1000 per hour")
+@read_only()
 def get_currencies():
     """
     Liste des devises supportées
@@ -41,6 +52,7 @@ def get_currencies():
 
 @currencies_bp.route('/popular', methods=['GET'])
 @limiter.limit("1000 per hour")
+@read_only()
 def get_popular_currencies():
     """
     Devises populaires
@@ -59,7 +71,8 @@ def get_popular_currencies():
 
 
 @currencies_bp.route('/favorites', methods=['GET'])
-@jwt_required()
+@auth_required
+@read_only()
 def get_favorite_currencies():
     """
     Devises favorites de l'utilisateur
@@ -70,7 +83,7 @@ def get_favorite_currencies():
     try:
         from app.models.user import User
         
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         user = User.query.get(user_id)
         
         if not user:
@@ -87,7 +100,7 @@ def get_favorite_currencies():
 
 
 @currencies_bp.route('/favorites', methods=['POST'])
-@jwt_required()
+@auth_required
 @limiter.limit("100 per hour")
 def add_favorite_currency():
     """
@@ -112,7 +125,7 @@ def add_favorite_currency():
         if not currency:
             return jsonify({'error': 'Devise non supportée'}), 400
         
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         user = User.query.get(user_id)
         
         user.add_favorite_currency(currency_code)
@@ -124,7 +137,7 @@ def add_favorite_currency():
 
 
 @currencies_bp.route('/favorites/<currency_code>', methods=['DELETE'])
-@jwt_required()
+@auth_required
 def remove_favorite_currency(currency_code):
     """
     Supprimer une devise des favoris
@@ -135,7 +148,7 @@ def remove_favorite_currency(currency_code):
     try:
         from app.models.user import User
         
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         user = User.query.get(user_id)
         
         user.remove_favorite_currency(currency_code)
@@ -148,11 +161,12 @@ def remove_favorite_currency(currency_code):
 
 @currencies_bp.route('/rates', methods=['GET'])
 @limiter.limit("1000 per hour")
+@read_only()
 def get_latest_rates():
     """
-    Taux de change actuels
+    Taux de change actuels (ou historiques avec as_of)
     ---
-    GET /api/currencies/rates?base=USD&symbols=EUR,GBP,JPY
+    GET /api/currencies/rates?base=USD&symbols=EUR,GBP,JPY&as_of=2024-03-15T16:00:00Z
     """
     try:
         base_currency = request.args.get('base', 'USD').upper()
@@ -163,6 +177,26 @@ def get_latest_rates():
         if not symbols:
             symbols = ['EUR', 'GBP', 'JPY', 'CHF', 'CAD', 'AUD']
         
+        try:
+            as_of = parse_datetime(request.args.get('as_of'))
+        except ValidationError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Taux historiques: dernier taux connu à la date demandée
+        if as_of:
+            rates = {}
+            for symbol in symbols:
+                if symbol != base_currency:
+                    rate_data = RateHistoryService.get_rate_as_of(base_currency, symbol, as_of)
+                    if rate_data:
+                        rates[symbol] = rate_data['rate']
+            
+            return jsonify({
+                'base': base_currency,
+                'rates': rates,
+                'as_of': as_of
+            }), 200
+        
         rates = {}
         rate_fetcher = RateFetcherService()
         
@@ -170,23 +204,81 @@ def get_latest_rates():
             if symbol != base_currency:
                 try:
                     rate = rate_fetcher.fetch_rate(base_currency, symbol)
-                    rates[symbol] = float(rate)
+                    rates[symbol] = rate
                 except Exception:
                     # Essayer depuis la base de données
                     db_rate = ExchangeRate.get_latest_rate(base_currency, symbol)
                     if db_rate:
-                        rates[symbol] = float(db_rate.rate)
+                        rates[symbol] = db_rate.rate
+                        continue
+                    
+                    # Puis via le graphe des devises (paires multi-sauts)
+                    route = CurrencyGraphService.resolve(base_currency, symbol)
+                    if route:
+                        rates[symbol] = route['rate']
         
         return jsonify({
             'base': base_currency,
             'rates': rates,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.datetime.utcnow()
         }), 200
         
     except Exception as e:
         return jsonify({'error': 'Erreur lors de la récupération des taux'}), 500
 
 
+@currencies_bp.route('/rates/history', methods=['GET'])
+@limiter.limit("1000 per hour")
+@read_only()
+def get_rate_history():
+    """
+    Historique OHLC d'une paire
+    ---
+    GET /api/currencies/rates/history?base=USD&symbol=EUR&interval=1d&start=2024-01-01T00:00:00Z&end=2024-12-31T00:00:00Z
+    interval: 1m, 5m, 1h ou 1d (défaut 1h); sans start, les CANDLE_DEFAULT_BUCKETS derniers buckets
+    Au plus CANDLE_MAX_BUCKETS bougies: si la période en compte davantage, truncated
+    vaut true et next_start est le start de la page suivante.
+    """
+    try:
+        base_currency = request.args.get('base', 'USD').upper()
+        symbol = request.args.get('symbol', '').upper()
+        interval = request.args.get('interval', '1h')
+        
+        if not symbol:
+            return jsonify({'error': 'Paramètre symbol requis'}), 400
+        
+        if interval not in CANDLE_INTERVALS:
+            return jsonify({'error': f"Intervalle invalide, valeurs possibles: {', '.join(CANDLE_INTERVALS)}"}), 400
+        
+        try:
+            end_date = parse_datetime(request.args.get('end'))
+            start_date = parse_datetime(request.args.get('start'))
+        except ValidationError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if start_date is None:
+            reference = end_date or datetime.datetime.utcnow()
+            start_date = reference - CANDLE_INTERVALS[interval] * CANDLE_DEFAULT_BUCKETS
+        
+        # Une bougie de plus que la page pour détecter la troncature
+        candles = RateCandle.get_candles(
+            base_currency, symbol, interval, start_date, end_date, limit=CANDLE_MAX_BUCKETS + 1
+        )
+        next_start = candles.pop().bucket_start if len(candles) > CANDLE_MAX_BUCKETS else None
+        
+        return jsonify({
+            'base': base_currency,
+            'symbol': symbol,
+            'interval': interval,
+            'candles': [candle.to_dict() for candle in candles],
+            'truncated': next_start is not None,
+            'next_start': next_start
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'Erreur lors de la récupération de l\'historique des taux'}), 500
+
+
 @currencies_bp.route('/providers/status', methods=['GET'])
 @limiter.limit("100 per hour")
 def get_providers_status():
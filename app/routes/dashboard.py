@@ -1,16 +1,19 @@
 # app/routes/dashboard.py
 from flask import Blueprint, render_template, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.models.user import User
 from app.models.conversion import Conversion
 from app.models.currency import Currency
 from app.services.conversion_service import ConversionService
+from app.middleware.auth_middleware import auth_required, current_user_id
+from app.utils.exceptions import ValidationError
+from app.database import read_only
 
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/dashboard')
 
 
 @dashboard_bp.route('/')
-@jwt_required()
+@auth_required
+@read_only()
 def dashboard_home():
     """
     Dashboard principal (interface web)
@@ -18,7 +21,7 @@ def dashboard_home():
     GET /dashboard/
     """
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         user = User.query.get(user_id)
         
         if not user:
@@ -40,7 +43,8 @@ def dashboard_home():
 
 
 @dashboard_bp.route('/converter')
-@jwt_required()
+@auth_required
+@read_only()
 def currency_converter():
     """
     Interface de conversion de devises
@@ -48,7 +52,7 @@ def currency_converter():
     GET /dashboard/converter
     """
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         user = User.query.get(user_id)
         
         currencies = Currency.get_active_currencies()
@@ -64,34 +68,36 @@ def currency_converter():
 
 
 @dashboard_bp.route('/history')
-@jwt_required()
+@auth_required
+@read_only()
 def conversion_history():
     """
     Historique des conversions
     ---
-    GET /dashboard/history
+    GET /dashboard/history?cursor=<next_cursor>
     """
     try:
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         user = User.query.get(user_id)
         
-        page = request.args.get('page', 1, type=int)
+        cursor = request.args.get('cursor')
         per_page = 20
         
-        conversions = Conversion.query.filter_by(user_id=user_id)\
-                                    .order_by(Conversion.created_at.desc())\
-                                    .paginate(page=page, per_page=per_page, error_out=False)
+        conversions = Conversion.get_user_history_page(user_id, limit=per_page, cursor=cursor)
         
         return render_template('dashboard/history.html',
                              user=user,
                              conversions=conversions)
         
+    except ValidationError as e:
+        return render_template('error.html', message=str(e)), 400
+        
     except Exception as e:
         return render_template('error.html', message='Erreur lors du chargement de l\'historique'), 500
 
 
 @dashboard_bp.route('/api/quick-convert', methods=['POST'])
-@jwt_required()
+@auth_required
 def quick_convert():
     """
     API de conversion rapide pour le dashboard
@@ -100,7 +106,7 @@ def quick_convert():
     """
     try:
         data = request.json
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         
         conversion_service = ConversionService()
         result = conversion_service.convert(
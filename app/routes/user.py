@@ -1,15 +1,17 @@
 # app/routes/user.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import ValidationError
 from app.schemas.user_schemas import UserUpdateSchema
+from app.middleware.auth_middleware import auth_required, current_user_id
 from app.middleware.rate_limiter import limiter
+from app.database import read_only
 
 user_bp = Blueprint('user', __name__, url_prefix='/api/user')
 
 
 @user_bp.route('/profile', methods=['GET'])
-@jwt_required()
+@auth_required
+@read_only()
 def get_profile():
     """
     Récupération du profil utilisateur détaillé
@@ -21,8 +23,8 @@ def get_profile():
         from app.models.user import User
         from app.schemas.user_schemas import UserProfileSchema
         
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user_id = current_user_id()
+        user = User.get_profile(user_id)
         
         if not user:
             return jsonify({'error': 'Utilisateur non trouvé'}), 404
@@ -35,7 +37,7 @@ def get_profile():
 
 
 @user_bp.route('/profile', methods=['PUT'])
-@jwt_required()
+@auth_required
 @limiter.limit("10 per hour")
 def update_profile():
     """
@@ -59,7 +61,7 @@ def update_profile():
         from app.models.user import User
         from app.services.cache_service import CacheService
         
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         user = User.query.get(user_id)
         
         if not user:
@@ -85,7 +87,8 @@ def update_profile():
 
 
 @user_bp.route('/stats', methods=['GET'])
-@jwt_required()
+@auth_required
+@read_only()
 def get_user_stats():
     """
     Statistiques générales de l'utilisateur
@@ -96,24 +99,15 @@ def get_user_stats():
     try:
         from app.models.conversion import Conversion
         from app.models.session import Session
-        from sqlalchemy import func
         from datetime import datetime, timedelta
         
-        user_id = get_jwt_identity()
+        user_id = current_user_id()
         
         # Statistiques des 30 derniers jours
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
         
         # Statistiques de conversion
-        conversion_stats = Conversion.query.filter(
-            Conversion.user_id == user_id,
-            Conversion.created_at >= thirty_days_ago
-        ).with_entities(
-            func.count().label('total_conversions'),
-            func.sum(Conversion.original_amount).label('total_volume'),
-            func.sum(Conversion.fee_amount).label('total_fees'),
-            func.count(func.distinct(Conversion.from_currency)).label('currencies_used')
-        ).first()
+        conversion_stats = Conversion.get_user_stats(user_id, thirty_days_ago)
         
         # Sessions actives
         active_sessions = Session.query.filter_by(
@@ -124,10 +118,10 @@ def get_user_stats():
         return jsonify({
             'period': '30_days',
             'conversions': {
-                'total': conversion_stats.total_conversions or 0,
-                'volume': float(conversion_stats.total_volume or 0),
-                'fees_paid': float(conversion_stats.total_fees or 0),
-                'currencies_used': conversion_stats.currencies_used or 0
+                'total': conversion_stats['total_conversions'],
+                'volume': conversion_stats['total_volume'],
+                'fees_paid': conversion_stats['total_fees'],
+                'currencies_used': conversion_stats['currencies_used']
             },
             'sessions': {
                 'active': active_sessions
@@ -18,6 +18,8 @@ class RegisterSchema(Schema):
             raise ValidationError('Le mot de passe doit contenir au moins une lettre')
         if not re.search(r'\d', value):
             raise ValidationError('Le mot de passe doit contenir au moins un chiffre')
+        if len(value.encode()) > 72:  # bcrypt ignore les octets suivants
+            raise ValidationError('Le mot de passe ne doit pas dépasser 72 octets')
     
     @validates('preferred_currency')
     def validate_currency(self, value):
@@ -49,3 +51,5 @@ class ChangePasswordSchema(Schema):
             raise ValidationError('Le mot de passe doit contenir au moins une lettre')
         if not re.search(r'\d', value):
             raise ValidationError('Le mot de passe doit contenir au moins un chiffre')
+        if len(value.encode()) > 72:  # bcrypt ignore les octets suivants
+            raise ValidationError('Le mot de passe ne doit pas dépasser 72 octets')
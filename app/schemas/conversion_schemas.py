@@ -8,6 +8,7 @@ class ConversionRequestSchema(Schema):
     amount = fields.Decimal(required=True, validate=validate.Range(min=Decimal('0.01'), max=Decimal('1000000000')))
     from_currency = fields.Str(required=True, validate=validate.Length(equal=3))
     to_currency = fields.Str(required=True, validate=validate.Length(equal=3))
+    as_of = fields.DateTime(missing=None, allow_none=True)  # Conversion au taux historique
     
     @validates('from_currency')
     def validate_from_currency(self, value):
@@ -34,3 +35,4 @@ class ConversionResponseSchema(Schema):
     fee_rate = fields.Float()
     provider = fields.Str()
     timestamp = fields.DateTime()
+    as_of = fields.DateTime(allow_none=True)
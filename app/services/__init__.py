@@ -5,8 +5,22 @@ from app.services.session_service import SessionService
 from app.services.conversion_service import ConversionService
 from app.services.rate_fetcher_service import RateFetcherService
 from app.services.cache_service import CacheService
+from app.services.currency_graph_service import CurrencyGraphService
+from app.services.rate_history_service import RateHistoryService
+from app.services.partition_service import PartitionService
+from app.services.retention_service import RetentionService
+from app.services.rate_compaction_service import RateCompactionService
+from app.services.export_service import ExportService
+from app.services.popularity_service import PopularityService
+from app.services.revocation_service import RevocationService
+from app.services.password_service import PasswordService
+from app.services.api_key_service import ApiKeyService
 
 __all__ = [
     'AuthService', 'TokenService', 'SessionService',
-    'ConversionService', 'RateFetcherService', 'CacheService'
+    'ConversionService', 'RateFetcherService', 'CacheService',
+    'CurrencyGraphService', 'RateHistoryService', 'PartitionService',
+    'RetentionService', 'RateCompactionService', 'ExportService',
+    'PopularityService', 'RevocationService', 'PasswordService',
+    'ApiKeyService'
 ]
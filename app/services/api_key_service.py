@@ -0,0 +1,160 @@
+# app/services/api_key_service.py
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import threading
+import time
+from flask import current_app
+from app.extensions import db
+from app.models.api_key import ApiKey, digest_key
+from app.services.revocation_service import RevocationService
+
+
+class ApiKeyIdentity:
+    """Clé API vérifiée, telle que gardée en cache (aucun objet de session SQLAlchemy)"""
+    
+    __slots__ = ('id', 'user_id', 'scopes', 'rate_limit', 'expires_at', 'is_premium')
+    
+    def __init__(self, id, user_id, scopes, rate_limit, expires_at, is_premium=False):
+        self.id = id
+        self.user_id = user_id
+        self.scopes = frozenset(scopes)
+        self.rate_limit = rate_limit
+        self.expires_at = expires_at
+        self.is_premium = is_premium  # Statut du propriétaire (frais réduits), sans relire l'utilisateur
+    
+    def has_scope(self, scope):
+        return scope in self.scopes
+
+
+class ApiKeyCache:
+    """Cache LRU des clés vérifiées par empreinte, avec durée de vie"""
+    
+    def __init__(self, capacity, ttl):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.entries = OrderedDict()  # {empreinte: (ApiKeyIdentity ou None, date de mise en cache)}
+        self.lock = threading.Lock()
+    
+    def get(self, key_hash):
+        """Retourne (trouvé, identité); les entrées expirées sont ignorées"""
+        with self.lock:
+            entry = self.entries.get(key_hash)
+            if entry is None or time.monotonic() - entry[1] >= self.ttl:
+                return False, None
+            self.entries.move_to_end(key_hash)
+            return True, entry[0]
+    
+    def put(self, key_hash, identity):
+        with self.lock:
+            self.entries[key_hash] = (identity, time.monotonic())
+            self.entries.move_to_end(key_hash)
+            while len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+
+
+class ApiKeyService:
+    """Authentification des clients machine par clé API
+    
+    Une clé vérifiée reste API_KEY_CACHE_TTL secondes dans un cache LRU du
+    worker (API_KEY_CACHE_SIZE empreintes): une requête authentifiée par clé
+    ne fait ni accès base ni création de session. Les clés inconnues ont leur
+    propre cache, plus petit (API_KEY_NEGATIVE_CACHE_SIZE): une rafale de clés
+    invalides n'évince pas les clés valides.
+    Une révocation est publiée dans le flux de RevocationService et appliquée
+    par tous les workers à leur prochaine synchronisation.
+    """
+    
+    @classmethod
+    def create_key(cls, user_id, name, scopes=(), rate_limit=None, expires_in_days=None):
+        """Crée une clé API
+        
+        Returns:
+            Tuple (ApiKey, clé complète à transmettre au client)
+        """
+        expires_at = datetime.utcnow() + timedelta(days=expires_in_days) if expires_in_days else None
+        api_key = ApiKey(user_id, name, scopes=scopes, rate_limit=rate_limit, expires_at=expires_at)
+        raw_key = api_key.generate_key()
+        api_key.save()
+        return api_key, raw_key
+    
+    @classmethod
+    def authenticate(cls, raw_key):
+        """Vérifie une clé API
+        
+        Returns:
+            ApiKeyIdentity ou None si la clé est inconnue, révoquée ou expirée
+        """
+        key_hash = digest_key(raw_key)
+        cache = cls._cache('api_keys', current_app.config['API_KEY_CACHE_SIZE'])
+        unknown = cls._cache('api_keys_unknown', current_app.config['API_KEY_NEGATIVE_CACHE_SIZE'])
+        
+        found, identity = cache.get(key_hash)
+        if not found:
+            if unknown.get(key_hash)[0]:
+                return None
+            identity = cls._load(key_hash)
+            (cache if identity is not None else unknown).put(key_hash, identity)
+        
+        if identity is None:
+            return None
+        if identity.expires_at is not None and datetime.utcnow() > identity.expires_at:
+            return None
+        if RevocationService.is_api_key_revoked(identity.id):
+            return None
+        
+        return identity
+    
+    @classmethod
+    def revoke_key(cls, key_id, user_id=None):
+        """Révoque une clé (base, puis caches de tous les workers)
+        
+        Returns:
+            True si la clé a été révoquée
+        """
+        revoked = ApiKey.deactivate(key_id, user_id=user_id)
+        db.session.commit()
+        
+        if revoked:
+            RevocationService.revoke_api_key(key_id)
+        return revoked
+    
+    @classmethod
+    def revoke_user_keys(cls, user_id):
+        """Révoque toutes les clés d'un utilisateur (compte désactivé)
+        
+        Returns:
+            Nombre de clés révoquées
+        """
+        key_ids = ApiKey.deactivate_for_user(user_id)
+        db.session.commit()
+        
+        for key_id in key_ids:
+            RevocationService.revoke_api_key(key_id)
+        return len(key_ids)
+    
+    @staticmethod
+    def _load(key_hash):
+        """Lit une clé active en base (primaire: une clé tout juste créée doit être trouvée)"""
+        row = ApiKey.find_active_by_hash(key_hash)
+        if row is None:
+            return None
+        
+        api_key, is_premium = row
+        return ApiKeyIdentity(
+            api_key.id,
+            api_key.user_id,
+            api_key.get_scopes(),
+            api_key.rate_limit or current_app.config['API_KEY_DEFAULT_RATE_LIMIT'],
+            api_key.expires_at,
+            bool(is_premium)
+        )
+    
+    @staticmethod
+    def _cache(name, capacity):
+        """Cache du worker (un par application et par processus)"""
+        cache = current_app.extensions.get(name)
+        if cache is None:
+            cache = current_app.extensions.setdefault(name, ApiKeyCache(
+                capacity, current_app.config['API_KEY_CACHE_TTL']
+            ))
+        return cache
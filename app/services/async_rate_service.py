@@ -0,0 +1,193 @@
+# app/services/async_rate_service.py
+import asyncio
+from decimal import Decimal
+import json
+import weakref
+from flask import current_app
+import redis
+from sqlalchemy import select
+from app.database import get_async_engine
+from app.models.latest_exchange_rate import LatestExchangeRate
+from app.services.currency_graph_service import CurrencyGraphService
+from app.services.rate_fetcher_service import RateFetcherService
+from app.utils.redis_client import get_async_redis
+
+try:
+    import httpx
+except ImportError:  # Dépendance optionnelle du mode ASGI: requirements/async.txt
+    httpx = None
+
+
+RATES_TABLE_KEY = 'async_rates:table'
+
+
+class AsyncRateService:
+    """Lectures des taux en asyncio pour le mode ASGI (asgi.py)
+    
+    Providers (httpx), Redis et base (engine asyncio) sont appelés sans
+    bloquer le worker: une boucle d'événements sert de nombreuses requêtes
+    en attente de réseau. Une seule table de taux (base EUR) est demandée au
+    premier provider qui répond, partagée par les requêtes concurrentes et
+    gardée ASYNC_RATES_CACHE_TTL secondes dans Redis; toutes les paires en
+    sont déduites.
+    """
+    
+    @classmethod
+    async def get_latest_rates(cls, base_currency, symbols):
+        """Taux de base_currency vers chaque symbole: providers, puis base, puis graphe
+        
+        Returns:
+            Dict {symbole: taux}
+        """
+        symbols = [symbol for symbol in symbols if symbol != base_currency]
+        rates = {}
+        
+        table = await cls.get_rates_table()
+        if table and base_currency in table:
+            for symbol in symbols:
+                if symbol in table:
+                    rates[symbol] = table[symbol] / table[base_currency]
+        
+        missing = [symbol for symbol in symbols if symbol not in rates]
+        if missing:
+            rates.update(await cls._latest_from_db(base_currency, missing))
+        
+        # Paires multi-sauts: graphe en mémoire, reconstruit au besoin par une requête
+        # SQL synchrone, exécutée hors de la boucle d'événements
+        missing = [symbol for symbol in symbols if symbol not in rates]
+        if missing:
+            rates.update(await asyncio.to_thread(cls._resolve_routes, base_currency, missing))
+        
+        return {symbol: rates[symbol] for symbol in symbols if symbol in rates}
+    
+    @classmethod
+    async def get_providers_status(cls):
+        """Teste tous les providers en parallèle (même format que RateFetcherService.test_providers)
+        
+        Les requêtes concurrentes partagent le test en cours de chaque provider.
+        """
+        providers = cls._providers()
+        results = await asyncio.gather(*(
+            cls._single_flight(('check', provider.name), lambda provider=provider: cls._check_provider(provider))
+            for provider in providers
+        ))
+        return {provider.name: result for provider, result in zip(providers, results)}
+    
+    @classmethod
+    async def get_rates_table(cls):
+        """Table des taux base EUR (une seule requête en vol par worker)"""
+        return await cls._single_flight('table', cls._load_rates_table)
+    
+    @classmethod
+    async def _single_flight(cls, key, factory):
+        """Résultat de factory(), partagé avec les appels concurrents de même clé"""
+        inflight = cls._loop_state().setdefault('inflight', {})
+        
+        if key not in inflight:
+            future = inflight[key] = asyncio.ensure_future(factory())
+            future.add_done_callback(lambda _: inflight.pop(key, None))
+        
+        # La requête partagée n'est pas annulée si un client se déconnecte
+        return await asyncio.shield(inflight[key])
+    
+    @classmethod
+    async def _load_rates_table(cls):
+        """Table des taux depuis Redis, sinon depuis le premier provider qui répond"""
+        client = get_async_redis()
+        
+        try:
+            cached = await client.get(RATES_TABLE_KEY)
+            if cached:
+                return {code: Decimal(rate) for code, rate in json.loads(cached)['rates'].items()}
+        except redis.RedisError as e:
+            current_app.logger.warning(f"Cache des taux indisponible: {e}")
+        
+        for provider in cls._providers():
+            try:
+                rates = await provider.fetch_rates_async(cls._http_client(), 'EUR')
+            except Exception:
+                continue
+            
+            try:
+                await client.set(RATES_TABLE_KEY, json.dumps({
+                    'provider': provider.name,
+                    'rates': {code: str(rate) for code, rate in rates.items()}
+                }), ex=current_app.config['ASYNC_RATES_CACHE_TTL'])
+            except redis.RedisError:
+                pass
+            return rates
+        
+        return None
+    
+    @classmethod
+    async def _check_provider(cls, provider):
+        try:
+            rates = await provider.fetch_rates_async(cls._http_client(), 'EUR')
+            return {
+                'available': True,
+                'test_rate_usd_eur': float(provider.cross_rate(rates, 'USD', 'EUR')),
+                'error': None
+            }
+        except Exception as e:
+            return {
+                'available': False,
+                'error': str(e)
+            }
+    
+    @staticmethod
+    def _resolve_routes(base_currency, symbols):
+        """Taux via le graphe des devises (appel synchrone, dans un thread)"""
+        rates = {}
+        for symbol in symbols:
+            route = CurrencyGraphService.resolve(base_currency, symbol)
+            if route:
+                rates[symbol] = route['rate']
+        return rates
+    
+    @staticmethod
+    async def _latest_from_db(base_currency, symbols):
+        """Derniers taux connus en base (réplica si configuré)"""
+        table = LatestExchangeRate.__table__
+        statement = select(table.c.to_currency, table.c.rate).where(
+            table.c.from_currency == base_currency,
+            table.c.to_currency.in_(symbols)
+        ).order_by(table.c.updated_at)
+        
+        async with get_async_engine(read_only=True).connect() as connection:
+            rows = (await connection.execute(statement)).all()
+        
+        # Ordre croissant: le taux le plus récent de chaque paire l'emporte
+        return {to_currency: rate for to_currency, rate in rows}
+    
+    @staticmethod
+    def _providers():
+        """Providers configurés, par ordre de priorité (partagés par les requêtes)"""
+        providers = current_app.extensions.get('async_rate_providers')
+        if providers is None:
+            providers = current_app.extensions.setdefault(
+                'async_rate_providers', RateFetcherService().providers
+            )
+        return providers
+    
+    @classmethod
+    def _http_client(cls):
+        """Client HTTP asyncio de la boucle courante (connexions réutilisées)"""
+        state = cls._loop_state()
+        if state.get('http') is None:
+            state['http'] = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=current_app.config['ASYNC_HTTP_MAX_CONNECTIONS'])
+            )
+        return state['http']
+    
+    @staticmethod
+    def _loop_state():
+        """État de la boucle d'événements courante (client HTTP, requêtes en vol)"""
+        states = current_app.extensions.setdefault('async_rates', weakref.WeakKeyDictionary())
+        return states.setdefault(asyncio.get_running_loop(), {})
+    
+    @classmethod
+    async def close(cls):
+        """Ferme le client HTTP de la boucle courante (arrêt du worker)"""
+        http = cls._loop_state().pop('http', None)
+        if http is not None:
+            await http.aclose()
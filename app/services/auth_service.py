@@ -1,13 +1,13 @@
 # app/services/auth_service.py
 from flask import request
-from werkzeug.security import generate_password_hash
 from datetime import datetime
 import secrets
+import uuid
+from app.database import unit_of_work
 from app.models.user import User
-from app.models.session import Session
 from app.models.refresh_token import RefreshToken
+from app.services.password_service import PasswordService
 from app.services.session_service import SessionService
-from app.services.token_service import TokenService
 from app.utils.exceptions import AuthenticationError, ValidationError
 
 
@@ -25,6 +25,8 @@ class AuthService:
         if len(password) < 8:
             raise ValidationError("Le mot de passe doit contenir au moins 8 caractères")
         
+        PasswordService.check_length(password)
+        
         # Vérifier si l'utilisateur existe déjà
         if User.find_by_email(email):
             raise ValidationError("Un utilisateur avec cet email existe déjà")
@@ -45,38 +47,42 @@ class AuthService:
     def authenticate_user(email, password, ip_address=None, user_agent=None):
         """Authentifie un utilisateur et crée une session"""
         
-        # Trouver l'utilisateur
-        user = User.find_by_email(email)
-        if not user or not user.check_password(password):
+        # Utilisateur (et nombre de sessions actives si elles sont en base) en une requête
+        store = SessionService.store()
+        user = User.find_for_login(email, count_sessions=store.COUNTS_IN_SQL)
+        # Un hash historique est recalculé et enregistré avec la dernière connexion
+        if not user or not user.check_password(password, rehash=True):
             raise AuthenticationError("Email ou mot de passe incorrect")
         
         if not user.is_active:
             raise AuthenticationError("Compte désactivé")
         
-        # Vérifier le nombre de sessions
-        if not user.can_create_session():
+        # Vérifier le nombre de sessions (compté par find_for_login ou dans Redis)
+        if not SessionService.can_create_session(user):
             raise AuthenticationError("Nombre maximum de sessions atteint")
         
-        # Créer une session
-        session = SessionService.create_session(
-            user_id=user.id,
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
-        
-        # Générer les tokens
-        access_token, refresh_token = user.generate_tokens(session.id)
-        
-        # Sauvegarder le refresh token
-        refresh_token_obj = RefreshToken(
-            user_id=user.id,
-            session_id=session.id,
-            jti=TokenService.get_jti_from_token(refresh_token)
-        )
-        refresh_token_obj.save()
+        # Session, refresh token et dernière connexion: une seule transaction
+        with unit_of_work():
+            session = SessionService.create_session(
+                user_id=user.id,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                commit=False
+            )
+            
+            # Générer les tokens (JTI du refresh token fixé à l'avance)
+            refresh_jti = str(uuid.uuid4())
+            access_token, refresh_token = user.generate_tokens(session.id, refresh_jti=refresh_jti)
+            
+            RefreshToken(
+                user_id=user.id,
+                session_id=session.id,
+                jti=refresh_jti
+            ).save(commit=False)
+            
+            user.update_last_login(commit=False)
         
-        # Mettre à jour la dernière connexion
-        user.update_last_login()
+        store.add(session)
         
         return {
             'user': user,
@@ -89,61 +95,61 @@ class AuthService:
     def logout_user(user_id, session_id=None):
         """Déconnecte un utilisateur"""
         
-        if session_id:
-            # Déconnexion d'une session spécifique
-            session = Session.query.filter_by(
-                id=session_id,
-                user_id=user_id,
-                is_active=True
-            ).first()
-            
-            if session:
-                SessionService.deactivate_session(session.id)
-        else:
-            # Déconnexion de toutes les sessions
-            sessions = Session.query.filter_by(
-                user_id=user_id,
-                is_active=True
-            ).all()
-            
-            for session in sessions:
-                SessionService.deactivate_session(session.id)
+        # Une session précise, ou toutes les sessions actives (requêtes ensemblistes)
+        SessionService.deactivate_sessions(user_id, session_id)
+    
+    @staticmethod
+    def deactivate_user(user_id):
+        """Désactive un compte: connexion refusée, sessions et clés API révoquées"""
+        from app.services.api_key_service import ApiKeyService
+        
+        user = User.query.get(user_id)
+        if not user:
+            raise AuthenticationError("Utilisateur non trouvé")
+        
+        user.is_active = False
+        user.save()
+        
+        AuthService.logout_user(user_id)
+        ApiKeyService.revoke_user_keys(user_id)
     
     @staticmethod
     def refresh_tokens(refresh_token_jti, user_id):
         """Rafraîchit les tokens d'accès"""
         
-        # Vérifier le refresh token
-        refresh_token_obj = RefreshToken.find_by_jti(refresh_token_jti)
+        # Refresh token, session et utilisateur en une requête
+        refresh_token_obj = RefreshToken.find_for_refresh(refresh_token_jti)
         if not refresh_token_obj or not refresh_token_obj.is_valid():
             raise AuthenticationError("Refresh token invalide ou expiré")
         
         if refresh_token_obj.user_id != user_id:
             raise AuthenticationError("Token non autorisé pour cet utilisateur")
         
-        # Récupérer l'utilisateur et la session
-        user = User.query.get(user_id)
-        session = Session.query.get(refresh_token_obj.session_id)
+        session = refresh_token_obj.session
+        user = session.user if session else None
         
-        if not user or not session or not session.is_active:
+        store = SessionService.store()
+        if not user or not store.is_active(session):
             raise AuthenticationError("Session invalide")
         
-        # Révoquer l'ancien refresh token
-        refresh_token_obj.revoke()
-        
-        # Générer de nouveaux tokens
-        access_token, new_refresh_token = user.generate_tokens(session.id)
-        
-        # Sauvegarder le nouveau refresh token
-        new_refresh_token_obj = RefreshToken(
-            user_id=user.id,
-            session_id=session.id,
-            jti=TokenService.get_jti_from_token(new_refresh_token)
-        )
-        new_refresh_token_obj.save()
-        
-        # Mettre à jour l'activité de la session
-        session.refresh_activity()
+        with unit_of_work():
+            # Révoquer l'ancien refresh token (échoue s'il vient d'être utilisé en parallèle)
+            if not refresh_token_obj.claim():
+                raise AuthenticationError("Refresh token invalide ou expiré")
+            
+            # Générer de nouveaux tokens
+            new_refresh_jti = str(uuid.uuid4())
+            access_token, new_refresh_token = user.generate_tokens(session.id, refresh_jti=new_refresh_jti)
+            
+            # Sauvegarder le nouveau refresh token
+            RefreshToken(
+                user_id=user.id,
+                session_id=session.id,
+                jti=new_refresh_jti
+            ).save(commit=False)
+            
+            # Mettre à jour l'activité de la session (reportée en base par lots avec Redis)
+            store.touch(session)
         
         return {
             'access_token': access_token,
@@ -164,6 +170,8 @@ class AuthService:
         if len(new_password) < 8:
             raise ValidationError("Le nouveau mot de passe doit contenir au moins 8 caractères")
         
+        PasswordService.check_length(new_password)
+        
         # Changer le mot de passe
         user.set_password(new_password)
         user.save()
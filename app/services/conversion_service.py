@@ -1,5 +1,5 @@
 # app/services/conversion_service.py
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Optional, Dict
 from flask import request
@@ -7,7 +7,11 @@ from app.models.conversion import Conversion
 from app.models.exchange_rate import ExchangeRate
 from app.services.rate_fetcher_service import RateFetcherService
 from app.services.cache_service import CacheService
-from app.utils.exceptions import CurrencyError, ValidationError
+from app.services.currency_graph_service import CurrencyGraphService
+from app.services.popularity_service import PopularityService
+from app.services.rate_history_service import RateHistoryService
+from app.utils.exceptions import CurrencyError, RateNotFoundError, ValidationError
+from app.utils.helpers import to_utc_naive
 
 
 class ConversionService:
@@ -17,8 +21,11 @@ class ConversionService:
         self.rate_fetcher = RateFetcherService()
         self.cache = CacheService()
     
-    def convert(self, amount, from_currency, to_currency, user_id=None):
-        """Convertit un montant d'une devise à une autre"""
+    def convert(self, amount, from_currency, to_currency, user_id=None, as_of=None, is_premium=None):
+        """Convertit un montant d'une devise à une autre (au taux historique si as_of est fourni)
+        
+        is_premium: statut déjà connu de l'utilisateur (clé API), sinon relu en base
+        """
         
         # Validation
         self._validate_conversion_params(amount, from_currency, to_currency)
@@ -33,13 +40,17 @@ class ConversionService:
             return self._build_same_currency_response(amount, from_currency)
         
         # Récupérer le taux de change
-        rate_data = self._get_exchange_rate(from_currency, to_currency)
+        if as_of:
+            as_of = to_utc_naive(as_of)
+            rate_data = self._get_historical_rate(from_currency, to_currency, as_of)
+        else:
+            rate_data = self._get_exchange_rate(from_currency, to_currency)
         
         # Calculer la conversion
         gross_amount = self._calculate_conversion(amount, rate_data['rate'])
         
         # Appliquer les frais
-        fee_data = self._calculate_fees(gross_amount, user_id)
+        fee_data = self._calculate_fees(gross_amount, user_id, is_premium)
         net_amount = gross_amount - fee_data['fee_amount']
         
         # Sauvegarder l'historique
@@ -64,7 +75,8 @@ class ConversionService:
             to_currency=to_currency,
             fee_data=fee_data,
             provider=rate_data['provider'],
-            conversion_id=conversion.id
+            conversion_id=conversion.id,
+            as_of=as_of
         )
     
     def get_user_conversion_history(self, user_id, limit=50):
@@ -72,9 +84,26 @@ class ConversionService:
         conversions = Conversion.get_user_history(user_id, limit)
         return [conv.to_dict() for conv in conversions]
     
-    def get_popular_conversion_pairs(self, days=30):
-        """Récupère les paires de conversion les plus populaires"""
-        return Conversion.get_popular_pairs(days)
+    def get_user_conversion_page(self, user_id, limit=50, cursor=None, with_total=False):
+        """Récupère une page de l'historique d'un utilisateur (pagination par curseur)"""
+        page = Conversion.get_user_history_page(user_id, limit=limit, cursor=cursor)
+        
+        result = {
+            'history': [conv.to_dict() for conv in page.items],
+            'count': len(page.items),
+            'next_cursor': page.next_cursor,
+            'has_more': page.has_more
+        }
+        
+        if with_total:
+            from app.models.conversion_rollup import UserConversionDaily
+            result['approximate_total'] = UserConversionDaily.get_user_total(user_id)
+        
+        return result
+    
+    def get_popular_conversion_pairs(self, days=30, limit=10):
+        """Récupère les paires de conversion les plus populaires (classement Redis)"""
+        return PopularityService.top_pairs(window=timedelta(days=days), limit=limit)
     
     def _validate_conversion_params(self, amount, from_currency, to_currency):
         """Valide les paramètres de conversion"""
@@ -115,6 +144,17 @@ class ConversionService:
             self.cache.set_rate(cache_key, rate_data, timeout=300)
             return rate_data
         
+        # Résolution via le graphe des devises (paires multi-sauts, ex: EUR/BTC).
+        # Le taux direct, trop ancien ci-dessus, est redemandé aux providers.
+        route = CurrencyGraphService.resolve(from_currency, to_currency, min_hops=2)
+        if route:
+            rate_data = {
+                'rate': route['rate'],
+                'provider': route['provider']
+            }
+            self.cache.set_rate(cache_key, rate_data, timeout=300)
+            return rate_data
+        
         # Récupération depuis les providers externes
         try:
             rate = self.rate_fetcher.fetch_rate(from_currency, to_currency)
@@ -134,11 +174,21 @@ class ConversionService:
         except Exception as e:
             raise CurrencyError(f"Impossible de récupérer le taux {from_currency}/{to_currency}: {str(e)}")
     
+    def _get_historical_rate(self, from_currency, to_currency, as_of):
+        """Récupère le dernier taux connu à une date donnée"""
+        rate_data = RateHistoryService.get_rate_as_of(from_currency, to_currency, as_of)
+        if rate_data is None:
+            raise RateNotFoundError(
+                f"Aucun taux {from_currency}/{to_currency} connu au {as_of.isoformat()}"
+            )
+        
+        return rate_data
+    
     def _calculate_conversion(self, amount, rate):
         """Calcule la conversion avec précision"""
         return (amount * rate).quantize(Decimal('0.00000001'), rounding=ROUND_HALF_UP)
     
-    def _calculate_fees(self, amount, user_id=None):
+    def _calculate_fees(self, amount, user_id=None, is_premium=None):
         """Calcule les frais de conversion"""
         from app.models.user import User
         from app.config.base import BaseConfig
@@ -146,10 +196,11 @@ class ConversionService:
         fee_rate = Decimal(str(BaseConfig.CONVERSION_FEE_RATE))
         
         # Frais réduits pour les utilisateurs premium
-        if user_id:
+        if is_premium is None and user_id:
             user = User.query.get(user_id)
-            if user and user.is_premium:
-                fee_rate = fee_rate * Decimal('0.5')  # 50% de réduction
+            is_premium = bool(user and user.is_premium)
+        if is_premium:
+            fee_rate = fee_rate * Decimal('0.5')  # 50% de réduction
         
         fee_amount = (amount * fee_rate).quantize(Decimal('0.00000001'), rounding=ROUND_HALF_UP)
         
@@ -174,37 +225,41 @@ class ConversionService:
             user_agent=request.headers.get('User-Agent') if request else None
         )
         
-        return conversion.save()
+        conversion.save()
+        PopularityService.record(conversion.from_currency, conversion.to_currency, conversion.created_at)
+        
+        return conversion
     
     def _build_same_currency_response(self, amount, currency):
         """Construit la réponse pour une conversion de même devise"""
         return {
-            'original_amount': float(amount),
-            'converted_amount': float(amount),
-            'gross_amount': float(amount),
-            'net_amount': float(amount),
-            'exchange_rate': 1.0,
+            'original_amount': amount,
+            'converted_amount': amount,
+            'gross_amount': amount,
+            'net_amount': amount,
+            'exchange_rate': Decimal('1'),
             'from_currency': currency,
             'to_currency': currency,
-            'fee_amount': 0.0,
-            'fee_rate': 0.0,
+            'fee_amount': Decimal('0'),
+            'fee_rate': Decimal('0'),
             'provider': 'system',
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.utcnow()
         }
     
     def _build_conversion_response(self, **kwargs):
         """Construit la réponse de conversion"""
         return {
             'conversion_id': kwargs['conversion_id'],
-            'original_amount': float(kwargs['original_amount']),
-            'gross_amount': float(kwargs['gross_amount']),
-            'converted_amount': float(kwargs['converted_amount']),
-            'net_amount': float(kwargs['converted_amount']),
-            'exchange_rate': float(kwargs['exchange_rate']),
+            'original_amount': kwargs['original_amount'],
+            'gross_amount': kwargs['gross_amount'],
+            'converted_amount': kwargs['converted_amount'],
+            'net_amount': kwargs['converted_amount'],
+            'exchange_rate': kwargs['exchange_rate'],
             'from_currency': kwargs['from_currency'],
             'to_currency': kwargs['to_currency'],
-            'fee_amount': float(kwargs['fee_data']['fee_amount']),
-            'fee_rate': float(kwargs['fee_data']['fee_rate']),
+            'fee_amount': kwargs['fee_data']['fee_amount'],
+            'fee_rate': kwargs['fee_data']['fee_rate'],
             'provider': kwargs['provider'],
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': datetime.utcnow(),
+            'as_of': kwargs.get('as_of')
         }
@@ -0,0 +1,212 @@
+# app/services/currency_graph_service.py
+from collections import deque
+from datetime import datetime, timedelta
+from decimal import Decimal
+import threading
+from app.config.base import BaseConfig
+from app.database import read_only
+
+
+class CurrencyGraph:
+    """Graphe des devises: noeuds = devises, arêtes = taux connus les plus frais"""
+    
+    def __init__(self, rates=(), max_hops=3):
+        self.max_hops = max_hops
+        self.edges = {}   # {from: {to: {'rate', 'provider', 'timestamp'}}}
+        self.routes = {}  # {(from, to): route}
+        self.built_at = datetime.utcnow()
+        
+        for rate in rates:
+            self.add_rate(**rate)
+        
+        self._precompute_routes()
+    
+    def add_rate(self, from_currency, to_currency, rate, provider, timestamp):
+        """Ajoute un taux (et son inverse) en ne gardant que l'arête la plus fraîche"""
+        from_currency = from_currency.upper()
+        to_currency = to_currency.upper()
+        rate = Decimal(str(rate))
+        
+        if from_currency == to_currency or rate <= 0:
+            return
+        
+        self._set_edge(from_currency, to_currency, rate, provider, timestamp)
+        self._set_edge(to_currency, from_currency, Decimal('1') / rate, provider, timestamp)
+    
+    def _set_edge(self, from_currency, to_currency, rate, provider, timestamp):
+        """Remplace l'arête existante uniquement si le nouveau taux est plus récent"""
+        neighbours = self.edges.setdefault(from_currency, {})
+        current = neighbours.get(to_currency)
+        
+        if current is None or timestamp > current['timestamp']:
+            neighbours[to_currency] = {
+                'rate': rate,
+                'provider': provider,
+                'timestamp': timestamp
+            }
+    
+    def _precompute_routes(self):
+        """Précalcule le meilleur chemin pour toutes les paires
+        
+        Critères par ordre de priorité: nombre de sauts minimal, puis
+        fraîcheur maximale de l'arête la plus ancienne du chemin.
+        """
+        for source in self.edges:
+            # Parcours en largeur par niveaux: best[v] = (timestamp le plus ancien, prédécesseur)
+            best = {source: (datetime.max, None)}
+            frontier = deque([source])
+            
+            for _ in range(self.max_hops):
+                next_level = {}
+                
+                for node in frontier:
+                    oldest = best[node][0]
+                    for neighbour, edge in self.edges.get(node, {}).items():
+                        if neighbour in best:
+                            continue
+                        
+                        candidate = min(oldest, edge['timestamp'])
+                        if neighbour not in next_level or candidate > next_level[neighbour][0]:
+                            next_level[neighbour] = (candidate, node)
+                
+                if not next_level:
+                    break
+                
+                best.update(next_level)
+                frontier = deque(next_level)
+            
+            for target in best:
+                if target != source:
+                    self.routes[(source, target)] = self._build_route(best, source, target)
+    
+    def _build_route(self, best, source, target):
+        """Reconstitue le chemin et le taux composé vers une cible"""
+        path = [target]
+        while path[-1] != source:
+            path.append(best[path[-1]][1])
+        path.reverse()
+        
+        rate = Decimal('1')
+        providers = []
+        for from_currency, to_currency in zip(path, path[1:]):
+            edge = self.edges[from_currency][to_currency]
+            rate *= edge['rate']
+            providers.append(edge['provider'])
+        
+        return {
+            'rate': rate,
+            'path': path,
+            'hops': len(path) - 1,
+            'providers': providers,
+            'as_of': best[target][0]
+        }
+    
+    def resolve(self, from_currency, to_currency, max_age=None):
+        """Retourne le meilleur chemin pour une paire (None si inconnu ou trop ancien)"""
+        route = self.routes.get((from_currency.upper(), to_currency.upper()))
+        
+        if route and max_age is not None:
+            if route['as_of'] < datetime.utcnow() - max_age:
+                return None
+        
+        return route
+
+
+class CurrencyGraphService:
+    """Service de résolution des paires via le graphe des devises"""
+    
+    _graph = None
+    _lock = threading.Lock()
+    _rebuild_lock = threading.Lock()  # Une seule reconstruction à la fois par processus
+    
+    @classmethod
+    def get_graph(cls):
+        """Retourne le graphe courant, reconstruit s'il est trop ancien
+        
+        Un seul thread reconstruit le graphe; les autres continuent avec le
+        graphe expiré (ou attendent le premier graphe s'il n'y en a pas).
+        """
+        graph = cls._graph
+        if not cls._is_expired(graph):
+            return graph
+        
+        if not cls._rebuild_lock.acquire(blocking=graph is None):
+            return graph
+        
+        try:
+            graph = cls._graph
+            if cls._is_expired(graph):
+                # Reconstruction périodique: un réplica suffit (la tâche de mise à jour relit le primaire)
+                with read_only():
+                    graph = cls.refresh()
+        finally:
+            cls._rebuild_lock.release()
+        
+        return graph
+    
+    @staticmethod
+    def _is_expired(graph):
+        refresh_interval = timedelta(seconds=BaseConfig.RATE_GRAPH_REFRESH_INTERVAL)
+        return graph is None or graph.built_at < datetime.utcnow() - refresh_interval
+    
+    @classmethod
+    def refresh(cls, rates=None):
+        """Reconstruit le graphe à partir d'un snapshot de taux"""
+        if rates is None:
+            rates = cls._load_snapshot()
+        
+        graph = CurrencyGraph(rates, max_hops=BaseConfig.RATE_GRAPH_MAX_HOPS)
+        
+        with cls._lock:
+            cls._graph = graph
+        
+        return graph
+    
+    @classmethod
+    def resolve(cls, from_currency, to_currency, min_hops=1):
+        """Résout une paire en s'appuyant sur le graphe précalculé
+        
+        Args:
+            min_hops: Nombre minimal de sauts (2 pour ignorer le taux direct de
+                la paire, soumis ailleurs à une règle de fraîcheur plus stricte)
+        """
+        try:
+            graph = cls.get_graph()
+        except Exception:
+            return None
+        
+        route = graph.resolve(
+            from_currency,
+            to_currency,
+            max_age=timedelta(seconds=BaseConfig.RATE_GRAPH_MAX_AGE)
+        )
+        
+        if route and route['hops'] < min_hops:
+            return None
+        
+        if route:
+            route = dict(route, provider=f"graph:{'>'.join(route['path'])}")
+        
+        return route
+    
+    @staticmethod
+    def _load_snapshot():
+        """Charge les derniers taux connus (une ligne par paire et provider)"""
+        from app.models.latest_exchange_rate import LatestExchangeRate
+        
+        since = datetime.utcnow() - timedelta(seconds=BaseConfig.RATE_GRAPH_MAX_AGE)
+        rows = LatestExchangeRate.query.filter(
+            LatestExchangeRate.updated_at >= since,
+            ~LatestExchangeRate.provider.like('graph:%')
+        ).all()
+        
+        return [
+            {
+                'from_currency': row.from_currency,
+                'to_currency': row.to_currency,
+                'rate': row.rate,
+                'provider': row.provider,
+                'timestamp': row.updated_at
+            }
+            for row in rows
+        ]
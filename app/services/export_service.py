@@ -0,0 +1,175 @@
+# app/services/export_service.py
+from datetime import datetime, timedelta
+import json
+import os
+from app.config.base import BaseConfig
+from app.extensions import db
+from app.models.conversion import Conversion
+from app.models.exchange_rate import ExchangeRate
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Dépendance optionnelle: requirements/analytics.txt
+    pa = pq = None
+
+
+def _export_specs():
+    """Colonnes exportées par table (les données de tracking ip/user agent sont exclues)"""
+    decimal = pa.decimal128(20, 8)
+    return {
+        'conversions': (Conversion, [
+            ('id', pa.string()),
+            ('user_id', pa.string()),
+            ('from_currency', pa.string()),
+            ('to_currency', pa.string()),
+            ('original_amount', decimal),
+            ('converted_amount', decimal),
+            ('exchange_rate', decimal),
+            ('fee_amount', decimal),
+            ('fee_rate', pa.decimal128(5, 4)),
+            ('provider', pa.string()),
+            ('created_at', pa.timestamp('us')),
+        ]),
+        'exchange_rates': (ExchangeRate, [
+            ('id', pa.string()),
+            ('from_currency', pa.string()),
+            ('to_currency', pa.string()),
+            ('rate', decimal),
+            ('provider', pa.string()),
+            ('is_active', pa.bool_()),
+            ('created_at', pa.timestamp('us')),
+        ]),
+    }
+
+
+class ExportService:
+    """Export incrémental des conversions et des taux en Parquet pour l'analytique
+    
+    Les lignes sont lues en flux (curseur serveur via yield_per) par ordre
+    (created_at, id) à partir du dernier point exporté, et écrites dans
+    <EXPORT_DIR>/<table>/day=YYYY-MM-DD/pair=XXX_YYY/part-<run>-<n>.parquet.
+    Les noms de fichiers dépendent du point de départ: une exécution
+    interrompue puis relancée réécrit les mêmes fichiers sans doublon.
+    """
+    
+    STATE_FILE = '_watermarks.json'
+    
+    @classmethod
+    def export_all(cls, export_dir=None, progress=None):
+        """Exporte toutes les tables depuis leur dernier point exporté
+        
+        Returns:
+            Dict {table: nombre de lignes exportées}
+        """
+        return {
+            table_name: cls.export_table(table_name, export_dir=export_dir, progress=progress)
+            for table_name in ('conversions', 'exchange_rates')
+        }
+    
+    @classmethod
+    def export_table(cls, table_name, export_dir=None, batch_size=None, progress=None):
+        """Exporte les nouvelles lignes d'une table
+        
+        Returns:
+            Nombre de lignes exportées
+        """
+        if pa is None:
+            raise RuntimeError("L'export Parquet nécessite pyarrow (requirements/analytics.txt)")
+        
+        export_dir = export_dir or BaseConfig.EXPORT_DIR
+        batch_size = batch_size or BaseConfig.EXPORT_BATCH_SIZE
+        model, columns = _export_specs()[table_name]
+        schema = pa.schema(columns)
+        
+        watermarks = cls.load_watermarks(export_dir)
+        watermark = watermarks.get(table_name)
+        run_id = ''.join(c for c in watermark['created_at'] if c.isalnum()) if watermark else 'initial'
+        
+        # created_at est fixé côté Python avant le commit: une ligne encore en cours
+        # de transaction peut porter une date antérieure à des lignes déjà visibles.
+        # Seules les lignes plus anciennes que EXPORT_LAG sont exportées.
+        upper_bound = datetime.utcnow() - timedelta(seconds=BaseConfig.EXPORT_LAG)
+        query = model.query.with_entities(*[getattr(model, name) for name, _ in columns])
+        query = query.filter(model.created_at < upper_bound)
+        if watermark:
+            created_at = datetime.fromisoformat(watermark['created_at'])
+            query = query.filter(
+                model.created_at >= created_at,
+                db.or_(model.created_at > created_at, model.id > watermark['id'])
+            )
+        query = query.order_by(model.created_at, model.id).yield_per(batch_size)
+        
+        buffers = {}   # {(jour, paire): [lignes]}
+        parts = {}     # {(jour, paire): numéro du prochain fichier}
+        buffered = 0
+        exported = 0
+        last = None
+        
+        for row in cls._stream(query):
+            key = (row.created_at.date().isoformat(), f"{row.from_currency}_{row.to_currency}")
+            buffers.setdefault(key, []).append(row)
+            buffered += 1
+            exported += 1
+            last = row
+            
+            # Mémoire bornée: les tampons sont vidés dès batch_size lignes accumulées
+            if buffered >= batch_size:
+                cls._flush(export_dir, table_name, schema, run_id, buffers, parts)
+                buffered = 0
+                if progress:
+                    progress(table_name, exported)
+        
+        cls._flush(export_dir, table_name, schema, run_id, buffers, parts)
+        
+        if last is not None:
+            watermarks[table_name] = {'created_at': last.created_at.isoformat(), 'id': last.id}
+            cls.save_watermarks(export_dir, watermarks)
+            if progress:
+                progress(table_name, exported)
+        
+        return exported
+    
+    @staticmethod
+    def _stream(query):
+        """Itère sur les lignes, lues sur le primaire (un réplica en retard ferait
+        passer des lignes sous le point exporté)"""
+        yield from query
+    
+    @classmethod
+    def _flush(cls, export_dir, table_name, schema, run_id, buffers, parts):
+        """Écrit chaque tampon (jour, paire) dans un nouveau fichier Parquet"""
+        for (day, pair), rows in buffers.items():
+            directory = os.path.join(export_dir, table_name, f"day={day}", f"pair={pair}")
+            os.makedirs(directory, exist_ok=True)
+            
+            number = parts.get((day, pair), 0)
+            parts[(day, pair)] = number + 1
+            
+            arrays = [pa.array([getattr(row, field.name) for row in rows], type=field.type) for field in schema]
+            pq.write_table(
+                pa.Table.from_arrays(arrays, schema=schema),
+                os.path.join(directory, f"part-{run_id}-{number:04d}.parquet")
+            )
+        
+        buffers.clear()
+    
+    @classmethod
+    def load_watermarks(cls, export_dir=None):
+        """Derniers points exportés par table {table: {'created_at', 'id'}}"""
+        path = os.path.join(export_dir or BaseConfig.EXPORT_DIR, cls.STATE_FILE)
+        if not os.path.exists(path):
+            return {}
+        
+        with open(path) as state_file:
+            return json.load(state_file)
+    
+    @classmethod
+    def save_watermarks(cls, export_dir, watermarks):
+        """Enregistre les points exportés (remplacement atomique du fichier d'état)"""
+        os.makedirs(export_dir, exist_ok=True)
+        path = os.path.join(export_dir, cls.STATE_FILE)
+        
+        with open(f"{path}.tmp", 'w') as state_file:
+            json.dump(watermarks, state_file)
+        os.replace(f"{path}.tmp", path)
@@ -0,0 +1,212 @@
+# app/services/partition_service.py
+from datetime import datetime
+import re
+from sqlalchemy import text
+from app.config.base import BaseConfig
+from app.extensions import db
+
+
+def month_start(value):
+    """Premier jour du mois d'une date"""
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    """Décale le premier jour du mois d'une date de n mois"""
+    month = value.month - 1 + months
+    return datetime(value.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(table_name, month):
+    """Nom de la partition mensuelle d'une table (ex: conversions_p2024_01)"""
+    return f"{table_name}_p{month:%Y_%m}"
+
+
+class PartitionService:
+    """Partitionnement mensuel par plage sur created_at (PostgreSQL uniquement)
+    
+    Les tables partitionnées gardent le schéma des modèles; seule la clé
+    primaire devient (id, created_at), contrainte imposée par PostgreSQL.
+    Les requêtes filtrées sur created_at ne lisent que les partitions utiles.
+    """
+    
+    PARTITIONED_TABLES = ('conversions', 'exchange_rates')
+    
+    @staticmethod
+    def is_supported():
+        """Vérifie que la base supporte le partitionnement déclaratif"""
+        return db.engine.dialect.name == 'postgresql'
+    
+    @classmethod
+    def is_partitioned(cls, table_name):
+        """Vérifie si une table est partitionnée"""
+        if not cls.is_supported():
+            return False
+        
+        return bool(db.session.execute(text(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table pt "
+            "JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = :name AND pg_table_is_visible(c.oid))"
+        ), {'name': table_name}).scalar())
+    
+    @classmethod
+    def list_partitions(cls, table_name):
+        """Liste les partitions mensuelles d'une table
+        
+        Returns:
+            Liste triée de tuples (début du mois, nom de la partition)
+        """
+        rows = db.session.execute(text(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = :name"
+        ), {'name': table_name}).scalars()
+        
+        pattern = re.compile(rf'^{re.escape(table_name)}_p(\d{{4}})_(\d{{2}})$')
+        partitions = []
+        for name in rows:
+            match = pattern.match(name)
+            if match:
+                partitions.append((datetime(int(match.group(1)), int(match.group(2)), 1), name))
+        
+        return sorted(partitions)
+    
+    @classmethod
+    def ensure_partitions(cls, table_name, start=None, months_ahead=None):
+        """Crée les partitions manquantes du mois de start jusqu'à n mois à venir (sans commit)
+        
+        Returns:
+            Liste des partitions créées
+        """
+        if months_ahead is None:
+            months_ahead = BaseConfig.PARTITION_MONTHS_AHEAD
+        
+        now = datetime.utcnow()
+        month = month_start(start or now)
+        last = add_months(now, months_ahead)
+        existing = {name for _, name in cls.list_partitions(table_name)}
+        
+        created = []
+        while month <= last:
+            name = partition_name(table_name, month)
+            if name not in existing:
+                db.session.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table_name} "
+                    f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+                ))
+                created.append(name)
+            month = add_months(month, 1)
+        
+        return created
+    
+    @classmethod
+    def maintain_partitions(cls):
+        """Crée les partitions à venir de toutes les tables partitionnées"""
+        created = []
+        
+        for table_name in cls.PARTITIONED_TABLES:
+            if cls.is_partitioned(table_name):
+                created.extend(cls.ensure_partitions(table_name))
+        
+        db.session.commit()
+        return created
+    
+    @classmethod
+    def drop_partitions_before(cls, table_name, cutoff, mode=None):
+        """Supprime (ou détache) les partitions entièrement antérieures à cutoff (sans commit)
+        
+        Le coût est indépendant du nombre de lignes: aucune ligne n'est lue.
+        En mode 'detach', la partition devient une table autonome (archivage).
+        
+        Returns:
+            Nombre estimé de lignes retirées (statistiques du planner)
+        """
+        mode = mode or BaseConfig.PARTITION_RETENTION_MODE
+        removed = 0
+        
+        for month, name in cls.list_partitions(table_name):
+            if add_months(month, 1) > cutoff:
+                break
+            
+            removed += db.session.execute(text(
+                "SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = :name"
+            ), {'name': name}).scalar() or 0
+            
+            if mode == 'detach':
+                db.session.execute(text(f"ALTER TABLE {table_name} DETACH PARTITION {name}"))
+            else:
+                db.session.execute(text(f"DROP TABLE {name}"))
+        
+        return removed
+    
+    @classmethod
+    def purge_before(cls, model, cutoff, **options):
+        """Supprime les lignes d'un modèle antérieures à cutoff
+        
+        Sur une table partitionnée, les mois entiers sont supprimés par
+        partition; le reste est purgé par lots (options: voir RetentionService.process).
+        """
+        from app.services.retention_service import RetentionService
+        
+        table_name = model.__tablename__
+        removed = 0
+        
+        if cls.is_partitioned(table_name):
+            removed = cls.drop_partitions_before(table_name, cutoff)
+            db.session.commit()
+        
+        report = RetentionService.process(model, [model.created_at < cutoff], **options)
+        report['rows'] += removed
+        
+        return report['rows']
+    
+    @classmethod
+    def partition_table(cls, table_name):
+        """Convertit une table existante en table partitionnée par mois (migration)
+        
+        La table est renommée, recréée partitionnée avec les mêmes colonnes,
+        les données sont copiées puis l'ancienne table est supprimée. Les index
+        et clés étrangères sont recréés depuis les métadonnées des modèles.
+        """
+        if not cls.is_supported():
+            raise NotImplementedError("Le partitionnement nécessite PostgreSQL")
+        
+        if cls.is_partitioned(table_name):
+            return False
+        
+        table = db.metadata.tables[table_name]
+        legacy_name = f"{table_name}_legacy"
+        
+        db.session.execute(text(f"ALTER TABLE {table_name} RENAME TO {legacy_name}"))
+        db.session.execute(text(
+            f"CREATE TABLE {table_name} (LIKE {legacy_name} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (created_at)"
+        ))
+        
+        oldest = db.session.execute(text(f"SELECT MIN(created_at) FROM {legacy_name}")).scalar()
+        cls.ensure_partitions(table_name, start=oldest)
+        # Filet de sécurité pour les lignes hors des partitions créées
+        db.session.execute(text(f"CREATE TABLE {table_name}_default PARTITION OF {table_name} DEFAULT"))
+        
+        db.session.execute(text(f"INSERT INTO {table_name} SELECT * FROM {legacy_name}"))
+        db.session.execute(text(f"DROP TABLE {legacy_name}"))
+        
+        # Les noms de contraintes et d'index sont libérés par la suppression de l'ancienne table
+        db.session.execute(text(
+            f"ALTER TABLE {table_name} ADD CONSTRAINT {table_name}_pkey PRIMARY KEY (id, created_at)"
+        ))
+        for foreign_key in table.foreign_key_constraints:
+            columns = ', '.join(column.name for column in foreign_key.columns)
+            referred = ', '.join(element.column.name for element in foreign_key.elements)
+            db.session.execute(text(
+                f"ALTER TABLE {table_name} ADD FOREIGN KEY ({columns}) "
+                f"REFERENCES {foreign_key.referred_table.name} ({referred})"
+            ))
+        
+        connection = db.session.connection()
+        for index in table.indexes:
+            index.create(bind=connection)
+        
+        db.session.commit()
+        return True
@@ -0,0 +1,125 @@
+# app/services/password_service.py
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+import os
+import threading
+import bcrypt
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+from app.utils.exceptions import ServiceBusyError, ValidationError
+
+
+class PasswordService:
+    """Hachage et vérification des mots de passe
+    
+    Les calculs (bcrypt libère le GIL) passent par un pool dédié de
+    PASSWORD_HASH_WORKERS threads: une rafale de connexions ne monopolise pas
+    tous les threads des workers. Au-delà de PASSWORD_HASH_QUEUE_LIMIT calculs
+    en attente, la demande est refusée immédiatement (ServiceBusyError).
+    
+    Algorithmes: bcrypt (coût BCRYPT_LOG_ROUNDS), pbkdf2 (PBKDF2_ITERATIONS)
+    ou scrypt. Les hashes d'un autre algorithme ou d'un autre coût (dont les
+    hashes werkzeug historiques) restent vérifiables et sont recalculés à la
+    connexion suivante (needs_rehash).
+    
+    bcrypt ignore les octets au-delà du 72e: les mots de passe plus longs
+    sont refusés à l'enregistrement (MAX_BYTES, voir check_length).
+    """
+    
+    MAX_BYTES = 72
+    
+    _executor = None
+    _slots = None
+    _pid = None
+    _lock = threading.Lock()
+    
+    @classmethod
+    def hash(cls, password):
+        """Hash un mot de passe avec l'algorithme et le coût configurés"""
+        algorithm, cost = cls._settings()
+        return cls._submit(cls._hash, password, algorithm, cost)
+    
+    @classmethod
+    def verify(cls, password, password_hash):
+        """Vérifie un mot de passe contre un hash (tout algorithme supporté)"""
+        if not password_hash:
+            return False
+        return cls._submit(cls._verify, password, password_hash)
+    
+    @classmethod
+    def check_length(cls, password):
+        """Refuse un mot de passe dont une partie serait ignorée par bcrypt"""
+        if len(password.encode()) > cls.MAX_BYTES:
+            raise ValidationError(f"Le mot de passe ne doit pas dépasser {cls.MAX_BYTES} octets")
+    
+    @classmethod
+    def needs_rehash(cls, password_hash):
+        """Vérifie si un hash n'utilise pas l'algorithme ou le coût configurés"""
+        algorithm, cost = cls._settings()
+        
+        if algorithm == 'bcrypt':
+            if not password_hash.startswith('$2'):
+                return True
+            return int(password_hash.split('$')[2]) != cost
+        
+        if algorithm == 'pbkdf2':
+            return not password_hash.startswith(f'pbkdf2:sha256:{cost}$')
+        
+        return not password_hash.startswith('scrypt:')
+    
+    @staticmethod
+    def _hash(password, algorithm, cost):
+        if algorithm == 'bcrypt':
+            return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=cost)).decode()
+        if algorithm == 'pbkdf2':
+            return generate_password_hash(password, method=f'pbkdf2:sha256:{cost}')
+        return generate_password_hash(password, method='scrypt')
+    
+    @staticmethod
+    def _verify(password, password_hash):
+        if password_hash.startswith('$2'):
+            return bcrypt.checkpw(password.encode(), password_hash.encode())
+        return check_password_hash(password_hash, password)
+    
+    @staticmethod
+    def _settings():
+        """Algorithme et coût configurés"""
+        algorithm = current_app.config['PASSWORD_HASH_ALGORITHM']
+        if algorithm == 'bcrypt':
+            return algorithm, current_app.config['BCRYPT_LOG_ROUNDS']
+        if algorithm == 'pbkdf2':
+            return algorithm, current_app.config['PBKDF2_ITERATIONS']
+        return algorithm, None
+    
+    @classmethod
+    def _submit(cls, function, *args):
+        """Exécute un calcul sur le pool dédié, dans la limite de la file d'attente"""
+        executor, slots = cls._pool()
+        
+        if not slots.acquire(blocking=False):
+            raise ServiceBusyError("Trop de vérifications de mot de passe en cours, réessayez")
+        
+        try:
+            future = executor.submit(function, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        
+        try:
+            return future.result(timeout=current_app.config['PASSWORD_HASH_TIMEOUT'])
+        except TimeoutError:
+            future.cancel()
+            raise ServiceBusyError("Vérification du mot de passe trop lente, réessayez")
+    
+    @classmethod
+    def _pool(cls):
+        """Pool du processus courant (recréé après un fork des workers)"""
+        if cls._pid != os.getpid():
+            with cls._lock:
+                if cls._pid != os.getpid():
+                    workers = current_app.config['PASSWORD_HASH_WORKERS'] or os.cpu_count() or 1
+                    cls._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hash')
+                    cls._slots = threading.BoundedSemaphore(workers + current_app.config['PASSWORD_HASH_QUEUE_LIMIT'])
+                    cls._pid = os.getpid()
+        
+        return cls._executor, cls._slots
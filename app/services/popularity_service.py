@@ -0,0 +1,138 @@
+# app/services/popularity_service.py
+from datetime import datetime, timedelta
+from flask import current_app
+import redis
+from app.config.base import BaseConfig
+from app.config.currencies import POPULAR_PAIRS
+from app.utils.redis_client import get_redis
+
+
+BUCKET_KEY = 'popularity:pairs:{hour}'
+WINDOW_KEY = 'popularity:window:{hours}:{hour}'
+
+
+def bucket_hour(timestamp):
+    """Heure (bucket) d'une date, au format YYYYMMDDHH"""
+    return timestamp.strftime('%Y%m%d%H')
+
+
+def pair_member(from_currency, to_currency):
+    """Membre du sorted set d'une paire"""
+    return f"{from_currency.upper()}:{to_currency.upper()}"
+
+
+class PopularityService:
+    """Popularité des paires en temps réel dans des sorted sets Redis horaires
+    
+    Chaque conversion incrémente sa paire dans le bucket de l'heure (ZINCRBY).
+    Une fenêtre de N heures est l'union (ZUNIONSTORE) des N buckets, mise en
+    cache POPULARITY_WINDOW_CACHE secondes: le top-K se lit ensuite en
+    O(log n + k). Sans Redis, les agrégats SQL horaires prennent le relais.
+    """
+    
+    @classmethod
+    def record(cls, from_currency, to_currency, timestamp=None, count=1):
+        """Compte une conversion de la paire (sans effet si Redis est indisponible)"""
+        key = BUCKET_KEY.format(hour=bucket_hour(timestamp or datetime.utcnow()))
+        
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.zincrby(key, count, pair_member(from_currency, to_currency))
+            pipe.expire(key, cls._bucket_ttl())
+            pipe.execute()
+        except redis.RedisError as e:
+            current_app.logger.warning(f"Popularité non enregistrée: {e}")
+    
+    @classmethod
+    def top_pairs(cls, window=timedelta(days=30), limit=10, now=None):
+        """Paires les plus converties sur la fenêtre, de la plus populaire à la moins populaire
+        
+        Returns:
+            Liste de dicts {'from_currency', 'to_currency', 'count'}
+        """
+        now = now or datetime.utcnow()
+        hours = max(1, int(window.total_seconds() // 3600))
+        
+        try:
+            client = get_redis()
+            window_key = WINDOW_KEY.format(hours=hours, hour=bucket_hour(now))
+            
+            if not client.exists(window_key):
+                buckets = [
+                    BUCKET_KEY.format(hour=bucket_hour(now - timedelta(hours=offset)))
+                    for offset in range(hours)
+                ]
+                pipe = client.pipeline()
+                pipe.zunionstore(window_key, buckets)
+                pipe.expire(window_key, current_app.config['POPULARITY_WINDOW_CACHE'])
+                pipe.execute()
+            
+            ranking = client.zrevrange(window_key, 0, limit - 1, withscores=True)
+        except redis.RedisError as e:
+            current_app.logger.warning(f"Popularité indisponible, lecture des agrégats: {e}")
+            return cls._top_pairs_from_rollups(hours, limit)
+        
+        return [
+            {
+                'from_currency': member.split(':')[0],
+                'to_currency': member.split(':')[1],
+                'count': int(score)
+            }
+            for member, score in ranking
+        ]
+    
+    @classmethod
+    def prioritized_pairs(cls, limit=None):
+        """Paires à rafraîchir et à préchauffer en priorité
+        
+        Les limit paires les plus converties sur les dernières 24 heures d'abord,
+        puis celles de POPULAR_PAIRS non classées (démarrage à froid, paires de référence).
+        """
+        limit = limit or BaseConfig.POPULAR_PAIRS_REFRESH_LIMIT
+        ranked = [
+            (pair['from_currency'], pair['to_currency'])
+            for pair in cls.top_pairs(window=timedelta(hours=24), limit=limit)
+        ]
+        
+        return list(dict.fromkeys(ranked + list(POPULAR_PAIRS)))
+    
+    @classmethod
+    def rebuild_from_rollups(cls, days=None):
+        """Recharge les buckets Redis depuis les agrégats horaires SQL (migration, perte de Redis)
+        
+        Returns:
+            Nombre de buckets (heure, paire) chargés
+        """
+        from app.models.conversion_rollup import PairConversionHourly
+        
+        days = days or BaseConfig.POPULARITY_RETENTION_DAYS
+        start_hour = (datetime.utcnow() - timedelta(days=days)).replace(minute=0, second=0, microsecond=0)
+        rows = PairConversionHourly.query.filter(PairConversionHourly.hour >= start_hour).all()
+        
+        pipe = get_redis().pipeline(transaction=False)
+        for row in rows:
+            key = BUCKET_KEY.format(hour=bucket_hour(row.hour))
+            pipe.zadd(key, {pair_member(row.from_currency, row.to_currency): row.conversion_count})
+            pipe.expire(key, cls._bucket_ttl())
+        pipe.execute()
+        
+        return len(rows)
+    
+    @staticmethod
+    def _bucket_ttl():
+        """Durée de vie d'un bucket horaire (secondes)"""
+        return int(timedelta(days=BaseConfig.POPULARITY_RETENTION_DAYS + 1).total_seconds())
+    
+    @staticmethod
+    def _top_pairs_from_rollups(hours, limit):
+        """Top-K calculé sur les agrégats horaires SQL (repli sans Redis)"""
+        from app.models.conversion_rollup import PairConversionHourly
+        
+        return [
+            {
+                'from_currency': pair.from_currency,
+                'to_currency': pair.to_currency,
+                'count': int(pair.conversion_count)
+            }
+            for pair in PairConversionHourly.get_popular_pairs(days=hours / 24, limit=limit)
+        ]
@@ -0,0 +1,117 @@
+# app/services/rate_compaction_service.py
+from datetime import datetime, timedelta
+from app.config.base import BaseConfig
+from app.extensions import db
+from app.models.exchange_rate import ExchangeRate
+from app.models.rate_candle import bucket_start
+from app.models.rate_compaction_watermark import RateCompactionWatermark
+
+
+class RateCompactionService:
+    """Sous-échantillonnage par paliers de l'historique des taux
+    
+    Pleine résolution sur RATE_FULL_RESOLUTION_DAYS jours, puis un taux
+    représentatif par heure jusqu'à RATE_HOURLY_RESOLUTION_DAYS jours, puis un
+    par jour. Le taux conservé est le dernier du bucket, ce qui préserve les
+    réponses "as of" aux bornes des buckets; les extrêmes restent dans rate_candles.
+    
+    Chaque paire reprend à son watermark (rate_compaction_watermarks): une
+    exécution quotidienne ne traite que les jours sortis d'un palier depuis la
+    précédente. Un taux réinséré avant le watermark (import d'historique)
+    n'est compacté qu'après suppression du watermark de la paire.
+    """
+    
+    @classmethod
+    def compact(cls, now=None, pairs=None, progress=None):
+        """Compacte l'historique de toutes les paires (ou des paires données)
+        
+        Args:
+            now: Date de référence des paliers
+            pairs: Liste de paires (from, to), toutes par défaut
+            progress: callable(from, to, deleted) appelé après chaque paire
+        
+        Returns:
+            Dict {'pairs', 'periods', 'deleted'}
+        """
+        now = now or datetime.utcnow()
+        hourly_from = bucket_start(now - timedelta(days=BaseConfig.RATE_FULL_RESOLUTION_DAYS), '1d')
+        daily_from = bucket_start(now - timedelta(days=BaseConfig.RATE_HOURLY_RESOLUTION_DAYS), '1d')
+        
+        if pairs is None:
+            pairs = db.session.query(
+                ExchangeRate.from_currency, ExchangeRate.to_currency
+            ).distinct().all()
+        
+        report = {'pairs': 0, 'periods': 0, 'deleted': 0}
+        
+        for from_currency, to_currency in pairs:
+            watermark = db.session.get(RateCompactionWatermark, (from_currency, to_currency))
+            
+            if watermark is None:
+                # Première compaction de la paire: depuis son premier taux
+                oldest = db.session.query(db.func.min(ExchangeRate.created_at)).filter(
+                    ExchangeRate.from_currency == from_currency,
+                    ExchangeRate.to_currency == to_currency
+                ).scalar()
+                
+                if oldest is None:
+                    continue
+                
+                watermark = RateCompactionWatermark(from_currency, to_currency, bucket_start(oldest, '1d'))
+                db.session.add(watermark)
+            
+            # Seuls les jours entièrement sortis d'un palier sont compactés
+            deleted = 0
+            for interval, start, end in (
+                ('1d', watermark.daily_until, daily_from),
+                ('1h', max(watermark.hourly_until, daily_from), hourly_from),
+            ):
+                day = start
+                while day < end:
+                    deleted += cls.compact_period(from_currency, to_currency, day, day + timedelta(days=1), interval)
+                    report['periods'] += 1
+                    day += timedelta(days=1)
+            
+            watermark.daily_until = max(watermark.daily_until, daily_from)
+            watermark.hourly_until = max(watermark.hourly_until, hourly_from)
+            db.session.commit()
+            
+            report['pairs'] += 1
+            report['deleted'] += deleted
+            if progress:
+                progress(from_currency, to_currency, deleted)
+        
+        return report
+    
+    @classmethod
+    def compact_period(cls, from_currency, to_currency, start, end, interval):
+        """Ne garde que le dernier taux de chaque bucket d'une période (une transaction)
+        
+        Returns:
+            Nombre de taux supprimés
+        """
+        period = (
+            ExchangeRate.from_currency == from_currency,
+            ExchangeRate.to_currency == to_currency,
+            ExchangeRate.created_at >= start,
+            ExchangeRate.created_at < end
+        )
+        
+        rows = db.session.query(
+            ExchangeRate.id, ExchangeRate.created_at
+        ).filter(*period).order_by(ExchangeRate.created_at, ExchangeRate.id).all()
+        
+        keep = {}
+        for row_id, created_at in rows:
+            keep[bucket_start(created_at, interval)] = row_id
+        
+        # Période déjà compactée
+        if len(keep) == len(rows):
+            return 0
+        
+        deleted = ExchangeRate.query.filter(
+            *period, ExchangeRate.id.notin_(list(keep.values()))
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        
+        return deleted
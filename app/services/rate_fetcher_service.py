@@ -19,10 +19,10 @@ class RateFetcherService:
         
         # Provider Fixer.io (si clé API disponible)
         if BaseConfig.FIXER_API_KEY:
-            providers.append(FixerProvider(BaseConfig.FIXER_API_KEY))
+            providers.append(FixerProvider(BaseConfig.FIXER_API_KEY, BaseConfig.FIXER_API_URL))
         
         # Provider ECB (gratuit, toujours disponible)
-        providers.append(ECBProvider())
+        providers.append(ECBProvider(BaseConfig.ECB_API_URL))
         
         return providers
     
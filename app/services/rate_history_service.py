@@ -0,0 +1,115 @@
+# app/services/rate_history_service.py
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import threading
+from app.config.base import BaseConfig
+from app.database import read_only
+from app.models.exchange_rate import ExchangeRate
+
+
+class RateSeries:
+    """Série temporelle triée des taux d'une paire, chargée en mémoire"""
+    
+    def __init__(self, points, start_date, loaded_at):
+        self.times = [point[0] for point in points]
+        self.points = points
+        self.start_date = start_date
+        self.loaded_at = loaded_at
+    
+    def covers(self, as_of):
+        """Vérifie si la série couvre la date demandée"""
+        return self.start_date <= as_of < self.loaded_at
+    
+    def rate_as_of(self, as_of):
+        """Dernier point connu à la date demandée (recherche dichotomique)"""
+        index = bisect_right(self.times, as_of) - 1
+        return self.points[index] if index >= 0 else None
+
+
+class RateHistoryService:
+    """Service de consultation des taux historiques ("as of")"""
+    
+    _series = OrderedDict()  # LRU {(from, to): RateSeries}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get_rate_as_of(cls, from_currency, to_currency, as_of):
+        """Retourne le taux en vigueur à une date donnée
+        
+        Returns:
+            Dict {'rate', 'provider', 'timestamp'} ou None si aucun taux connu
+        """
+        from_currency = from_currency.upper()
+        to_currency = to_currency.upper()
+        
+        # Date hors de la fenêtre: lecture ponctuelle, sans charger la série de la paire
+        window_start = datetime.utcnow() - timedelta(days=BaseConfig.RATE_HISTORY_WINDOW_DAYS)
+        if as_of >= window_start:
+            series = cls._get_series(from_currency, to_currency)
+            if series.covers(as_of):
+                point = series.rate_as_of(as_of)
+                # Un point absent en début de fenêtre peut exister plus tôt en base
+                if point is not None:
+                    return cls._to_dict(point)
+        
+        rate = ExchangeRate.get_rate_as_of(from_currency, to_currency, as_of)
+        if rate is None:
+            return None
+        
+        return cls._to_dict((rate.created_at, rate.rate, rate.provider))
+    
+    @classmethod
+    def get_rates_as_of(cls, from_currency, to_currency, timestamps):
+        """Retourne en lot les taux en vigueur à plusieurs dates (jobs de réconciliation)"""
+        points = ExchangeRate.get_rates_as_of(from_currency, to_currency, list(timestamps))
+        return [cls._to_dict(point) if point else None for point in points]
+    
+    @classmethod
+    def invalidate(cls, from_currency=None, to_currency=None):
+        """Invalide la série d'une paire (ou toutes les séries)"""
+        with cls._lock:
+            if from_currency and to_currency:
+                cls._series.pop((from_currency.upper(), to_currency.upper()), None)
+            else:
+                cls._series.clear()
+    
+    @classmethod
+    def _get_series(cls, from_currency, to_currency):
+        """Récupère la série d'une paire depuis le LRU, rechargée si expirée"""
+        key = (from_currency, to_currency)
+        now = datetime.utcnow()
+        refresh_interval = timedelta(seconds=BaseConfig.RATE_HISTORY_REFRESH_INTERVAL)
+        
+        with cls._lock:
+            series = cls._series.get(key)
+            if series is not None and series.loaded_at >= now - refresh_interval:
+                cls._series.move_to_end(key)
+                return series
+        
+        start_date = now - timedelta(days=BaseConfig.RATE_HISTORY_WINDOW_DAYS)
+        with read_only():
+            rows = ExchangeRate.get_rate_series(from_currency, to_currency, start_date)
+        series = RateSeries(
+            [(row.created_at, row.rate, row.provider) for row in rows],
+            start_date=start_date,
+            loaded_at=now
+        )
+        
+        with cls._lock:
+            cls._series[key] = series
+            cls._series.move_to_end(key)
+            while len(cls._series) > BaseConfig.RATE_HISTORY_MAX_PAIRS:
+                cls._series.popitem(last=False)
+        
+        return series
+    
+    @staticmethod
+    def _to_dict(point):
+        """Convertit un point (timestamp, taux, provider) en dictionnaire"""
+        timestamp, rate, provider = point
+        return {
+            'rate': rate,
+            'provider': provider,
+            'timestamp': timestamp
+        }
@@ -0,0 +1,97 @@
+# app/services/retention_service.py
+import time
+from sqlalchemy import delete, select, tuple_, update
+from app.config.base import BaseConfig
+from app.extensions import db
+
+
+class RetentionService:
+    """Moteur de rétention: suppressions et mises à jour ensemblistes par lots bornés
+    
+    Chaque lot est un DELETE/UPDATE ... WHERE id IN (SELECT id ... LIMIT n)
+    validé aussitôt: mémoire et verrous restent bornés quel que soit le volume.
+    Les lignes traitées ne correspondant plus au filtre, une exécution
+    interrompue (ou limitée par max_batches) reprend là où elle s'était arrêtée.
+    """
+    
+    last_report = {}  # {table: {'rows', 'batches', 'complete'}}
+    
+    @classmethod
+    def process(cls, model, criteria, values=None, batch_size=None, pause=None,
+                max_batches=None, progress=None, name=None):
+        """Supprime (ou met à jour) par lots les lignes correspondant aux critères
+        
+        Args:
+            model: Modèle cible
+            criteria: Liste de conditions SQLAlchemy
+            values: Colonnes à mettre à jour (None: suppression)
+            batch_size: Nombre de lignes par lot
+            pause: Pause entre deux lots, en secondes
+            max_batches: Nombre maximal de lots pour cette exécution
+            progress: callable(table, rows, batches) appelé après chaque lot
+            name: Nom de la règle dans le rapport (défaut: nom de la table)
+        
+        Returns:
+            Dict {'rows', 'batches', 'complete'}
+        """
+        batch_size = batch_size or BaseConfig.RETENTION_BATCH_SIZE
+        pause = BaseConfig.RETENTION_BATCH_PAUSE if pause is None else pause
+        table = model.__table__
+        name = name or table.name
+        
+        # Lignes désignées par leur clé primaire (composite pour rate_candles)
+        columns = list(table.primary_key.columns)
+        key = tuple_(*columns) if len(columns) > 1 else columns[0]
+        ids = select(*columns).where(*criteria).limit(batch_size)
+        if values is None:
+            statement = delete(table).where(key.in_(ids))
+        else:
+            statement = update(table).where(key.in_(ids)).values(**values)
+        
+        report = {'rows': 0, 'batches': 0, 'complete': False}
+        cls.last_report[name] = report
+        
+        while max_batches is None or report['batches'] < max_batches:
+            count = db.session.execute(statement).rowcount
+            db.session.commit()
+            
+            if count:
+                report['rows'] += count
+                report['batches'] += 1
+                if progress:
+                    progress(name, report['rows'], report['batches'])
+            
+            if count < batch_size:
+                report['complete'] = True
+                break
+            
+            if pause:
+                time.sleep(pause)
+        
+        return report
+    
+    @classmethod
+    def run(cls, progress=None, max_batches=None):
+        """Applique toutes les règles de rétention
+        
+        Returns:
+            Rapport par table {'rows', 'batches', 'complete'}
+        """
+        from app.models.conversion import Conversion
+        from app.models.exchange_rate import ExchangeRate
+        from app.models.rate_candle import RateCandle
+        from app.models.refresh_token import RefreshToken
+        from app.models.session import Session
+        
+        options = {'progress': progress, 'max_batches': max_batches}
+        cls.last_report = {}
+        
+        Session.cleanup_expired_sessions(**options)
+        RefreshToken.cleanup_expired_tokens(**options)
+        ExchangeRate.cleanup_old_rates(days=BaseConfig.RATE_RETENTION_DAYS, **options)
+        RateCandle.cleanup_old_candles(BaseConfig.CANDLE_RETENTION_DAYS, **options)
+        
+        if BaseConfig.CONVERSION_RETENTION_DAYS:
+            Conversion.cleanup_old_conversions(days=BaseConfig.CONVERSION_RETENTION_DAYS, **options)
+        
+        return dict(cls.last_report)
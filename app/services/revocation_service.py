@@ -0,0 +1,302 @@
+# app/services/revocation_service.py
+import threading
+import time
+from flask import current_app
+import redis
+from app.config.base import BaseConfig
+from app.extensions import db
+from app.utils.bloom import BloomFilter
+from app.utils.redis_client import get_redis
+
+
+REVOKED_KEY = 'revoked:{member}'
+GENERATION_KEY = 'gen:{user_id}'
+REPLAY_BATCH_SIZE = 1000  # Entrées du flux lues par XRANGE
+
+
+class RevocationState:
+    """État de révocation d'un worker: filtre local, générations connues, position dans le flux"""
+    
+    def __init__(self, capacity, error_rate):
+        self.filter = BloomFilter(capacity, error_rate)
+        self.generations = {}  # {user_id: génération de tokens courante}
+        self.api_keys = set()  # Clés API révoquées (identifiants)
+        self.last_id = None
+        self.synced_at = 0.0
+        self.rebuilt_at = float('-inf')
+        self.degraded = False  # Dernière synchronisation en échec: générations relues à la source
+        self.generation_checks = {}  # {user_id: instant de la dernière relecture (mode dégradé)}
+        self.lock = threading.Lock()
+
+
+class RevocationService:
+    """Révocation des tokens JWT: filtre de Bloom local + Redis
+    
+    Trois formes de révocation, publiées dans le flux Redis REVOCATION_STREAM:
+    - un token (jti) ou une session (session_id): clé revoked:<membre> avec TTL
+      et ajout au filtre de Bloom local;
+    - tous les tokens d'un utilisateur: sa génération de tokens est incrémentée,
+      les tokens portant une génération antérieure (claim gen) sont refusés.
+    Les révocations de clés API (ApiKeyService) suivent le même flux.
+    
+    Chaque worker rejoue ce flux au plus toutes les REVOCATION_SYNC_INTERVAL
+    secondes: un token valide est vérifié sans aucun accès réseau. Seules les
+    présences dans le filtre (révocations et rares faux positifs) sont
+    confirmées dans Redis. Si le flux ne peut pas être lu, la génération d'un
+    utilisateur est relue (clé gen:<user_id>, sinon users.token_generation)
+    au plus une fois par intervalle, et les sessions et jti absents du filtre
+    sont vérifiés dans Redis à chaque requête (revoked:<membre>). Redis
+    injoignable, une session est relue en base (sessions.is_active); un jti
+    révoqué par un autre worker n'est alors refusé qu'après le retour du flux.
+    """
+    
+    @classmethod
+    def revoke(cls, jti, expires_in_seconds):
+        """Révoque un token jusqu'à son expiration"""
+        cls.revoke_many([jti], expires_in_seconds)
+    
+    @classmethod
+    def revoke_many(cls, jtis, expires_in_seconds):
+        """Révoque plusieurs tokens (un seul aller-retour Redis)"""
+        cls._revoke_members(jtis, 'jti', expires_in_seconds)
+    
+    @classmethod
+    def revoke_sessions(cls, session_ids):
+        """Révoque tous les tokens émis pour des sessions"""
+        expires_in_seconds = BaseConfig.JWT_REFRESH_TOKEN_EXPIRES.total_seconds()
+        cls._revoke_members(session_ids, 'session', expires_in_seconds)
+    
+    @classmethod
+    def publish_generation(cls, user_id, generation):
+        """Publie la nouvelle génération de tokens d'un utilisateur (révocation de tous ses tokens)"""
+        state = cls._state()
+        with state.lock:
+            state.generations[user_id] = max(generation, state.generations.get(user_id, 0))
+        
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            pipe.set(GENERATION_KEY.format(user_id=user_id), generation,
+                     ex=int(BaseConfig.JWT_REFRESH_TOKEN_EXPIRES.total_seconds()))
+            pipe.xadd(current_app.config['REVOCATION_STREAM'],
+                      {'user': user_id, 'gen': generation}, minid=cls._stream_min_id())
+            pipe.execute()
+        except redis.RedisError as e:
+            current_app.logger.error(f"Révocation non propagée aux autres workers: {e}")
+    
+    @classmethod
+    def revoke_api_key(cls, key_id):
+        """Publie la révocation d'une clé API (retirée des caches de tous les workers)"""
+        state = cls._state()
+        with state.lock:
+            state.api_keys.add(key_id)
+        
+        try:
+            get_redis().xadd(current_app.config['REVOCATION_STREAM'],
+                             {'api_key': key_id}, minid=cls._stream_min_id())
+        except redis.RedisError as e:
+            current_app.logger.error(f"Révocation non propagée aux autres workers: {e}")
+    
+    @classmethod
+    def is_api_key_revoked(cls, key_id):
+        """Vérifie si une clé API a été révoquée depuis sa mise en cache (sans accès réseau)"""
+        state = cls._state()
+        cls._sync(state)
+        return key_id in state.api_keys
+    
+    @classmethod
+    def is_token_revoked(cls, payload):
+        """Vérifie un token décodé: génération, session puis jti"""
+        state = cls._state()
+        cls._sync(state)
+        
+        if payload.get('gen', 0) < cls._generation(state, payload['sub']):
+            return True
+        
+        session_id = payload.get('session_id')
+        if session_id and cls._is_member(state, f"session:{session_id}"):
+            return True
+        
+        return cls._is_member(state, payload['jti'])
+    
+    @classmethod
+    def is_revoked(cls, jti):
+        """Vérifie si un token est révoqué individuellement"""
+        state = cls._state()
+        cls._sync(state)
+        return cls._is_member(state, jti)
+    
+    @classmethod
+    def _revoke_members(cls, values, kind, expires_in_seconds):
+        """Révoque des jti ou des sessions: filtre local, clés Redis et flux"""
+        if not values:
+            return
+        
+        members = [value if kind == 'jti' else f"{kind}:{value}" for value in values]
+        state = cls._state()
+        with state.lock:
+            for member in members:
+                state.filter.add(member)
+        
+        expires_in_seconds = max(1, int(expires_in_seconds))
+        try:
+            pipe = get_redis().pipeline(transaction=False)
+            for value, member in zip(values, members):
+                pipe.set(REVOKED_KEY.format(member=member), 1, ex=expires_in_seconds)
+                pipe.xadd(current_app.config['REVOCATION_STREAM'], {kind: value}, minid=cls._stream_min_id())
+            pipe.execute()
+        except redis.RedisError as e:
+            current_app.logger.error(f"Révocation non propagée aux autres workers: {e}")
+    
+    @classmethod
+    def _is_member(cls, state, member):
+        """Présence dans le filtre, confirmée dans Redis (accès réseau uniquement si présent)"""
+        if member not in state.filter:
+            # Flux illisible: les révocations des autres workers ne sont pas dans le filtre
+            return state.degraded and cls._is_revoked_at_source(member)
+        
+        try:
+            return bool(get_redis().exists(REVOKED_KEY.format(member=member)))
+        except redis.RedisError:
+            # Présent dans le filtre et Redis injoignable: refus par prudence
+            return True
+    
+    @staticmethod
+    def _is_revoked_at_source(member):
+        """Révocation lue dans Redis, sinon en base pour une session (mode dégradé)"""
+        try:
+            return bool(get_redis().exists(REVOKED_KEY.format(member=member)))
+        except redis.RedisError:
+            if not member.startswith('session:'):
+                return False
+            from app.models.session import Session
+            session_id = member.split(':', 1)[1]
+            return db.session.query(Session.is_active).filter(Session.id == session_id).scalar() is False
+    
+    @classmethod
+    def _sync(cls, state):
+        """Applique les révocations publiées depuis la dernière synchronisation"""
+        now = time.monotonic()
+        if now - state.synced_at < current_app.config['REVOCATION_SYNC_INTERVAL']:
+            return
+        
+        rebuild = False
+        with state.lock:
+            if now - state.synced_at < current_app.config['REVOCATION_SYNC_INTERVAL']:
+                return
+            state.synced_at = now
+            
+            try:
+                cls._replay(state, state.last_id)
+                state.degraded = False
+            except redis.RedisError as e:
+                state.degraded = True
+                current_app.logger.warning(f"Synchronisation des révocations impossible: {e}")
+            
+            # Filtre saturé: une reconstruction au plus par durée de vie des tokens d'accès
+            # (les jti révoqués qui sortent du filtre pendant cet intervalle)
+            rebuild_interval = BaseConfig.JWT_ACCESS_TOKEN_EXPIRES.total_seconds()
+            if not state.degraded and state.filter.is_saturated() and now - state.rebuilt_at >= rebuild_interval:
+                state.rebuilt_at = now
+                rebuild = True
+        
+        if rebuild:
+            try:
+                cls._rebuild(state)
+            except redis.RedisError as e:
+                current_app.logger.warning(f"Reconstruction du filtre de révocation impossible: {e}")
+    
+    @classmethod
+    def _rebuild(cls, state):
+        """Reconstruit le filtre depuis le flux, dimensionné sur sa longueur
+        
+        Le flux est relu hors du verrou (les vérifications de tokens continuent
+        sur l'ancien filtre); seul le rattrapage final est fait sous le verrou.
+        """
+        length = get_redis().xlen(current_app.config['REVOCATION_STREAM'])
+        rebuilt = RevocationState(
+            max(current_app.config['REVOCATION_FILTER_CAPACITY'], 2 * length),
+            current_app.config['REVOCATION_FILTER_ERROR_RATE']
+        )
+        cls._replay(rebuilt, None)
+        
+        with state.lock:
+            cls._replay(rebuilt, rebuilt.last_id)
+            state.filter = rebuilt.filter
+            state.last_id = rebuilt.last_id
+            for user_id, generation in rebuilt.generations.items():
+                state.generations[user_id] = max(generation, state.generations.get(user_id, 0))
+            state.api_keys |= rebuilt.api_keys
+    
+    @classmethod
+    def _generation(cls, state, user_id):
+        """Génération de tokens courante d'un utilisateur
+        
+        Lue dans l'état local; si le flux est injoignable, relue à la source
+        pour ne pas accepter les tokens d'une déconnexion globale non rejouée.
+        """
+        if state.degraded:
+            now = time.monotonic()
+            if now - state.generation_checks.get(user_id, 0.0) >= current_app.config['REVOCATION_SYNC_INTERVAL']:
+                generation = cls._read_generation(user_id)
+                with state.lock:
+                    state.generations[user_id] = max(generation, state.generations.get(user_id, 0))
+                    state.generation_checks[user_id] = now
+        
+        return state.generations.get(user_id, 0)
+    
+    @staticmethod
+    def _read_generation(user_id):
+        """Génération publiée dans Redis, sinon celle enregistrée en base"""
+        try:
+            generation = get_redis().get(GENERATION_KEY.format(user_id=user_id))
+            return int(generation or 0)
+        except redis.RedisError:
+            from app.models.user import User
+            return db.session.query(User.token_generation).filter(User.id == user_id).scalar() or 0
+    
+    @staticmethod
+    def _replay(state, after_id):
+        """Applique les entrées du flux postérieures à after_id (tout le flux si None)
+        
+        Les jti révoqués (tokens d'accès) plus anciens que la durée de vie d'un
+        token d'accès ne sont plus ajoutés au filtre: ces tokens ont expiré.
+        """
+        stream = current_app.config['REVOCATION_STREAM']
+        jti_cutoff = int((time.time() - BaseConfig.JWT_ACCESS_TOKEN_EXPIRES.total_seconds()) * 1000)
+        
+        while True:
+            entries = get_redis().xrange(stream, min=f'({after_id}' if after_id else '-', count=REPLAY_BATCH_SIZE)
+            
+            for entry_id, fields in entries:
+                if 'jti' in fields:
+                    if int(entry_id.split('-')[0]) >= jti_cutoff:
+                        state.filter.add(fields['jti'])
+                elif 'session' in fields:
+                    state.filter.add(f"session:{fields['session']}")
+                elif 'user' in fields:
+                    user_id = fields['user']
+                    state.generations[user_id] = max(int(fields['gen']), state.generations.get(user_id, 0))
+                elif 'api_key' in fields:
+                    state.api_keys.add(fields['api_key'])
+                state.last_id = after_id = entry_id
+            
+            if len(entries) < REPLAY_BATCH_SIZE:
+                return
+    
+    @staticmethod
+    def _state():
+        """État de révocation du worker (un par application et par processus)"""
+        state = current_app.extensions.get('revocation')
+        if state is None:
+            state = current_app.extensions.setdefault('revocation', RevocationState(
+                current_app.config['REVOCATION_FILTER_CAPACITY'],
+                current_app.config['REVOCATION_FILTER_ERROR_RATE']
+            ))
+        return state
+    
+    @staticmethod
+    def _stream_min_id():
+        """Identifiant minimal conservé dans le flux: les entrées plus anciennes que la
+        durée de vie maximale d'un token ne servent plus"""
+        retention = BaseConfig.JWT_REFRESH_TOKEN_EXPIRES.total_seconds()
+        return f"{int((time.time() - retention) * 1000)}-0"
@@ -1,15 +1,21 @@
 # app/services/session_service.py
 from datetime import datetime
 import secrets
+from flask import current_app
+import redis
+from app.database import unit_of_work
+from app.extensions import db
 from app.models.session import Session
-from app.services.token_service import TokenService
+from app.models.user import User
+from app.services.revocation_service import RevocationService
+from app.services.session_store import RedisSessionStore, SqlSessionStore
 
 
 class SessionService:
     """Service de gestion des sessions"""
     
     @staticmethod
-    def create_session(user_id, ip_address=None, user_agent=None, device_type='web'):
+    def create_session(user_id, ip_address=None, user_agent=None, device_type='web', commit=True):
         """Crée une nouvelle session"""
         
         session_token = secrets.token_urlsafe(32)
@@ -22,38 +28,95 @@ class SessionService:
             device_type=device_type
         )
         
-        return session.save()
+        return session.save(commit=commit)
+    
+    @staticmethod
+    def store():
+        """Backend des sessions actives selon SESSION_BACKEND (sql ou redis)"""
+        if current_app.config.get('SESSION_BACKEND') == 'redis':
+            return RedisSessionStore
+        return SqlSessionStore
+    
+    @staticmethod
+    def can_create_session(user):
+        """Vérifie si l'utilisateur peut ouvrir une nouvelle session"""
+        from app.config.base import BaseConfig
+        return SessionService.store().count_active(user) < BaseConfig.MAX_SESSIONS_PER_USER
     
     @staticmethod
     def get_user_sessions(user_id, active_only=True):
         """Récupère les sessions d'un utilisateur"""
-        query = Session.query.filter_by(user_id=user_id)
-        
         if active_only:
-            query = query.filter_by(is_active=True)
+            return SessionService.store().list(user_id)
         
-        return query.order_by(Session.last_activity.desc()).all()
+        return Session.query.filter_by(user_id=user_id).order_by(Session.last_activity.desc()).all()
+    
+    @staticmethod
+    def flush_activity():
+        """Reporte en base l'activité des sessions (backend redis)"""
+        return SessionService.store().flush_activity()
     
     @staticmethod
     def deactivate_session(session_id):
         """Désactive une session et révoque les tokens associés"""
+        return SessionService._deactivate([Session.id == session_id]) > 0
+    
+    @staticmethod
+    def deactivate_sessions(user_id, session_id=None):
+        """Désactive les sessions actives d'un utilisateur (ou l'une d'elles) et révoque leurs tokens
+        
+        Sans session_id, tous les tokens de l'utilisateur sont révoqués par
+        l'incrément de sa génération de tokens: aucune écriture par token.
         
-        session = Session.query.get(session_id)
-        if not session:
-            return False
+        Returns:
+            Nombre de sessions désactivées
+        """
+        if session_id:
+            return SessionService._deactivate([Session.user_id == user_id, Session.id == session_id])
         
-        # Désactiver la session
-        session.deactivate()
+        with unit_of_work():
+            generation = User.increment_token_generation(user_id)
+            result = db.session.execute(
+                db.update(Session).where(
+                    Session.user_id == user_id,
+                    Session.is_active == True
+                ).values(is_active=False),
+                execution_options={'synchronize_session': False}
+            )
         
-        # Révoquer tous les refresh tokens de cette session
-        for refresh_token in session.refresh_tokens:
-            if not refresh_token.is_revoked:
-                refresh_token.revoke()
-                
-                # Ajouter le JTI à la blacklist
-                TokenService.blacklist_token(refresh_token.jti, 3600)  # 1 heure
+        # Révocation publiée avant le nettoyage du backend des sessions, qui peut échouer
+        if generation is not None:
+            RevocationService.publish_generation(user_id, generation)
+        SessionService._remove_from_store(lambda store: store.remove_user(user_id))
+        return result.rowcount
+    
+    @staticmethod
+    def _deactivate(criteria):
+        """Désactive des sessions en une requête et révoque les tokens émis pour elles
         
-        return True
+        Les refresh tokens ne sont pas modifiés un par un: le rafraîchissement
+        exige une session active, et la révocation de la session refuse les
+        tokens d'accès qui la référencent.
+        """
+        sessions = db.session.execute(
+            db.update(Session).where(*criteria, Session.is_active == True).values(is_active=False)
+            .returning(Session.id, Session.user_id),
+            execution_options={'synchronize_session': False}
+        ).all()
+        db.session.commit()
+        
+        RevocationService.revoke_sessions([session.id for session in sessions])
+        SessionService._remove_from_store(lambda store: store.remove([tuple(session) for session in sessions]))
+        return len(sessions)
+    
+    @staticmethod
+    def _remove_from_store(remove):
+        """Retire des sessions du backend actif; un échec Redis est journalisé
+        (les sessions sont déjà désactivées en base et leurs tokens révoqués)"""
+        try:
+            remove(SessionService.store())
+        except redis.RedisError as e:
+            current_app.logger.error(f"Sessions non retirées du backend redis: {e}")
     
     @staticmethod
     def cleanup_expired_sessions():
@@ -0,0 +1,221 @@
+# app/services/session_store.py
+from datetime import datetime
+from sqlalchemy import bindparam
+from app.config.base import BaseConfig
+from app.extensions import db
+from app.models.session import Session
+from app.utils.redis_client import get_redis
+
+
+SESSION_KEY = 'session:{session_id}'
+USER_SESSIONS_KEY = 'user_sessions:{user_id}'
+DIRTY_SESSIONS_KEY = 'sessions:dirty'
+
+EPOCH = datetime(1970, 1, 1)
+
+# Met à jour l'activité d'une session seulement si son hash existe encore (pas de
+# hash recréé sans TTL après une déconnexion concurrente) et la marque à reporter
+TOUCH_SCRIPT = """
+if redis.call('exists', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('hset', KEYS[1], 'last_activity', ARGV[1])
+redis.call('sadd', KEYS[2], ARGV[2])
+return 1
+"""
+
+SESSION_FIELDS = ('user_id', 'device_type', 'ip_address', 'user_agent',
+                  'created_at', 'last_activity', 'expires_at')
+
+
+def _score(timestamp):
+    """Score d'une date UTC naïve dans un sorted set (secondes depuis l'epoch)"""
+    return (timestamp - EPOCH).total_seconds()
+
+
+class SessionRecord:
+    """Session lue dans Redis (mêmes attributs que le modèle Session pour l'affichage)"""
+    
+    def __init__(self, session_id, fields):
+        self.id = session_id
+        self.is_active = True
+        for name in SESSION_FIELDS:
+            value = fields.get(name) or None
+            if value and name in ('created_at', 'last_activity', 'expires_at'):
+                value = datetime.fromisoformat(value)
+            setattr(self, name, value)
+    
+    def is_expired(self):
+        """Vérifie si la session est expirée"""
+        return datetime.utcnow() > self.expires_at
+
+
+class SqlSessionStore:
+    """Sessions actives lues dans la table sessions (backend par défaut)"""
+    
+    COUNTS_IN_SQL = True
+    
+    @staticmethod
+    def count_active(user):
+        """Nombre de sessions actives (compté avec l'utilisateur par User.find_for_login)"""
+        return user.get_active_sessions_count()
+    
+    @staticmethod
+    def add(session):
+        """Enregistre une session créée (déjà en base)"""
+    
+    @staticmethod
+    def is_active(session):
+        """Vérifie qu'une session est active"""
+        return session.is_active and not session.is_expired()
+    
+    @staticmethod
+    def touch(session):
+        """Met à jour l'activité de la session (dans la transaction en cours)"""
+        session.refresh_activity(commit=False)
+    
+    @staticmethod
+    def list(user_id):
+        """Sessions actives d'un utilisateur, de la plus récente à la plus ancienne"""
+        return Session.query.filter_by(user_id=user_id, is_active=True).order_by(
+            Session.last_activity.desc()
+        ).all()
+    
+    @staticmethod
+    def remove(sessions):
+        """Retire des sessions désactivées [(session_id, user_id)]"""
+    
+    @staticmethod
+    def remove_user(user_id):
+        """Retire toutes les sessions d'un utilisateur"""
+    
+    @staticmethod
+    def flush_activity(batch_size=None):
+        """Reporte en base les activités en attente (aucune avec ce backend)"""
+        return 0
+
+
+class RedisSessionStore:
+    """Sessions actives dans Redis: un hash par session, un sorted set par utilisateur
+    
+    Les hashes expirent avec la session (TTL) et le sorted set de l'utilisateur
+    est indexé par date d'expiration: le comptage et la vérification d'une
+    session ne lisent pas la base. La table sessions reste l'historique
+    d'audit: last_activity y est reporté par lots (flush_activity).
+    """
+    
+    COUNTS_IN_SQL = False
+    
+    @classmethod
+    def count_active(cls, user):
+        """Nombre de sessions actives (les sessions expirées sont purgées au passage)"""
+        key = USER_SESSIONS_KEY.format(user_id=user.id)
+        pipe = get_redis().pipeline()
+        pipe.zremrangebyscore(key, '-inf', _score(datetime.utcnow()))
+        pipe.zcard(key)
+        return pipe.execute()[1]
+    
+    @classmethod
+    def add(cls, session):
+        """Enregistre une session créée (après le commit de la ligne d'audit)"""
+        key = SESSION_KEY.format(session_id=session.id)
+        user_key = USER_SESSIONS_KEY.format(user_id=session.user_id)
+        fields = {
+            name: value.isoformat() if isinstance(value, datetime) else (value or '')
+            for name, value in ((name, getattr(session, name)) for name in SESSION_FIELDS)
+        }
+        ttl = max(1, int((session.expires_at - datetime.utcnow()).total_seconds()))
+        
+        pipe = get_redis().pipeline()
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, ttl)
+        pipe.zadd(user_key, {session.id: _score(session.expires_at)})
+        pipe.expire(user_key, int(BaseConfig.SESSION_TIMEOUT.total_seconds()))
+        pipe.execute()
+    
+    @classmethod
+    def is_active(cls, session):
+        """Vérifie qu'une session est active (le hash disparaît à l'expiration ou à la désactivation)"""
+        return bool(get_redis().exists(SESSION_KEY.format(session_id=session.id)))
+    
+    @classmethod
+    def touch(cls, session):
+        """Met à jour l'activité dans Redis; la base est mise à jour au prochain flush"""
+        get_redis().register_script(TOUCH_SCRIPT)(
+            keys=[SESSION_KEY.format(session_id=session.id), DIRTY_SESSIONS_KEY],
+            args=[datetime.utcnow().isoformat(), session.id]
+        )
+    
+    @classmethod
+    def list(cls, user_id):
+        """Sessions actives d'un utilisateur, de la plus récente à la plus ancienne"""
+        client = get_redis()
+        key = USER_SESSIONS_KEY.format(user_id=user_id)
+        client.zremrangebyscore(key, '-inf', _score(datetime.utcnow()))
+        session_ids = client.zrange(key, 0, -1)
+        
+        pipe = client.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.hgetall(SESSION_KEY.format(session_id=session_id))
+        
+        sessions = [
+            SessionRecord(session_id, fields)
+            for session_id, fields in zip(session_ids, pipe.execute()) if fields
+        ]
+        return sorted(sessions, key=lambda session: session.last_activity, reverse=True)
+    
+    @classmethod
+    def remove(cls, sessions):
+        """Retire des sessions désactivées [(session_id, user_id)]"""
+        if not sessions:
+            return
+        
+        pipe = get_redis().pipeline()
+        for session_id, user_id in sessions:
+            pipe.delete(SESSION_KEY.format(session_id=session_id))
+            pipe.zrem(USER_SESSIONS_KEY.format(user_id=user_id), session_id)
+        pipe.execute()
+    
+    @classmethod
+    def remove_user(cls, user_id):
+        """Retire toutes les sessions d'un utilisateur"""
+        client = get_redis()
+        key = USER_SESSIONS_KEY.format(user_id=user_id)
+        session_ids = client.zrange(key, 0, -1)
+        client.delete(key, *[SESSION_KEY.format(session_id=session_id) for session_id in session_ids])
+    
+    @classmethod
+    def flush_activity(cls, batch_size=None):
+        """Reporte en base, par lots, les dernières activités des sessions touchées
+        
+        Returns:
+            Nombre de sessions mises à jour
+        """
+        batch_size = batch_size or BaseConfig.SESSION_ACTIVITY_FLUSH_BATCH
+        client = get_redis()
+        flushed = 0
+        
+        while True:
+            session_ids = client.spop(DIRTY_SESSIONS_KEY, batch_size)
+            if not session_ids:
+                return flushed
+            
+            pipe = client.pipeline(transaction=False)
+            for session_id in session_ids:
+                pipe.hget(SESSION_KEY.format(session_id=session_id), 'last_activity')
+            
+            rows = [
+                {'session_id': session_id, 'last_activity': datetime.fromisoformat(last_activity)}
+                for session_id, last_activity in zip(session_ids, pipe.execute()) if last_activity
+            ]
+            if rows:
+                # UPDATE Core par clé primaire en executemany: une session supprimée
+                # entre-temps (cascade) est ignorée au lieu de faire échouer le lot
+                table = Session.__table__
+                db.session.execute(
+                    table.update().where(table.c.id == bindparam('session_id'))
+                    .values(last_activity=bindparam('last_activity')),
+                    rows
+                )
+                db.session.commit()
+            flushed += len(rows)
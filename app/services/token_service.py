@@ -1,8 +1,7 @@
 # app/services/token_service.py
 from flask_jwt_extended import decode_token, get_jti
-from app.extensions import cache
 from app.models.refresh_token import RefreshToken
-import redis
+from app.services.revocation_service import RevocationService
 
 
 class TokenService:
@@ -20,12 +19,17 @@ class TokenService:
     @staticmethod
     def blacklist_token(jti, expires_in_seconds):
         """Ajoute un token à la blacklist"""
-        cache.set(f"blacklist:{jti}", "true", timeout=expires_in_seconds)
+        RevocationService.revoke(jti, expires_in_seconds)
     
     @staticmethod
     def is_token_blacklisted(jti):
-        """Vérifie si un token est blacklisté"""
-        return cache.get(f"blacklist:{jti}") is not None
+        """Vérifie si un token est blacklisté (sans accès réseau pour un token valide)"""
+        return RevocationService.is_revoked(jti)
+    
+    @staticmethod
+    def is_token_revoked(jwt_payload):
+        """Vérifie un token décodé: blacklist, session révoquée ou génération dépassée"""
+        return RevocationService.is_token_revoked(jwt_payload)
     
     @staticmethod
     def revoke_refresh_token(jti):
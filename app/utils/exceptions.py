@@ -30,3 +30,8 @@ class RateNotFoundError(CurrencyError):
 class ProviderError(CurrencyError):
     """Erreur du provider de taux"""
     pass
+
+
+class ServiceBusyError(AppException):
+    """Service temporairement saturé (réessayer plus tard)"""
+    pass
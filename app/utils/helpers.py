@@ -1,9 +1,10 @@
 # app/utils/helpers.py
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timezone
 import re
 from babel.numbers import format_currency as babel_format_currency
 from babel.dates import format_datetime as babel_format_datetime
+from app.utils.exceptions import ValidationError
 
 
 def format_currency(amount, currency_code, locale='en_US'):
@@ -22,6 +23,24 @@ def format_datetime(dt, locale='en_US', format='medium'):
         return dt.strftime('%Y-%m-%d %H:%M:%S')
 
 
+def to_utc_naive(dt):
+    """Convertit une date (avec ou sans fuseau) en date UTC naïve, format stocké en base"""
+    if dt is None or dt.tzinfo is None:
+        return dt
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def parse_datetime(value):
+    """Parse une date ISO 8601 et la convertit en UTC naïf"""
+    if not value:
+        return None
+    
+    try:
+        return to_utc_naive(datetime.fromisoformat(value.replace('Z', '+00:00')))
+    except ValueError:
+        raise ValidationError("Date invalide, format ISO 8601 attendu")
+
+
 def round_currency(amount, decimal_places=2):
     """Arrondit un montant selon les décimales de la devise"""
     if isinstance(amount, str):
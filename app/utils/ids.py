@@ -0,0 +1,27 @@
+# app/utils/ids.py
+import os
+import time
+import uuid
+
+
+def uuid7():
+    """Génère un UUID version 7 (RFC 9562): horodatage en millisecondes puis 74 bits aléatoires
+    
+    Les identifiants croissent avec le temps: les insertions s'ajoutent en fin
+    d'index au lieu d'être dispersées dans le B-tree de la clé primaire.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms & 0xFFFFFFFFFFFF) << 80 | int.from_bytes(os.urandom(10), 'big')
+    
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # Version
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # Variante RFC
+    return uuid.UUID(int=value)
+
+
+def new_id():
+    """Nouvel identifiant de ligne selon ID_GENERATOR (uuid7 par défaut, ou uuid4)"""
+    from app.config.base import BaseConfig
+    
+    if BaseConfig.ID_GENERATOR == 'uuid4':
+        return str(uuid.uuid4())
+    return str(uuid7())
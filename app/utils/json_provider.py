@@ -0,0 +1,103 @@
+# app/utils/json_provider.py
+from datetime import date, datetime
+from decimal import Decimal
+import uuid
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Repli sur le module json de la bibliothèque standard
+    orjson = None
+
+
+DECIMAL_MODES = ('float', 'string', 'number')
+
+
+def decimal_encoder(mode):
+    """Conversion JSON des Decimal selon JSON_DECIMAL_MODE
+    
+    'float' (nombre arrondi au double, format historique de l'API), 'string'
+    (valeur exacte en chaîne) ou 'number' (valeur exacte en nombre JSON).
+    """
+    if mode not in DECIMAL_MODES:
+        raise ValueError(f"JSON_DECIMAL_MODE invalide: {mode} (attendu: {', '.join(DECIMAL_MODES)})")
+    
+    if mode == 'float':
+        return float
+    if mode == 'string':
+        return str
+    if orjson is None or not hasattr(orjson, 'Fragment'):
+        raise RuntimeError("JSON_DECIMAL_MODE=number nécessite orjson >= 3.10")
+    return lambda value: orjson.Fragment(str(value))
+
+
+class StdJSONProvider(DefaultJSONProvider):
+    """Provider json standard aux mêmes conventions que OrjsonProvider
+    
+    Dates en ISO 8601 (au lieu du format HTTP de Flask), Decimal selon
+    JSON_DECIMAL_MODE ('number' n'est pas disponible sans orjson).
+    """
+    
+    sort_keys = False  # L'ordre des champs des modèles est conservé
+    
+    def __init__(self, app):
+        super().__init__(app)
+        encode_decimal = decimal_encoder(app.config['JSON_DECIMAL_MODE'])
+        
+        def default(value):
+            if isinstance(value, (datetime, date)):
+                return value.isoformat()
+            if isinstance(value, Decimal):
+                return encode_decimal(value)
+            if isinstance(value, uuid.UUID):
+                return str(value)
+            return DefaultJSONProvider.default(value)
+        
+        self.default = default
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Provider JSON de l'application basé sur orjson
+    
+    datetime, date et UUID sont sérialisés nativement par orjson, les Decimal
+    selon JSON_DECIMAL_MODE: les modèles renvoient leurs valeurs brutes et la
+    réponse est écrite en une passe, directement en octets.
+    """
+    
+    sort_keys = False
+    
+    def __init__(self, app):
+        super().__init__(app)
+        self.encode_decimal = decimal_encoder(app.config['JSON_DECIMAL_MODE'])
+        self.options = orjson.OPT_NON_STR_KEYS
+    
+    def _default(self, value):
+        if isinstance(value, Decimal):
+            return self.encode_decimal(value)
+        return DefaultJSONProvider.default(value)  # dataclasses, __html__
+    
+    def _dumps(self, obj, indent=False):
+        options = self.options
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self._default, option=options)
+    
+    def dumps(self, obj, **kwargs):
+        return self._dumps(obj, indent=bool(kwargs.get('indent'))).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._dumps(obj, indent=indent) + b'\n', mimetype=self.mimetype)
+
+
+def get_json_provider(app):
+    """Provider JSON selon JSON_PROVIDER ('orjson' si installé, sinon 'json')"""
+    if app.config['JSON_PROVIDER'] == 'orjson' and orjson is not None:
+        return OrjsonProvider(app)
+    return StdJSONProvider(app)
@@ -0,0 +1,61 @@
+# app/utils/pagination.py
+import base64
+import json
+import uuid
+from datetime import datetime
+from app.extensions import db
+from app.utils.exceptions import ValidationError
+
+
+def encode_cursor(created_at, row_id):
+    """Encode la position (created_at, id) d'une ligne en curseur opaque"""
+    payload = json.dumps([created_at.isoformat(), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Décode un curseur opaque en position (created_at, id)"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        # Un id mal formé est refusé ici plutôt qu'à la conversion en binaire (IdType)
+        return datetime.fromisoformat(created_at), str(uuid.UUID(str(row_id)))
+    except (ValueError, TypeError):
+        raise ValidationError("Curseur de pagination invalide")
+
+
+class KeysetPage:
+    """Page de résultats paginée par curseur"""
+    
+    def __init__(self, items, next_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+    
+    @property
+    def has_more(self):
+        """Indique s'il reste des résultats après cette page"""
+        return self.next_cursor is not None
+
+
+def keyset_paginate(query, model, limit, cursor=None):
+    """Pagine une requête par ordre (created_at, id) décroissant
+    
+    La position de la page précédente est reprise par une borne sur l'index
+    au lieu d'un OFFSET: une page profonde coûte autant que la première.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # created_at <= x borne la lecture de l'index; le second terme départage les égalités
+        query = query.filter(
+            model.created_at <= created_at,
+            db.or_(model.created_at < created_at, model.id < row_id)
+        )
+    
+    rows = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+    
+    return KeysetPage(rows, next_cursor)
@@ -0,0 +1,44 @@
+# app/utils/redis_client.py
+import asyncio
+import weakref
+from flask import current_app
+import redis
+import redis.asyncio
+
+
+def get_redis():
+    """Client Redis de l'application (pool de connexions partagé, créé au premier appel)
+    
+    Pour les structures que Flask-Caching n'expose pas (sorted sets, pub/sub...).
+    """
+    client = current_app.extensions.get('redis')
+    if client is None:
+        client = redis.Redis.from_url(
+            current_app.config['REDIS_URL'],
+            socket_timeout=current_app.config.get('REDIS_SOCKET_TIMEOUT'),
+            socket_connect_timeout=current_app.config.get('REDIS_SOCKET_TIMEOUT'),
+            decode_responses=True
+        )
+        current_app.extensions['redis'] = client
+    
+    return client
+
+
+def get_async_redis():
+    """Client Redis asyncio de la boucle d'événements courante (mode ASGI)
+    
+    Les connexions asyncio sont liées à leur boucle: un client par boucle.
+    """
+    clients = current_app.extensions.setdefault('async_redis', weakref.WeakKeyDictionary())
+    loop = asyncio.get_running_loop()
+    
+    client = clients.get(loop)
+    if client is None:
+        client = clients[loop] = redis.asyncio.Redis.from_url(
+            current_app.config['REDIS_URL'],
+            socket_timeout=current_app.config.get('REDIS_SOCKET_TIMEOUT'),
+            socket_connect_timeout=current_app.config.get('REDIS_SOCKET_TIMEOUT'),
+            decode_responses=True
+        )
+    
+    return client
@@ -0,0 +1,5 @@
+# asgi.py - Point d'entrée ASGI (uvicorn asgi:app --workers 4)
+from app.asgi import create_asgi_app
+import os
+
+app = create_asgi_app(os.environ.get('FLASK_ENV', 'production'))
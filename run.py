@@ -2,6 +2,7 @@
 from app import create_app
 from app.extensions import db
 from app.models import *  # Import tous les modèles
+import click
 import os
 
 app = create_app(os.environ.get('FLASK_ENV', 'development'))
@@ -16,8 +17,13 @@ def make_shell_context():
         'RefreshToken': RefreshToken,
         'Currency': Currency,
         'ExchangeRate': ExchangeRate,
+        'LatestExchangeRate': LatestExchangeRate,
+        'RateCandle': RateCandle,
         'Conversion': Conversion,
-        'UserFavoriteCurrency': UserFavoriteCurrency
+        'UserConversionDaily': UserConversionDaily,
+        'PairConversionHourly': PairConversionHourly,
+        'UserFavoriteCurrency': UserFavoriteCurrency,
+        'ApiKey': ApiKey
     }
 
 @app.cli.command()
@@ -33,5 +39,75 @@ def populate_currencies():
     populate_default_currencies()
     print("Devises ajoutées avec succès!")
 
+@app.cli.command()
+def backfill_latest_rates():
+    """Reconstruit la table des derniers taux depuis l'historique"""
+    count = LatestExchangeRate.rebuild_from_history()
+    print(f"{count} derniers taux reconstruits")
+
+@app.cli.command()
+def backfill_rate_candles():
+    """Reconstruit les bougies OHLC depuis l'historique des taux"""
+    count = RateCandle.rebuild_from_history()
+    print(f"{count} bougies reconstruites")
+
+@app.cli.command()
+def compact_rates():
+    """Sous-échantillonne l'historique des taux ancien"""
+    from app.services.rate_compaction_service import RateCompactionService
+    report = RateCompactionService.compact(
+        progress=lambda from_currency, to_currency, deleted: print(f"{from_currency}/{to_currency}: {deleted} taux supprimés")
+    )
+    print(f"{report['deleted']} taux supprimés sur {report['pairs']} paires")
+
+@app.cli.command()
+def backfill_popularity():
+    """Recharge le classement Redis des paires depuis les agrégats horaires"""
+    from app.services.popularity_service import PopularityService
+    count = PopularityService.rebuild_from_rollups()
+    print(f"{count} buckets de popularité chargés")
+
+@app.cli.command()
+def export_analytics():
+    """Exporte en Parquet les conversions et taux depuis le dernier export"""
+    from app.services.export_service import ExportService
+    report = ExportService.export_all(
+        progress=lambda table, rows: print(f"{table}: {rows} lignes exportées")
+    )
+    print(f"Export terminé: {report}")
+
+@app.cli.command()
+def backfill_conversion_rollups():
+    """Reconstruit les agrégats de conversions depuis l'historique"""
+    from app.models.conversion_rollup import rebuild_conversion_rollups
+    count = rebuild_conversion_rollups()
+    print(f"Agrégats reconstruits depuis {count} conversions")
+
+@app.cli.command()
+@click.argument('email')
+@click.argument('name')
+@click.option('--scope', 'scopes', multiple=True, default=['conversions'], help="Scope accordé (répétable)")
+@click.option('--rate-limit', help="Quota de la clé, ex: '10000 per hour'")
+@click.option('--expires-in-days', type=int, help="Durée de validité (défaut: sans expiration)")
+def create_api_key(email, name, scopes, rate_limit, expires_in_days):
+    """Crée une clé API pour un client machine (affichée une seule fois)"""
+    from app.services.api_key_service import ApiKeyService
+    user = User.find_by_email(email)
+    if user is None:
+        raise click.ClickException(f"Utilisateur introuvable: {email}")
+    api_key, raw_key = ApiKeyService.create_key(
+        user.id, name, scopes=scopes, rate_limit=rate_limit, expires_in_days=expires_in_days
+    )
+    print(f"Clé {api_key.id} ({', '.join(api_key.get_scopes())}): {raw_key}")
+
+@app.cli.command()
+@click.argument('key_id')
+def revoke_api_key(key_id):
+    """Révoque une clé API sur tous les workers"""
+    from app.services.api_key_service import ApiKeyService
+    if not ApiKeyService.revoke_key(key_id):
+        raise click.ClickException(f"Clé active introuvable: {key_id}")
+    print(f"Clé {key_id} révoquée")
+
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=True)
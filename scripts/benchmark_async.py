@@ -0,0 +1,182 @@
+import sys
+import os
+
+# Ajouter le répertoire parent au Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import argparse
+import asyncio
+import socket
+import ssl
+import statistics
+import subprocess
+import tempfile
+import time
+import httpx
+import uvicorn
+
+
+ECB_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01" xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+<Cube><Cube time="2024-03-15">
+<Cube currency="USD" rate="1.0900"/><Cube currency="GBP" rate="0.8500"/><Cube currency="JPY" rate="161.50"/>
+<Cube currency="CHF" rate="0.9600"/><Cube currency="CAD" rate="1.4700"/><Cube currency="AUD" rate="1.6600"/>
+</Cube></Cube>
+</gesmes:Envelope>"""
+
+ENDPOINTS = ['/api/currencies/providers/status', '/api/currencies/rates?base=USD']
+
+
+def wsgi_app():
+    """Application WSGI du mode synchrone (Gunicorn), routes des devises enregistrées"""
+    from app import create_app
+    from app.extensions import db
+    from app.middleware.rate_limiter import limiter
+    from app.routes.currencies import currencies_bp
+    
+    app = create_app('development')
+    app.register_blueprint(currencies_bp)
+    limiter.enabled = False
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def asgi_app():
+    """Application ASGI du mode asyncio (uvicorn)"""
+    from app.asgi import AsgiApp
+    from app.routes.async_rates import ASYNC_ROUTES
+    
+    app = wsgi_app()
+    return AsgiApp(app, ASYNC_ROUTES)
+
+
+def fake_ecb_app():
+    """Serveur ECB local répondant après BENCHMARK_LATENCY secondes (provider lent)"""
+    latency = float(os.environ['BENCHMARK_LATENCY'])
+    
+    async def app(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        await asyncio.sleep(latency)
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'application/xml')]})
+        await send({'type': 'http.response.body', 'body': ECB_XML})
+    
+    return app
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Serveur non démarré sur le port {port}")
+
+
+def start_server(mode, port, env):
+    """Lance un worker unique: Gunicorn (sync), uvicorn (asgi) ou le provider simulé (ecb)"""
+    if mode == 'ecb':
+        command = ['uvicorn', '--factory', 'scripts.benchmark_async:fake_ecb_app',
+                   '--port', str(port), '--backlog', '4096', '--log-level', 'error']
+    elif mode == 'sync':
+        command = ['gunicorn', '--workers', '1', '--bind', f'127.0.0.1:{port}', '--backlog', '4096',
+                   '--log-level', 'error', 'scripts.benchmark_async:wsgi_app()']
+    else:
+        command = ['uvicorn', '--factory', 'scripts.benchmark_async:asgi_app', '--workers', '1',
+                   '--port', str(port), '--backlog', '4096', '--log-level', 'error']
+    
+    process = subprocess.Popen(command, cwd=parent_dir, env=env)
+    wait_for_port(port)
+    return process
+
+
+async def load(url, requests, concurrency):
+    """Envoie requests requêtes avec concurrency connexions simultanées"""
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+    context = ssl.create_default_context()  # Chargé une fois pour tous les clients
+    
+    async def worker():
+        nonlocal errors
+        # Un client (une connexion keep-alive) par connexion simulée
+        async with httpx.AsyncClient(timeout=300, verify=context) as client:
+            for _ in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    
+    latencies.sort()
+    return {
+        'rps': requests / elapsed,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'errors': errors
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Connexions concurrentes servies par worker: sync (Gunicorn) vs ASGI (uvicorn)")
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--concurrency', type=int, default=100)
+    parser.add_argument('--latency', type=float, default=0.05, help="Latence du provider simulé (secondes)")
+    parser.add_argument('--modes', default='sync,asgi')
+    args = parser.parse_args()
+    
+    db_fd, db_path = tempfile.mkstemp(suffix='.db')
+    ecb_port = free_port()
+    env = dict(
+        os.environ,
+        PYTHONPATH=parent_dir,
+        DATABASE_URL=f'sqlite:///{db_path}',
+        ECB_API_URL=f'http://127.0.0.1:{ecb_port}',
+        FIXER_API_KEY='',
+        REDIS_URL=os.environ.get('REDIS_URL', 'redis://localhost:6379/15'),
+        BENCHMARK_LATENCY=str(args.latency),
+    )
+    ecb = start_server('ecb', ecb_port, env)
+    
+    print(f"{args.requests} requêtes, {args.concurrency} connexions, provider à {args.latency * 1000:.0f} ms, 1 worker", flush=True)
+    
+    try:
+        for mode in args.modes.split(','):
+            port = free_port()
+            process = start_server(mode, port, env)
+            try:
+                for endpoint in ENDPOINTS:
+                    result = asyncio.run(load(f"http://127.0.0.1:{port}{endpoint}", args.requests, args.concurrency))
+                    print(f"{mode:5} {endpoint:40} {result['rps']:8.1f} req/s  "
+                          f"p50 {result['p50']:8.1f} ms  p95 {result['p95']:8.1f} ms  erreurs {result['errors']}", flush=True)
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        ecb.terminate()
+        ecb.wait()
+        os.close(db_fd)
+        os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
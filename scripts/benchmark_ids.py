@@ -0,0 +1,113 @@
+import sys
+import os
+
+# Ajouter le répertoire parent au Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import argparse
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, MetaData, Numeric, String, Table, create_engine, text
+from app.models.base import IdType
+from app.utils.ids import uuid7
+
+
+STRATEGIES = [
+    ('uuid4 / VARCHAR(36)', lambda: str(uuid.uuid4()), 'string'),
+    ('uuid7 / VARCHAR(36)', lambda: str(uuid7()), 'string'),
+    ('uuid7 / binaire', lambda: str(uuid7()), 'binary'),
+]
+
+
+def build_table(metadata, storage):
+    """Table calquée sur conversions: clé primaire, utilisateur et index d'historique"""
+    return Table(
+        'conversions_bench', metadata,
+        Column('id', IdType(storage), primary_key=True),
+        Column('user_id', IdType(storage), nullable=False),
+        Column('from_currency', String(3), nullable=False),
+        Column('to_currency', String(3), nullable=False),
+        Column('original_amount', Numeric(20, 8), nullable=False),
+        Column('created_at', DateTime, nullable=False),
+        Index('idx_bench_user_conversions', 'user_id', 'created_at'),
+    )
+
+
+def storage_size(engine):
+    """Taille occupée par la table et ses index, en octets"""
+    with engine.connect() as connection:
+        if engine.dialect.name == 'postgresql':
+            return connection.execute(text("SELECT pg_total_relation_size('conversions_bench')")).scalar()
+        
+        page_size = connection.exec_driver_sql('PRAGMA page_size').scalar()
+        page_count = connection.exec_driver_sql('PRAGMA page_count').scalar()
+        return page_size * page_count
+
+
+def run_strategy(url, generate_id, storage, rows, batch_size, users):
+    """Insère rows lignes par lots et mesure débit et taille"""
+    engine = create_engine(url)
+    metadata = MetaData()
+    table = build_table(metadata, storage)
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+    
+    user_ids = [generate_id() for _ in range(users)]
+    
+    start = time.perf_counter()
+    for offset in range(0, rows, batch_size):
+        batch = [
+            {
+                'id': generate_id(),
+                'user_id': random.choice(user_ids),
+                'from_currency': 'USD',
+                'to_currency': 'EUR',
+                'original_amount': 100,
+                'created_at': datetime.utcnow()
+            }
+            for _ in range(min(batch_size, rows - offset))
+        ]
+        with engine.begin() as connection:
+            connection.execute(table.insert(), batch)
+    elapsed = time.perf_counter() - start
+    
+    size = storage_size(engine)
+    metadata.drop_all(engine)
+    engine.dispose()
+    
+    return rows / elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare les stratégies d'identifiants (débit d'insertion, taille)")
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--url', help="Base de test (défaut: fichier SQLite temporaire)")
+    args = parser.parse_args()
+    
+    print(f"Insertion de {args.rows} lignes par lots de {args.batch_size}")
+    print("-" * 60)
+    
+    for label, generate_id, storage in STRATEGIES:
+        if args.url:
+            url = args.url
+        else:
+            db_fd, db_path = tempfile.mkstemp(suffix='.db')
+            os.close(db_fd)
+            url = f'sqlite:///{db_path}'
+        
+        throughput, size = run_strategy(url, generate_id, storage, args.rows, args.batch_size, args.users)
+        print(f"{label:<22} {throughput:>10.0f} lignes/s {size / 1024 / 1024:>8.1f} Mo")
+        
+        if not args.url:
+            os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+import sys
+import os
+
+# Ajouter le répertoire parent au Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import argparse
+from datetime import datetime, timedelta
+from decimal import Decimal
+import statistics
+import time
+from flask import jsonify
+from flask.json.provider import DefaultJSONProvider
+from app import create_app
+from app.models.conversion import Conversion
+from app.models.rate_candle import RateCandle
+from app.utils.json_provider import OrjsonProvider, StdJSONProvider, orjson
+
+
+def legacy_conversion_dict(conversion):
+    """Ancien Conversion.to_dict (conversions par champ), pour comparaison"""
+    return {
+        'id': conversion.id,
+        'from_currency': conversion.from_currency,
+        'to_currency': conversion.to_currency,
+        'original_amount': float(conversion.original_amount),
+        'converted_amount': float(conversion.converted_amount),
+        'net_amount': float(conversion.net_amount),
+        'exchange_rate': float(conversion.exchange_rate),
+        'fee_amount': float(conversion.fee_amount),
+        'fee_rate': float(conversion.fee_rate),
+        'provider': conversion.provider,
+        'timestamp': conversion.created_at.isoformat()
+    }
+
+
+def legacy_candle_dict(candle):
+    """Ancien RateCandle.to_dict, pour comparaison"""
+    return {
+        'timestamp': candle.bucket_start.isoformat(),
+        'open': float(candle.open),
+        'high': float(candle.high),
+        'low': float(candle.low),
+        'close': float(candle.close),
+        'samples': candle.sample_count
+    }
+
+
+def build_rows(count):
+    """Lignes en mémoire (sans base): seule la sérialisation est mesurée"""
+    start = datetime(2024, 3, 1)
+    conversions = []
+    candles = []
+    
+    for i in range(count):
+        conversion = Conversion(
+            'USD', 'EUR', Decimal('100') + i, Decimal('91.23456789'), Decimal('0.91234568'),
+            id=f'01890a5d-ac96-774b-bcce-{i:012d}', fee_amount=Decimal('0.91234568'),
+            fee_rate=Decimal('0.0100'), provider='ecb', created_at=start + timedelta(minutes=i)
+        )
+        conversions.append(conversion)
+        candles.append(RateCandle(
+            from_currency='USD', to_currency='EUR', interval='1m', bucket_start=start + timedelta(minutes=i),
+            open=Decimal('0.91234568'), high=Decimal('0.91334568'), low=Decimal('0.91134568'),
+            close=Decimal('0.91284568'), sample_count=12
+        ))
+    
+    return {'conversions': conversions, 'candles': candles}
+
+
+def measure(app, render, repeat):
+    """Temps de rendu d'une réponse (médiane et p95, en ms)"""
+    timings = []
+    with app.test_request_context():
+        for _ in range(repeat):
+            start = time.perf_counter()
+            render().get_data()
+            timings.append(time.perf_counter() - start)
+    
+    timings.sort()
+    return statistics.median(timings) * 1000, timings[int(len(timings) * 0.95) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temps de sérialisation JSON des endpoints de liste")
+    parser.add_argument('--rows', type=int, default=100, help="Lignes par réponse (pages de 100 au plus)")
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+    
+    app = create_app()
+    app.debug = False  # Réponses compactes, comme en production
+    rows = build_rows(args.rows)
+    
+    variants = [
+        ('json, to_dict converti (ancien)', DefaultJSONProvider, True),
+        ('json, valeurs brutes', StdJSONProvider, False),
+    ]
+    if orjson is not None:
+        variants.append(('orjson, valeurs brutes', OrjsonProvider, False))
+    
+    print(f"{args.rows} lignes par réponse, {args.repeat} rendus")
+    print("-" * 78)
+    
+    for endpoint, key, legacy_dict in (
+        ('/conversions/history', 'conversions', legacy_conversion_dict),
+        ('/currencies/rates/history', 'candles', legacy_candle_dict),
+    ):
+        for label, provider_class, legacy in variants:
+            app.json = provider_class(app)
+            serialize = legacy_dict if legacy else (lambda row: row.to_dict())
+            p50, p95 = measure(app, lambda: jsonify({key: [serialize(row) for row in rows[key]]}), args.repeat)
+            print(f"{endpoint:<27} {label:<33} p50 {p50:>6.3f} ms  p95 {p95:>6.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
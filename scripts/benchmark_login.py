@@ -0,0 +1,147 @@
+import sys
+import os
+
+# Ajouter le répertoire parent au Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import argparse
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import event
+from app import create_app
+from app.config.base import BaseConfig, _bind_options
+from app.extensions import db, cache
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.session_service import SessionService
+from app.services.token_service import TokenService
+from app.utils.exceptions import AuthenticationError
+
+
+PASSWORD = 'password123'
+
+
+def legacy_login(email, password):
+    """Ancien enchaînement de connexion (trois commits, comptage séparé), pour comparaison"""
+    user = User.find_by_email(email)
+    if not user or not user.check_password(password):
+        raise AuthenticationError("Email ou mot de passe incorrect")
+    
+    if not user.can_create_session():
+        raise AuthenticationError("Nombre maximum de sessions atteint")
+    
+    session = SessionService.create_session(user_id=user.id)
+    access_token, refresh_token = user.generate_tokens(session.id)
+    RefreshToken(
+        user_id=user.id,
+        session_id=session.id,
+        jti=TokenService.get_jti_from_token(refresh_token)
+    ).save()
+    user.update_last_login()
+
+
+def current_login(email, password):
+    """Connexion en une transaction (AuthService.authenticate_user)"""
+    AuthService.authenticate_user(email, password)
+
+
+def run(app, login, users, logins, workers):
+    """Exécute logins connexions réparties sur workers threads"""
+    latencies = []
+    counts = {'statements': 0, 'commits': 0}
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counts['statements'] += 1
+    
+    def commit(conn):
+        counts['commits'] += 1
+    
+    def worker(index):
+        with app.app_context():
+            start = time.perf_counter()
+            login(users[index % len(users)], PASSWORD)
+            latencies.append(time.perf_counter() - start)
+            db.session.remove()
+    
+    with app.app_context():
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(db.engine, 'commit', commit)
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(worker, range(logins)))
+    elapsed = time.perf_counter() - start
+    
+    with app.app_context():
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        event.remove(db.engine, 'commit', commit)
+    
+    latencies.sort()
+    return {
+        'throughput': logins / elapsed,
+        'p50': statistics.median(latencies) * 1000,
+        'p95': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'statements': counts['statements'] / logins,
+        'commits': counts['commits'] / logins
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Débit de connexion sous charge concurrente")
+    parser.add_argument('--logins', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--url', help="Base de test (défaut: fichier SQLite temporaire)")
+    parser.add_argument('--real-hash', action='store_true',
+                        help="Hash de mot de passe par défaut (sinon hash rapide pour isoler le coût base)")
+    args = parser.parse_args()
+    
+    if args.url:
+        url = args.url
+    else:
+        db_fd, db_path = tempfile.mkstemp(suffix='.db')
+        os.close(db_fd)
+        url = f'sqlite:///{db_path}'
+    
+    # Les engines sont créés à l'initialisation de l'app: la base se configure avant create_app
+    BaseConfig.SQLALCHEMY_DATABASE_URI = url
+    BaseConfig.SQLALCHEMY_ENGINE_OPTIONS = _bind_options(url, 'DB_')
+    BaseConfig.MAX_SESSIONS_PER_USER = args.logins  # La limite n'est pas l'objet de la mesure
+    app = create_app()
+    app.config.update(CACHE_TYPE='SimpleCache', JWT_SECRET_KEY='benchmark-secret-key-of-32-bytes!')
+    if not args.real_hash:
+        # Hash quasi gratuit, déjà au coût configuré: pas de recalcul à la connexion
+        app.config.update(PASSWORD_HASH_ALGORITHM='pbkdf2', PBKDF2_ITERATIONS=1)
+    cache.init_app(app)
+    
+    with app.app_context():
+        db.create_all()
+        users = []
+        for i in range(args.users):
+            user = User(f'bench{i}@example.com', PASSWORD, 'Bench', 'User')
+            db.session.add(user)
+            users.append(user.email)
+        db.session.commit()
+    
+    print(f"{args.logins} connexions, {args.workers} threads, {args.users} utilisateurs ({url.split(':')[0]})")
+    print("-" * 78)
+    
+    for label, login in (('3 commits (ancien)', legacy_login), ('unit of work', current_login)):
+        result = run(app, login, users, args.logins, args.workers)
+        print(f"{label:<20} {result['throughput']:>8.0f} connexions/s  "
+              f"p50 {result['p50']:>6.1f} ms  p95 {result['p95']:>6.1f} ms  "
+              f"{result['statements']:.1f} requêtes, {result['commits']:.1f} commits")
+    
+    with app.app_context():
+        db.drop_all()
+    if not args.url:
+        os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    main()
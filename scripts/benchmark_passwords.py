@@ -0,0 +1,69 @@
+import sys
+import os
+
+# Ajouter le répertoire parent au Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask
+from app.config.base import BaseConfig
+from app.services.password_service import PasswordService
+
+
+PASSWORD = 'password123'
+
+SETTINGS = [
+    ('bcrypt 10', {'PASSWORD_HASH_ALGORITHM': 'bcrypt', 'BCRYPT_LOG_ROUNDS': 10}),
+    ('bcrypt 11', {'PASSWORD_HASH_ALGORITHM': 'bcrypt', 'BCRYPT_LOG_ROUNDS': 11}),
+    ('bcrypt 12', {'PASSWORD_HASH_ALGORITHM': 'bcrypt', 'BCRYPT_LOG_ROUNDS': 12}),
+    ('bcrypt 13', {'PASSWORD_HASH_ALGORITHM': 'bcrypt', 'BCRYPT_LOG_ROUNDS': 13}),
+    ('pbkdf2 600k', {'PASSWORD_HASH_ALGORITHM': 'pbkdf2', 'PBKDF2_ITERATIONS': 600000}),
+    ('scrypt', {'PASSWORD_HASH_ALGORITHM': 'scrypt'}),
+]
+
+
+def measure(app, password_hash, count, threads):
+    """Vérifications par seconde, appels concurrents passant par le pool du service"""
+    def verify(_):
+        with app.app_context():
+            assert PasswordService.verify(PASSWORD, password_hash)
+    
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(verify, range(count)))
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Coût de vérification des mots de passe par algorithme")
+    parser.add_argument('--count', type=int, default=20, help="Vérifications par mesure et par thread")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Taille du pool de hachage (PASSWORD_HASH_WORKERS)")
+    args = parser.parse_args()
+    
+    # Application minimale: seule la configuration du service est utilisée
+    app = Flask(__name__)
+    app.config.from_object(BaseConfig)
+    app.config.update(PASSWORD_HASH_WORKERS=args.workers, PASSWORD_HASH_QUEUE_LIMIT=args.workers * 4,
+                      PASSWORD_HASH_TIMEOUT=60)
+    
+    print(f"{args.workers} workers de hachage, {os.cpu_count()} CPU")
+    print("-" * 64)
+    print(f"{'algorithme':<14} {'1 thread':>14} {'par worker':>14} {'pool saturé':>14}")
+    
+    for label, settings in SETTINGS:
+        app.config.update(settings)
+        with app.app_context():
+            password_hash = PasswordService.hash(PASSWORD)
+        
+        single = measure(app, password_hash, args.count, 1)
+        saturated = measure(app, password_hash, args.count * args.workers, args.workers * 2)
+        print(f"{label:<14} {single:>12.1f}/s {saturated / args.workers:>12.1f}/s {saturated:>12.1f}/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,10 @@
 from app import create_app
-from app.extensions import db
-from app.models.session import Session
-from app.models.refresh_token import RefreshToken
-from app.models.exchange_rate import ExchangeRate
-from datetime import datetime, timedelta
+from app.services.retention_service import RetentionService
+
+
+def print_progress(table, rows, batches):
+    """Affiche la progression d'une table après chaque lot"""
+    print(f"  {table}: {rows} lignes traitées ({batches} lots)")
 
 
 def cleanup_old_data():
@@ -15,20 +16,15 @@ def cleanup_old_data():
         print("Nettoyage des données anciennes...")
         print("-" * 40)
         
-        # Nettoyer les sessions expirées
-        expired_sessions = Session.cleanup_expired_sessions()
-        print(f"Sessions expirées supprimées: {expired_sessions}")
-        
-        # Nettoyer les refresh tokens expirés
-        expired_tokens = RefreshToken.cleanup_expired_tokens()
-        print(f"Refresh tokens expirés supprimés: {expired_tokens}")
+        # Sessions expirées, refresh tokens expirés, anciens taux (> 1 an)
+        # et anciennes conversions si une rétention est configurée
+        report = RetentionService.run(progress=print_progress)
         
-        # Nettoyer les anciens taux de change (> 1 an)
-        old_rates = ExchangeRate.cleanup_old_rates(days=365)
-        print(f"Anciens taux de change supprimés: {old_rates}")
+        for table, progress in report.items():
+            print(f"{table}: {progress['rows']} lignes supprimées ou désactivées")
         
         print("\nNettoyage terminé!")
 
 
 if __name__ == '__main__':
-    cleanup_old_data()
\ No newline at end of file
+    cleanup_old_data()
@@ -0,0 +1,74 @@
+import sys
+import os
+
+# Ajouter le répertoire parent au Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from sqlalchemy import inspect
+from app import create_app
+from app.extensions import db
+from app.models import *  # Enregistre tous les modèles dans les métadonnées
+
+
+# Index remplacés par les index composites/couvrants des modèles
+OBSOLETE_INDEXES = {
+    'conversions': [
+        'idx_currency_pair_conversions',
+        'ix_conversions_from_currency',
+        'ix_conversions_to_currency',
+        # Statistiques servies par les tables d'agrégats
+        'idx_user_conversion_stats',
+        'idx_conversion_date_pair',
+        # Remplacé par idx_user_conversions_keyset (user_id, created_at, id)
+        'idx_user_conversions',
+    ],
+}
+
+
+def sync_indexes():
+    """Crée les index manquants et supprime les index obsolètes sur une base existante"""
+    
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+    
+    with app.app_context():
+        engine = db.engine
+        is_postgres = engine.dialect.name == 'postgresql'
+        inspector = inspect(engine)
+        
+        print("Synchronisation des index...")
+        print("-" * 40)
+        
+        # CREATE/DROP INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+        with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+            for table in db.metadata.sorted_tables:
+                if not inspector.has_table(table.name):
+                    print(f"⚠️  Table absente, ignorée: {table.name}")
+                    continue
+                
+                existing = {index['name'] for index in inspector.get_indexes(table.name)}
+                
+                for index in table.indexes:
+                    if index.name in existing:
+                        continue
+                    
+                    if is_postgres:
+                        index.dialect_options['postgresql']['concurrently'] = True
+                    
+                    index.create(bind=connection)
+                    print(f"✅ Créé: {table.name}.{index.name}")
+                
+                for index_name in OBSOLETE_INDEXES.get(table.name, []):
+                    if index_name not in existing:
+                        continue
+                    
+                    concurrently = 'CONCURRENTLY ' if is_postgres else ''
+                    connection.exec_driver_sql(f'DROP INDEX {concurrently}{index_name}')
+                    print(f"🗑️  Supprimé: {table.name}.{index_name}")
+        
+        print("\nSynchronisation terminée!")
+
+
+if __name__ == '__main__':
+    sync_indexes()
@@ -0,0 +1,95 @@
+import sys
+import os
+
+# Ajouter le répertoire parent au Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+import uuid
+from sqlalchemy import inspect
+from app import create_app
+from app.extensions import db
+from app.models import *  # Enregistre tous les modèles dans les métadonnées
+from app.models.base import IdType
+
+
+def id_columns():
+    """Colonnes identifiants (clés primaires et étrangères) par table"""
+    return {
+        table.name: [column.name for column in table.columns if isinstance(column.type, IdType)]
+        for table in db.metadata.sorted_tables
+    }
+
+
+def uuid_to_blob(value):
+    """Convertit un UUID texte en 16 octets (valeurs déjà binaires inchangées)"""
+    if value is None or isinstance(value, bytes):
+        return value
+    return uuid.UUID(value).bytes
+
+
+def migrate_postgresql(connection, columns):
+    """Convertit les colonnes VARCHAR(36) en uuid natif (clés étrangères recréées)"""
+    inspector = inspect(connection)
+    foreign_keys = []
+    
+    for table_name in columns:
+        for foreign_key in inspector.get_foreign_keys(table_name):
+            foreign_keys.append((table_name, foreign_key))
+            connection.exec_driver_sql(
+                f'ALTER TABLE {table_name} DROP CONSTRAINT {foreign_key["name"]}'
+            )
+    
+    for table_name, names in columns.items():
+        for name in names:
+            connection.exec_driver_sql(
+                f'ALTER TABLE {table_name} ALTER COLUMN {name} TYPE uuid USING {name}::uuid'
+            )
+            print(f"✅ {table_name}.{name} -> uuid")
+    
+    for table_name, foreign_key in foreign_keys:
+        connection.exec_driver_sql(
+            f'ALTER TABLE {table_name} ADD CONSTRAINT {foreign_key["name"]} '
+            f'FOREIGN KEY ({", ".join(foreign_key["constrained_columns"])}) '
+            f'REFERENCES {foreign_key["referred_table"]} ({", ".join(foreign_key["referred_columns"])})'
+        )
+
+
+def migrate_sqlite(connection, columns):
+    """Réécrit les identifiants texte en 16 octets (typage dynamique de SQLite)"""
+    connection.connection.driver_connection.create_function('uuid_to_blob', 1, uuid_to_blob)
+    
+    for table_name, names in columns.items():
+        for name in names:
+            result = connection.exec_driver_sql(
+                f"UPDATE {table_name} SET {name} = uuid_to_blob({name}) WHERE typeof({name}) = 'text'"
+            )
+            print(f"✅ {table_name}.{name}: {result.rowcount} valeurs converties")
+
+
+def migrate_ids():
+    """Migre les identifiants existants vers le stockage binaire (ID_STORAGE=binary)"""
+    
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+    
+    with app.app_context():
+        columns = {table: names for table, names in id_columns().items() if names}
+        
+        print("Migration des identifiants vers le stockage binaire...")
+        print("-" * 40)
+        
+        with db.engine.begin() as connection:
+            if connection.dialect.name == 'postgresql':
+                migrate_postgresql(connection, columns)
+            elif connection.dialect.name == 'sqlite':
+                migrate_sqlite(connection, columns)
+            else:
+                print(f"❌ Dialecte non supporté: {connection.dialect.name}")
+                return
+        
+        print("\nMigration terminée! Définir ID_STORAGE=binary avant de redémarrer l'application.")
+
+
+if __name__ == '__main__':
+    migrate_ids()
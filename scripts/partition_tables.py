@@ -0,0 +1,42 @@
+import sys
+import os
+
+# Ajouter le répertoire parent au Python path
+current_dir = os.path.dirname(os.path.abspath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.insert(0, parent_dir)
+
+from app import create_app
+from app.extensions import db
+from app.models import *  # Enregistre tous les modèles dans les métadonnées
+from app.services.partition_service import PartitionService
+
+
+def partition_tables():
+    """Convertit conversions et exchange_rates en tables partitionnées par mois (PostgreSQL)"""
+    
+    app = create_app(os.environ.get('FLASK_ENV', 'development'))
+    
+    with app.app_context():
+        if not PartitionService.is_supported():
+            print("❌ Le partitionnement nécessite PostgreSQL")
+            return
+        
+        print("Partitionnement des tables...")
+        print("-" * 40)
+        
+        for table_name in PartitionService.PARTITIONED_TABLES:
+            if PartitionService.partition_table(table_name):
+                partitions = PartitionService.list_partitions(table_name)
+                print(f"✅ Partitionnée: {table_name} ({len(partitions)} partitions)")
+            else:
+                print(f"⚠️  Déjà partitionnée: {table_name}")
+        
+        created = PartitionService.maintain_partitions()
+        print(f"Partitions à venir créées: {len(created)}")
+        
+        print("\nPartitionnement terminé!")
+
+
+if __name__ == '__main__':
+    partition_tables()
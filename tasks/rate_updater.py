@@ -1,7 +1,12 @@
 from tasks.celery_app import celery
 from app.services.rate_fetcher_service import RateFetcherService
+from app.services.currency_graph_service import CurrencyGraphService
+from app.services.partition_service import PartitionService
+from app.services.retention_service import RetentionService
+from app.services.rate_compaction_service import RateCompactionService
 from app.models.exchange_rate import ExchangeRate
-from app.config.currencies import POPULAR_PAIRS
+from app.services.popularity_service import PopularityService
+from app.services.cache_service import CacheService
 from app.extensions import db
 
 
@@ -14,7 +19,8 @@ def update_exchange_rates():
     updated_count = 0
     error_count = 0
     
-    for from_currency, to_currency in POPULAR_PAIRS:
+    # Paires les plus converties d'abord (classement Redis, complété par POPULAR_PAIRS)
+    for from_currency, to_currency in PopularityService.prioritized_pairs():
         try:
             rate = rate_fetcher.fetch_rate(from_currency, to_currency)
             provider = rate_fetcher.last_successful_provider
@@ -22,37 +28,72 @@ def update_exchange_rates():
             ExchangeRate.update_or_create(from_currency, to_currency, rate, provider)
             updated_count += 1
             
+            # Préchauffage du cache: les conversions des paires populaires ne lisent pas la base
+            CacheService.set_rate(f"rate:{from_currency}:{to_currency}", {'rate': rate, 'provider': provider})
+            
         except Exception as e:
             print(f"Erreur pour {from_currency}/{to_currency}: {e}")
             error_count += 1
     
+    # Recalcul des chemins du graphe des devises sur le nouveau snapshot
+    CurrencyGraphService.refresh()
+    
     print(f"Mise à jour terminée. {updated_count} taux mis à jour, {error_count} erreurs")
     return {'updated': updated_count, 'errors': error_count}
 
 
 @celery.task
-def cleanup_old_data():
-    """Nettoie les données anciennes"""
+def cleanup_old_data(max_batches=None):
+    """Nettoie les données anciennes par lots (reprend au prochain passage si interrompu)"""
     print("Nettoyage des données anciennes...")
     
-    from app.models.session import Session
-    from app.models.refresh_token import RefreshToken
+    report = RetentionService.run(max_batches=max_batches)
+    
+    for table, progress in report.items():
+        status = "terminé" if progress['complete'] else "partiel"
+        print(f"{table}: {progress['rows']} lignes en {progress['batches']} lots ({status})")
+    
+    return report
+
+
+@celery.task
+def maintain_partitions():
+    """Crée à l'avance les partitions mensuelles des tables partitionnées"""
+    created = PartitionService.maintain_partitions()
+    
+    print(f"Partitions créées: {', '.join(created) or 'aucune'}")
+    return {'created': created}
+
+
+@celery.task
+def compact_rate_history():
+    """Sous-échantillonne l'historique des taux ancien (horaire puis journalier)"""
+    report = RateCompactionService.compact()
+    
+    print(f"Compaction terminée: {report['deleted']} taux supprimés sur {report['pairs']} paires")
+    return report
+
+
+@celery.task
+def flush_session_activity():
+    """Reporte en base l'activité des sessions conservées dans Redis"""
+    from app.services.session_service import SessionService
     
-    # Nettoyer les sessions expirées
-    expired_sessions = Session.cleanup_expired_sessions()
+    flushed = SessionService.flush_activity()
     
-    # Nettoyer les refresh tokens expirés
-    expired_tokens = RefreshToken.cleanup_expired_tokens()
+    print(f"Activité de {flushed} sessions reportée en base")
+    return {'flushed': flushed}
+
+
+@celery.task
+def export_analytics():
+    """Exporte en Parquet les conversions et taux ajoutés depuis le dernier export"""
+    from app.services.export_service import ExportService
     
-    # Nettoyer les anciens taux (> 1 an)
-    old_rates = ExchangeRate.cleanup_old_rates(days=365)
+    report = ExportService.export_all()
     
-    print(f"Nettoyage terminé: {expired_sessions} sessions, {expired_tokens} tokens, {old_rates} taux")
-    return {
-        'expired_sessions': expired_sessions,
-        'expired_tokens': expired_tokens,
-        'old_rates': old_rates
-    }
+    print(f"Export terminé: {report}")
+    return report
 
 
 # Configuration Celery Beat pour les tâches périodiques
@@ -65,11 +106,35 @@ celery.conf.beat_schedule = {
         'schedule': 300.0,  # 5 minutes
     },
     
-    # Nettoyage quotidien à 2h du matin
+    # Nettoyage quotidien à 2h du matin (dont les bougies 1m/5m, CANDLE_RETENTION_DAYS)
     'cleanup-old-data': {
         'task': 'tasks.rate_updater.cleanup_old_data',
         'schedule': crontab(hour=2, minute=0),
     },
+    
+    # Création des partitions à venir, chaque jour à 1h du matin
+    'maintain-partitions': {
+        'task': 'tasks.rate_updater.maintain_partitions',
+        'schedule': crontab(hour=1, minute=0),
+    },
+    
+    # Compaction de l'historique des taux, chaque jour à 3h du matin
+    'compact-rate-history': {
+        'task': 'tasks.rate_updater.compact_rate_history',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    
+    # Activité des sessions (backend redis), toutes les minutes
+    'flush-session-activity': {
+        'task': 'tasks.rate_updater.flush_session_activity',
+        'schedule': 60.0,
+    },
+    
+    # Export analytique incrémental, toutes les heures
+    'export-analytics': {
+        'task': 'tasks.rate_updater.export_analytics',
+        'schedule': crontab(minute=15),
+    },
 }
 
 celery.conf.timezone = 'UTC'
\ No newline at end of file
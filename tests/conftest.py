@@ -3,7 +3,7 @@ import pytest
 import tempfile
 import os
 from app import create_app
-from app.extensions import db
+from app.extensions import db, cache
 from app.models.user import User
 from app.models.currency import Currency
 
@@ -19,6 +19,8 @@ def app():
         'TESTING': True,
         'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
         'CACHE_TYPE': 'simple',
+        'REDIS_URL': os.environ.get('TEST_REDIS_URL', 'redis://localhost:6379/15'),
+        'BCRYPT_LOG_ROUNDS': 4,
         'JWT_SECRET_KEY': 'test-secret',
         'SECRET_KEY': 'test-secret',
         'WTF_CSRF_ENABLED': False
@@ -26,6 +28,7 @@ def app():
     
     app = create_app('testing')
     app.config.update(config)
+    cache.init_app(app)  # Le cache a été initialisé avec la configuration Redis par défaut
     
     with app.app_context():
         db.create_all()
@@ -58,6 +61,23 @@ def runner(app):
     return app.test_cli_runner()
 
 
+@pytest.fixture
+def redis_client(app):
+    """Client Redis de test (base dédiée vidée après le test), ignoré sans serveur Redis"""
+    import redis
+    from app.utils.redis_client import get_redis
+    
+    client = get_redis()
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("Serveur Redis indisponible (TEST_REDIS_URL)")
+    
+    client.flushdb()
+    yield client
+    client.flushdb()
+
+
 @pytest.fixture
 def test_user(app):
     """Utilisateur de test"""
@@ -0,0 +1,143 @@
+# tests/test_api_keys.py
+from contextlib import contextmanager
+from decimal import Decimal
+from sqlalchemy import event
+from app.extensions import db
+from app.middleware.auth_middleware import auth_required, get_auth_context, scope_required
+from app.middleware.rate_limiter import api_key_limit, get_user_id
+from app.models.api_key import ApiKey
+from app.models.user import User
+from app.services.api_key_service import ApiKeyService
+from app.services.auth_service import AuthService
+from app.services.conversion_service import ConversionService
+
+
+@contextmanager
+def count_queries():
+    """Compte les requêtes SQL émises dans le bloc"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def create_key(**kwargs):
+    """Crée un utilisateur de service et une clé API"""
+    user = User.create_user('service@example.com', 'password123', 'Service', 'Interne')
+    return ApiKeyService.create_key(user.id, 'pricing-service', **kwargs)
+
+
+class TestApiKeys:
+    """Tests des clés API des clients machine"""
+    
+    def test_key_stored_hashed(self, app):
+        """Test: seule l'empreinte de la clé est stockée"""
+        api_key, raw_key = create_key(scopes=['conversions'])
+        
+        assert raw_key.startswith(api_key.prefix)
+        assert raw_key not in (api_key.key_hash, api_key.prefix)
+        assert ApiKeyService.authenticate(raw_key + 'x') is None
+    
+    def test_cached_verification(self, app):
+        """Test: une clé vérifiée n'est plus relue en base"""
+        api_key, raw_key = create_key(scopes=['conversions'], rate_limit='50 per minute')
+        ApiKeyService.authenticate(raw_key)
+        
+        with count_queries() as statements:
+            identity = ApiKeyService.authenticate(raw_key)
+        
+        assert statements == []
+        assert identity.id == api_key.id
+        assert identity.has_scope('conversions')
+        assert identity.rate_limit == '50 per minute'
+    
+    def test_owner_premium_status_cached(self, app):
+        """Test: le statut premium du propriétaire est lu avec la clé, pour le calcul des frais"""
+        api_key, raw_key = create_key(scopes=['conversions'])
+        User.query.get(api_key.user_id).is_premium = True
+        db.session.commit()
+        
+        identity = ApiKeyService.authenticate(raw_key)
+        assert identity.is_premium
+        
+        service = ConversionService()
+        with count_queries() as statements:
+            fees = service._calculate_fees(Decimal('100'), identity.user_id, identity.is_premium)
+        assert statements == []
+        assert fees['fee_rate'] == service._calculate_fees(Decimal('100'))['fee_rate'] / 2
+    
+    def test_unknown_keys_use_separate_cache(self, app):
+        """Test: les clés inconnues n'évincent pas les clés vérifiées"""
+        app.config['API_KEY_NEGATIVE_CACHE_SIZE'] = 2
+        api_key, raw_key = create_key(scopes=['conversions'])
+        ApiKeyService.authenticate(raw_key)
+        
+        for i in range(5):
+            assert ApiKeyService.authenticate(f'cck_unknown{i}') is None
+        
+        assert len(app.extensions['api_keys_unknown'].entries) == 2
+        with count_queries() as statements:
+            assert ApiKeyService.authenticate(raw_key).id == api_key.id
+            assert ApiKeyService.authenticate('cck_unknown4') is None
+        assert statements == []
+    
+    def test_deactivated_account_keys_rejected(self, app):
+        """Test: les clés d'un compte désactivé sont refusées, en base comme en cache"""
+        api_key, raw_key = create_key(scopes=['conversions'])
+        other_key, other_raw_key = ApiKeyService.create_key(api_key.user_id, 'reporting')
+        assert ApiKeyService.authenticate(raw_key) is not None
+        
+        # Compte désactivé directement en base: la clé n'est plus trouvée
+        User.query.get(api_key.user_id).is_active = False
+        db.session.commit()
+        assert ApiKeyService.authenticate(other_raw_key) is None
+        
+        # Désactivation par le service: clés révoquées malgré le cache
+        AuthService.deactivate_user(api_key.user_id)
+        assert ApiKeyService.authenticate(raw_key) is None
+        assert ApiKey.query.filter_by(user_id=api_key.user_id, is_active=True).count() == 0
+    
+    def test_revoked_key_rejected_from_cache(self, app):
+        """Test: une clé révoquée est refusée malgré le cache"""
+        api_key, raw_key = create_key(scopes=['conversions'])
+        assert ApiKeyService.authenticate(raw_key) is not None
+        
+        assert ApiKeyService.revoke_key(api_key.id)
+        
+        assert ApiKeyService.authenticate(raw_key) is None
+        del app.extensions['api_keys']  # Autre worker, cache vide: relecture en base
+        assert ApiKeyService.authenticate(raw_key) is None
+    
+    def test_request_context(self, app):
+        """Test: authentification, quota et scopes d'une requête par clé API"""
+        api_key, raw_key = create_key(scopes=['conversions'])
+        
+        @scope_required('conversions')
+        def convert():
+            return 'ok'
+        
+        @scope_required('admin')
+        def admin():
+            return 'ok'
+        
+        # Un contexte d'application par requête: g (et le contexte d'authentification) est propre à chacune
+        with app.app_context(), app.test_request_context(headers={'X-API-Key': raw_key}):
+            assert get_auth_context().user_id == api_key.user_id
+            assert get_user_id() == f"api_key:{api_key.id}"
+            assert api_key_limit('100 per hour')() == app.config['API_KEY_DEFAULT_RATE_LIMIT']
+            assert convert() == 'ok'
+            assert admin()[1] == 403
+            assert auth_required(lambda: 'ok')()[1] == 401
+        
+        with app.app_context(), app.test_request_context(headers={'X-API-Key': 'cck_invalid'}):
+            assert convert()[1] == 401
+        
+        with app.app_context(), app.test_request_context():
+            assert api_key_limit('100 per hour')() == '100 per hour'
+            assert convert() == 'ok'
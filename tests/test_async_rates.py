@@ -0,0 +1,149 @@
+# tests/test_async_rates.py
+"""Tests du mode ASGI (lectures de taux en asyncio)
+
+Le fichier quotidien de l'ECB est servi par un transport httpx local; Redis
+est optionnel (le cache des taux est ignoré sans serveur).
+"""
+import asyncio
+from datetime import datetime
+from decimal import Decimal
+import pytest
+
+httpx = pytest.importorskip('httpx')
+pytest.importorskip('aiosqlite')
+pytest.importorskip('asgiref')
+
+from app.asgi import AsgiApp, close_async_resources
+from app.extensions import db
+from app.models.exchange_rate import ExchangeRate
+from app.models.latest_exchange_rate import LatestExchangeRate
+from app.providers.ecb_provider import ECBProvider
+from app.routes.async_rates import ASYNC_ROUTES
+from app.services.async_rate_service import AsyncRateService
+from app.services.currency_graph_service import CurrencyGraphService
+
+
+ECB_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<gesmes:Envelope xmlns:gesmes="http://www.gesmes.org/xml/2002-08-01" xmlns="http://www.ecb.int/vocabulary/2002-08-01/eurofxref">
+<Cube><Cube time="2024-03-15">
+<Cube currency="USD" rate="1.0900"/>
+<Cube currency="GBP" rate="0.8500"/>
+<Cube currency="JPY" rate="161.50"/>
+</Cube></Cube>
+</gesmes:Envelope>"""
+
+
+def run(app, coroutine_fn, status_code=200):
+    """Exécute un scénario asyncio avec un provider ECB servi localement"""
+    calls = []
+    
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(status_code, content=ECB_XML)
+    
+    async def scenario():
+        app.extensions['async_rate_providers'] = [ECBProvider(base_url='http://ecb.test')]
+        AsyncRateService._loop_state()['http'] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await coroutine_fn()
+        finally:
+            await close_async_resources()
+    
+    return asyncio.run(scenario()), calls
+
+
+class TestAsyncRateService:
+    """Tests du service de taux asyncio"""
+    
+    def test_latest_rates_from_provider(self, app):
+        """Test des taux croisés déduits de la table EUR"""
+        rates, calls = run(app, lambda: AsyncRateService.get_latest_rates('USD', ['GBP', 'EUR', 'USD']))
+        
+        assert rates['EUR'] == Decimal('1') / Decimal('1.0900')
+        assert rates['GBP'] == Decimal('0.8500') / Decimal('1.0900')
+        assert 'USD' not in rates
+        assert calls == ['/eurofxref-daily.xml']
+    
+    def test_concurrent_requests_share_fetch(self, app):
+        """Test d'une seule requête provider pour des lectures concurrentes"""
+        async def concurrent():
+            return await asyncio.gather(*(
+                AsyncRateService.get_latest_rates('EUR', ['USD']) for _ in range(20)
+            ))
+        
+        results, calls = run(app, concurrent)
+        
+        assert all(result == {'USD': Decimal('1.09')} for result in results)
+        assert len(calls) == 1
+    
+    def test_database_fallback(self, app):
+        """Test du repli sur les derniers taux en base (engine asyncio)"""
+        LatestExchangeRate.upsert('USD', 'CHF', Decimal('0.88'), 'fixer', datetime(2024, 3, 14))
+        LatestExchangeRate.upsert('USD', 'CHF', Decimal('0.89'), 'ecb', datetime(2024, 3, 15))
+        db.session.commit()
+        
+        rates, _ = run(app, lambda: AsyncRateService.get_latest_rates('USD', ['CHF']), status_code=503)
+        
+        assert rates == {'CHF': Decimal('0.89')}
+    
+    def test_graph_fallback(self, app, monkeypatch):
+        """Test du repli sur le graphe des devises (résolu hors de la boucle)"""
+        monkeypatch.setattr(CurrencyGraphService, '_graph', None)
+        CurrencyGraphService.refresh([
+            {'from_currency': 'USD', 'to_currency': 'CHF', 'rate': Decimal('0.9'),
+             'provider': 'ecb', 'timestamp': datetime.utcnow()},
+            {'from_currency': 'CHF', 'to_currency': 'SEK', 'rate': Decimal('12'),
+             'provider': 'ecb', 'timestamp': datetime.utcnow()},
+        ])
+        
+        rates, _ = run(app, lambda: AsyncRateService.get_latest_rates('USD', ['SEK']), status_code=503)
+        
+        assert rates == {'SEK': Decimal('10.8')}
+    
+    def test_providers_status(self, app):
+        """Test du statut des providers"""
+        status, _ = run(app, AsyncRateService.get_providers_status)
+        
+        assert status['European Central Bank']['available'] is True
+        assert status['European Central Bank']['test_rate_usd_eur'] == pytest.approx(1 / 1.09)
+
+
+class TestAsgiApp:
+    """Tests du dispatch ASGI"""
+    
+    def request(self, app, path):
+        asgi_app = AsgiApp(app, ASYNC_ROUTES)
+        
+        async def get():
+            transport = httpx.ASGITransport(app=asgi_app)
+            async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+                return await client.get(path)
+        
+        response, _ = run(app, get)
+        return response
+    
+    def test_async_route(self, app):
+        """Test d'une route servie en asyncio"""
+        response = self.request(app, '/api/currencies/rates?base=EUR&symbols=USD,JPY')
+        
+        assert response.status_code == 200
+        assert response.headers['content-type'] == 'application/json'
+        data = response.json()
+        assert data['base'] == 'EUR'
+        assert data['rates'] == {'USD': 1.09, 'JPY': 161.5}
+    
+    def test_as_of_route(self, app):
+        """Test des taux historiques (lecture synchrone dans un thread)"""
+        ExchangeRate('EUR', 'USD', Decimal('1.08'), 'ecb', created_at=datetime(2024, 3, 14, 16)).save()
+        
+        response = self.request(app, '/api/currencies/rates?base=EUR&symbols=USD&as_of=2024-03-15T00:00:00Z')
+        
+        assert response.status_code == 200
+        assert response.json()['rates'] == {'USD': 1.08}
+    
+    def test_other_routes_served_by_wsgi(self, app):
+        """Test des autres routes transmises à l'application WSGI"""
+        response = self.request(app, '/api/unknown')
+        
+        assert response.status_code == 404
+        assert response.json() == {'error': 'Resource not found'}
@@ -0,0 +1,62 @@
+# tests/test_auth_context.py
+from datetime import timedelta
+import pytest
+from flask_jwt_extended import create_access_token, view_decorators
+from flask_jwt_extended.exceptions import NoAuthorizationError
+from jwt import ExpiredSignatureError
+from app.middleware.auth_middleware import auth_required, get_auth_context, optional_auth, token_required
+from app.middleware.rate_limiter import get_user_id
+
+
+@pytest.fixture
+def decode_count(monkeypatch):
+    """Compte les décodages de token effectués par flask-jwt-extended"""
+    calls = []
+    decode_token = view_decorators.decode_token
+    
+    def counting_decode_token(*args, **kwargs):
+        calls.append(args)
+        return decode_token(*args, **kwargs)
+    
+    monkeypatch.setattr(view_decorators, 'decode_token', counting_decode_token)
+    return calls
+
+
+class TestAuthContext:
+    """Tests du contexte d'authentification par requête"""
+    
+    def test_token_decoded_once(self, app, decode_count):
+        """Test: limiter, décorateurs et route partagent un seul décodage"""
+        token = create_access_token(identity='user-1', additional_claims={'session_id': 'session-1'})
+        
+        @auth_required
+        @optional_auth
+        def view():
+            return get_auth_context()
+        
+        with app.test_request_context(headers={'Authorization': f'Bearer {token}'}):
+            assert get_user_id() == 'user-1'
+            context = view()
+            
+            assert context.user_id == 'user-1'
+            assert context.claims['session_id'] == 'session-1'
+            assert len(decode_count) == 1
+    
+    def test_anonymous_request(self, app, decode_count):
+        """Test: sans token, clé du limiter par adresse IP et accès protégé refusé"""
+        with app.test_request_context(environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            assert get_user_id() == '10.0.0.1'
+            with pytest.raises(NoAuthorizationError):
+                auth_required(lambda: None)()
+            assert token_required(lambda: None)()[1] == 401
+    
+    def test_invalid_token_error_kept(self, app):
+        """Test: l'erreur de vérification est relancée pour les callbacks JWT"""
+        token = create_access_token(identity='user-1', expires_delta=timedelta(seconds=-1))
+        
+        with app.test_request_context(headers={'Authorization': f'Bearer {token}'},
+                                      environ_base={'REMOTE_ADDR': '10.0.0.1'}):
+            assert get_user_id() == '10.0.0.1'
+            assert isinstance(get_auth_context().error, ExpiredSignatureError)
+            with pytest.raises(ExpiredSignatureError):
+                auth_required(lambda: None)()
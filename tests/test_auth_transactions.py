@@ -0,0 +1,86 @@
+# tests/test_auth_transactions.py
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.token_service import TokenService
+from app.utils.exceptions import AuthenticationError
+
+
+@contextmanager
+def count_round_trips():
+    """Compte les requêtes SQL et les commits émis dans le bloc"""
+    counts = {'statements': 0, 'commits': 0}
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counts['statements'] += 1
+    
+    def commit(conn):
+        counts['commits'] += 1
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    event.listen(db.engine, 'commit', commit)
+    try:
+        yield counts
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+        event.remove(db.engine, 'commit', commit)
+
+
+class TestAuthTransactions:
+    """Tests des transactions de connexion et de rafraîchissement"""
+    
+    def test_login_single_transaction(self, app):
+        """Test: connexion en un commit (lecture utilisateur + comptage des sessions en une requête)"""
+        User.create_user('login@example.com', 'password123', 'Login', 'Test')
+        db.session.expunge_all()
+        
+        with count_round_trips() as counts:
+            result = AuthService.authenticate_user('login@example.com', 'password123')
+        
+        # SELECT utilisateur, INSERT session, INSERT refresh token, UPDATE last_login
+        assert counts == {'statements': 4, 'commits': 1}
+        
+        token = RefreshToken.query.filter_by(session_id=result['session'].id).one()
+        assert token.jti == TokenService.get_jti_from_token(result['refresh_token'])
+        assert User.find_by_email('login@example.com').last_login is not None
+    
+    def test_login_session_limit(self, app):
+        """Test: la limite de sessions est vérifiée sans requête supplémentaire"""
+        User.create_user('limit@example.com', 'password123', 'Limit', 'Test')
+        for _ in range(app.config['MAX_SESSIONS_PER_USER']):
+            AuthService.authenticate_user('limit@example.com', 'password123')
+        
+        with pytest.raises(AuthenticationError):
+            AuthService.authenticate_user('limit@example.com', 'password123')
+    
+    def test_refresh_single_transaction(self, app):
+        """Test: rafraîchissement en un commit, l'ancien token ne peut plus servir"""
+        user_id = User.create_user('refresh@example.com', 'password123', 'Refresh', 'Test').id
+        login = AuthService.authenticate_user('refresh@example.com', 'password123')
+        jti = RefreshToken.query.filter_by(session_id=login['session'].id).one().jti
+        db.session.expunge_all()
+        
+        with count_round_trips() as counts:
+            AuthService.refresh_tokens(jti, user_id)
+        
+        # SELECT token + session + utilisateur, UPDATE révocation, INSERT token, UPDATE session
+        assert counts == {'statements': 4, 'commits': 1}
+        
+        with pytest.raises(AuthenticationError):
+            AuthService.refresh_tokens(jti, user_id)
+        assert RefreshToken.query.filter_by(user_id=user_id, is_revoked=False).count() == 1
+    
+    def test_claim_once(self, app):
+        """Test: la révocation conditionnelle ne réussit qu'une fois (rafraîchissements concurrents)"""
+        User.create_user('claim@example.com', 'password123', 'Claim', 'Test')
+        login = AuthService.authenticate_user('claim@example.com', 'password123')
+        token = RefreshToken.query.filter_by(session_id=login['session'].id).one()
+        
+        assert token.claim() is True
+        db.session.commit()
+        assert token.claim() is False
+        db.session.rollback()
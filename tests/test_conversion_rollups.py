@@ -0,0 +1,65 @@
+# tests/test_conversion_rollups.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.extensions import db
+from app.models.conversion import Conversion
+from app.models.conversion_rollup import (
+    PairConversionHourly, UserConversionDaily, rebuild_conversion_rollups
+)
+from app.models.user import User
+
+
+def add_conversions(user_id):
+    """Ajoute des conversions sur deux paires et deux jours"""
+    now = datetime.utcnow()
+    conversions = [
+        Conversion('USD', 'EUR', 100, 90, '0.90', user_id=user_id, fee_amount='1'),
+        Conversion('USD', 'EUR', 50, 45, '0.90', user_id=user_id, fee_amount='0.5'),
+        Conversion('EUR', 'GBP', 10, 8.5, '0.85', user_id=user_id, fee_amount='0.1',
+                   created_at=now - timedelta(days=2)),
+        Conversion('USD', 'EUR', 20, 18, '0.90'),  # Anonyme
+    ]
+    for conversion in conversions:
+        conversion.save()
+
+
+class TestConversionRollups:
+    """Tests des agrégats de conversions"""
+    
+    def test_incremental_rollups(self, app):
+        """Test de la mise à jour des agrégats à chaque conversion"""
+        user = User.create_user('rollup@example.com', 'password123', 'Rollup', 'Test')
+        add_conversions(user.id)
+        
+        stats = Conversion.get_user_stats(user.id, datetime.utcnow() - timedelta(days=30))
+        
+        assert stats['total_conversions'] == 3
+        assert stats['total_volume'] == Decimal('160')
+        assert stats['total_fees'] == Decimal('1.6')
+        assert stats['currencies_used'] == 2
+        assert stats['popular_pairs'][0] == {'from_currency': 'USD', 'to_currency': 'EUR', 'count': 2}
+        
+        volume = Conversion.get_volume_stats('USD', days=30)
+        assert volume['total_conversions'] == 3
+        assert volume['total_volume'] == 170.0
+        
+        pairs = Conversion.get_popular_pairs(days=30)
+        assert (pairs[0].from_currency, pairs[0].to_currency, pairs[0].conversion_count) == ('USD', 'EUR', 3)
+    
+    def test_rebuild_matches_incremental(self, app):
+        """Test: la reconstruction depuis l'historique donne les mêmes agrégats"""
+        user = User.create_user('rebuild@example.com', 'password123', 'Rebuild', 'Test')
+        add_conversions(user.id)
+        
+        def snapshot():
+            daily = {(row.day, row.from_currency, row.to_currency): (row.conversion_count, row.total_volume)
+                     for row in UserConversionDaily.query.all()}
+            hourly = {(row.hour, row.from_currency, row.to_currency): (row.conversion_count, row.total_volume)
+                      for row in PairConversionHourly.query.all()}
+            return daily, hourly
+        
+        incremental = snapshot()
+        assert rebuild_conversion_rollups() == 4
+        db.session.expire_all()
+        
+        assert snapshot() == incremental
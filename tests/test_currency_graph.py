@@ -0,0 +1,123 @@
+# tests/test_currency_graph.py
+import contextlib
+from datetime import datetime, timedelta
+from decimal import Decimal
+import threading
+from app.services import currency_graph_service
+from app.services.currency_graph_service import CurrencyGraph, CurrencyGraphService
+
+
+def make_rate(from_currency, to_currency, rate, minutes_ago=0, provider='test'):
+    return {
+        'from_currency': from_currency,
+        'to_currency': to_currency,
+        'rate': Decimal(rate),
+        'provider': provider,
+        'timestamp': datetime.utcnow() - timedelta(minutes=minutes_ago)
+    }
+
+
+class TestCurrencyGraph:
+    """Tests pour le graphe des devises"""
+    
+    def test_direct_and_inverse_rate(self):
+        """Test d'une paire directe et de son inverse"""
+        graph = CurrencyGraph([make_rate('EUR', 'USD', '1.25')])
+        
+        assert graph.resolve('EUR', 'USD')['rate'] == Decimal('1.25')
+        assert graph.resolve('USD', 'EUR')['rate'] == Decimal('0.8')
+    
+    def test_multi_hop_route(self):
+        """Test d'une paire non cotée résolue via une devise pivot"""
+        graph = CurrencyGraph([
+            make_rate('EUR', 'USD', '1.25'),
+            make_rate('BTC', 'USD', '50000'),
+        ])
+        
+        route = graph.resolve('EUR', 'BTC')
+        assert route['path'] == ['EUR', 'USD', 'BTC']
+        assert route['hops'] == 2
+        assert route['rate'] == Decimal('1.25') / Decimal('50000')
+    
+    def test_prefers_fewest_hops(self):
+        """Test de la préférence pour le chemin le plus court"""
+        graph = CurrencyGraph([
+            make_rate('EUR', 'USD', '1.25', minutes_ago=30),
+            make_rate('EUR', 'GBP', '0.85'),
+            make_rate('GBP', 'USD', '1.5'),
+        ])
+        
+        assert graph.resolve('EUR', 'USD')['path'] == ['EUR', 'USD']
+    
+    def test_prefers_freshest_route(self):
+        """Test de la préférence pour le chemin le plus frais à nombre de sauts égal"""
+        graph = CurrencyGraph([
+            make_rate('EUR', 'USD', '1.25', minutes_ago=30),
+            make_rate('USD', 'BTC', '0.00002', minutes_ago=30),
+            make_rate('EUR', 'GBP', '0.85'),
+            make_rate('GBP', 'BTC', '0.00003'),
+        ])
+        
+        assert graph.resolve('EUR', 'BTC')['path'] == ['EUR', 'GBP', 'BTC']
+    
+    def test_stale_and_unknown_routes(self):
+        """Test des paires inconnues ou trop anciennes"""
+        graph = CurrencyGraph([make_rate('EUR', 'USD', '1.25', minutes_ago=120)])
+        
+        assert graph.resolve('EUR', 'JPY') is None
+        assert graph.resolve('EUR', 'USD', max_age=timedelta(hours=1)) is None
+    
+    def test_max_hops(self):
+        """Test de la limite du nombre de sauts"""
+        graph = CurrencyGraph([
+            make_rate('AAA', 'BBB', '2'),
+            make_rate('BBB', 'CCC', '2'),
+            make_rate('CCC', 'DDD', '2'),
+        ], max_hops=2)
+        
+        assert graph.resolve('AAA', 'CCC')['rate'] == Decimal('4')
+        assert graph.resolve('AAA', 'DDD') is None
+    
+    def test_service_min_hops(self, monkeypatch):
+        """Test: le taux direct d'une paire n'est pas servi comme route quand min_hops=2"""
+        monkeypatch.setattr(CurrencyGraphService, '_graph', None)  # Graphe de classe restauré après le test
+        CurrencyGraphService.refresh([
+            make_rate('EUR', 'USD', '1.25', minutes_ago=30),
+            make_rate('USD', 'JPY', '150'),
+        ])
+        
+        assert CurrencyGraphService.resolve('EUR', 'USD')['hops'] == 1
+        assert CurrencyGraphService.resolve('EUR', 'USD', min_hops=2) is None
+        assert CurrencyGraphService.resolve('EUR', 'JPY', min_hops=2)['rate'] == Decimal('187.5')
+    
+    def test_single_rebuild(self, monkeypatch):
+        """Test: un graphe expiré n'est reconstruit que par un thread à la fois"""
+        monkeypatch.setattr(CurrencyGraphService, '_graph', None)
+        CurrencyGraphService.refresh([make_rate('EUR', 'USD', '1.25')])
+        CurrencyGraphService._graph.built_at = datetime(2000, 1, 1)
+        
+        loads = []
+        started = threading.Event()
+        release = threading.Event()
+        
+        def load_snapshot():
+            loads.append(1)
+            started.set()
+            release.wait(5)
+            return [make_rate('EUR', 'USD', '1.30')]
+        
+        monkeypatch.setattr(CurrencyGraphService, '_load_snapshot', staticmethod(load_snapshot))
+        monkeypatch.setattr(currency_graph_service, 'read_only', contextlib.nullcontext)
+        
+        rebuilder = threading.Thread(target=CurrencyGraphService.get_graph)
+        rebuilder.start()
+        started.wait(5)
+        
+        # Pendant la reconstruction, les autres threads lisent le graphe expiré
+        stale = CurrencyGraphService.get_graph()
+        release.set()
+        rebuilder.join()
+        
+        assert stale.resolve('EUR', 'USD')['rate'] == Decimal('1.25')
+        assert CurrencyGraphService.get_graph().resolve('EUR', 'USD')['rate'] == Decimal('1.30')
+        assert len(loads) == 1
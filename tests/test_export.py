@@ -0,0 +1,88 @@
+# tests/test_export.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+import os
+import pytest
+from app.config.base import BaseConfig
+from app.extensions import db
+from app.models.conversion import Conversion
+from app.services.export_service import ExportService
+
+pq = pytest.importorskip('pyarrow.parquet')
+
+
+def add_conversion(from_currency, to_currency, created_at):
+    """Enregistre une conversion anonyme à une date donnée"""
+    conversion = Conversion(from_currency, to_currency, Decimal('100'), Decimal('92'),
+                            Decimal('0.92'), created_at=created_at, ip_address='127.0.0.1')
+    db.session.add(conversion)
+    db.session.commit()
+    return conversion
+
+
+def read_rows(export_dir, table_name):
+    """Toutes les lignes exportées d'une table"""
+    rows = []
+    for root, _, files in os.walk(os.path.join(export_dir, table_name)):
+        for name in sorted(files):
+            rows.extend(pq.read_table(os.path.join(root, name)).to_pylist())
+    return rows
+
+
+class TestExport:
+    """Tests de l'export Parquet incrémental"""
+    
+    def test_partitioned_by_day_and_pair(self, app, tmp_path):
+        """Test: un répertoire par jour et par paire, sans données de tracking"""
+        add_conversion('USD', 'EUR', datetime(2024, 3, 1, 10))
+        add_conversion('USD', 'GBP', datetime(2024, 3, 1, 11))
+        add_conversion('USD', 'EUR', datetime(2024, 3, 2, 9))
+        
+        assert ExportService.export_table('conversions', export_dir=str(tmp_path)) == 3
+        
+        assert os.path.isdir(tmp_path / 'conversions' / 'day=2024-03-01' / 'pair=USD_EUR')
+        assert os.path.isdir(tmp_path / 'conversions' / 'day=2024-03-01' / 'pair=USD_GBP')
+        assert os.path.isdir(tmp_path / 'conversions' / 'day=2024-03-02' / 'pair=USD_EUR')
+        
+        rows = read_rows(str(tmp_path), 'conversions')
+        assert len(rows) == 3
+        assert 'ip_address' not in rows[0]
+        assert rows[0]['original_amount'] == Decimal('100')
+    
+    def test_incremental(self, app, tmp_path):
+        """Test: seules les lignes postérieures au dernier export sont réécrites"""
+        add_conversion('USD', 'EUR', datetime(2024, 3, 1, 10))
+        ExportService.export_table('conversions', export_dir=str(tmp_path))
+        
+        add_conversion('USD', 'EUR', datetime(2024, 3, 1, 12))
+        assert ExportService.export_table('conversions', export_dir=str(tmp_path)) == 1
+        assert ExportService.export_table('conversions', export_dir=str(tmp_path)) == 0
+        
+        assert len(read_rows(str(tmp_path), 'conversions')) == 2
+    
+    def test_batches_bound_memory(self, app, tmp_path):
+        """Test: les tampons sont écrits par lots de batch_size lignes"""
+        for hour in range(5):
+            add_conversion('USD', 'EUR', datetime(2024, 3, 1, hour))
+        
+        ExportService.export_table('conversions', export_dir=str(tmp_path), batch_size=2)
+        
+        directory = tmp_path / 'conversions' / 'day=2024-03-01' / 'pair=USD_EUR'
+        assert len(os.listdir(directory)) == 3
+        assert len(read_rows(str(tmp_path), 'conversions')) == 5
+    
+    def test_recent_rows_wait_for_lag(self, app, tmp_path):
+        """Test: les lignes plus récentes que EXPORT_LAG sont reportées, pas sautées"""
+        recent = datetime.utcnow()
+        add_conversion('USD', 'EUR', datetime(2024, 3, 1, 10))
+        add_conversion('USD', 'EUR', recent)
+        
+        assert ExportService.export_table('conversions', export_dir=str(tmp_path)) == 1
+        
+        # Une ligne committée plus tard avec une date antérieure reste exportable
+        add_conversion('USD', 'GBP', recent - timedelta(seconds=1))
+        BaseConfig.EXPORT_LAG, lag = 0, BaseConfig.EXPORT_LAG
+        try:
+            assert ExportService.export_table('conversions', export_dir=str(tmp_path)) == 2
+        finally:
+            BaseConfig.EXPORT_LAG = lag
@@ -0,0 +1,69 @@
+# tests/test_ids.py
+import os
+import tempfile
+import time
+import uuid
+import pytest
+from flask import Flask
+from sqlalchemy import Column, MetaData, Table, create_engine, select
+from sqlalchemy.exc import StatementError
+from werkzeug.exceptions import NotFound
+from app.models.base import IdType
+from app.utils.ids import new_id, uuid7
+
+
+class TestIds:
+    """Tests des identifiants ordonnés dans le temps"""
+    
+    def test_uuid7_format(self):
+        """Test de la version et de la variante RFC"""
+        value = uuid7()
+        
+        assert value.version == 7
+        assert value.variant == uuid.RFC_4122
+    
+    def test_uuid7_time_ordered(self):
+        """Test: les identifiants générés à des millisecondes différentes sont croissants"""
+        ids = []
+        for _ in range(5):
+            ids.append(str(uuid7()))
+            time.sleep(0.002)
+        
+        assert ids == sorted(ids)
+        assert uuid.UUID(new_id()).version == 7
+    
+    def test_binary_storage_roundtrip(self):
+        """Test du stockage binaire (16 octets) des identifiants"""
+        db_fd, db_path = tempfile.mkstemp()
+        engine = create_engine(f'sqlite:///{db_path}')
+        metadata = MetaData()
+        table = Table('ids', metadata, Column('id', IdType('binary'), primary_key=True))
+        metadata.create_all(engine)
+        
+        value = new_id()
+        with engine.begin() as connection:
+            connection.execute(table.insert().values(id=value))
+            
+            assert connection.execute(select(table.c.id)).scalar() == value
+            assert connection.exec_driver_sql('SELECT length(id) FROM ids').scalar() == 16
+            
+            # Le type reste strict: les ids des clients sont validés en amont
+            with pytest.raises(StatementError):
+                connection.execute(select(table).where(table.c.id != 'not-an-id'))
+        
+        engine.dispose()
+        os.close(db_fd)
+        os.unlink(db_path)
+    
+    def test_route_ids_validated(self):
+        """Test: un id de session mal formé dans l'URL donne un 404 avant toute requête SQL"""
+        from app.routes.auth import auth_bp
+        
+        flask_app = Flask(__name__)
+        flask_app.register_blueprint(auth_bp, url_prefix='/api/auth')
+        urls = flask_app.url_map.bind('localhost')
+        
+        value = new_id()
+        assert urls.match(f'/api/auth/sessions/{value}', method='DELETE')[1] == {'session_id': uuid.UUID(value)}
+        with pytest.raises(NotFound):
+            urls.match('/api/auth/sessions/not-an-id', method='DELETE')
@@ -0,0 +1,80 @@
+# tests/test_json_provider.py
+from datetime import datetime
+from decimal import Decimal
+import json
+import uuid
+import pytest
+from flask import jsonify
+from app.models.exchange_rate import ExchangeRate
+from app.utils.json_provider import OrjsonProvider, StdJSONProvider, orjson
+
+
+PAYLOAD = {
+    'amount': Decimal('0.12345678'),
+    'timestamp': datetime(2024, 3, 15, 16, 0, 0, 250000),
+    'id': uuid.UUID('01890a5d-ac96-774b-bcce-b302099a8057'),
+    'count': 3,
+}
+
+
+def render(app, provider_class, mode, value=PAYLOAD):
+    """Sérialise value avec un provider configuré en JSON_DECIMAL_MODE=mode"""
+    app.config['JSON_DECIMAL_MODE'] = mode
+    app.json = provider_class(app)
+    with app.test_request_context():
+        return jsonify(value).get_data(as_text=True)
+
+
+PROVIDERS = [StdJSONProvider]
+if orjson is not None:
+    PROVIDERS.append(OrjsonProvider)
+
+
+class TestJSONProvider:
+    """Tests des providers JSON (Decimal, datetime, UUID natifs)"""
+    
+    @pytest.mark.parametrize('provider_class', PROVIDERS)
+    def test_native_types(self, app, provider_class):
+        """Test des types natifs, ordre des champs conservé"""
+        data = json.loads(render(app, provider_class, 'float'))
+        
+        assert list(data) == ['amount', 'timestamp', 'id', 'count']
+        assert data == {
+            'amount': 0.12345678,
+            'timestamp': '2024-03-15T16:00:00.250000',
+            'id': '01890a5d-ac96-774b-bcce-b302099a8057',
+            'count': 3
+        }
+    
+    @pytest.mark.parametrize('provider_class', PROVIDERS)
+    def test_decimal_as_string(self, app, provider_class):
+        """Test des Decimal exacts en chaîne"""
+        data = json.loads(render(app, provider_class, 'string', {'rate': Decimal('1.10000000')}))
+        
+        assert data == {'rate': '1.10000000'}
+    
+    def test_decimal_as_exact_number(self, app):
+        """Test des Decimal exacts en nombre JSON (orjson >= 3.10)"""
+        if orjson is None or not hasattr(orjson, 'Fragment'):
+            pytest.skip("orjson >= 3.10 requis")
+        
+        body = render(app, OrjsonProvider, 'number', {'rate': Decimal('0.1000000000000000055511151231')})
+        
+        assert json.loads(body, parse_float=Decimal) == {'rate': Decimal('0.1000000000000000055511151231')}
+    
+    def test_invalid_mode(self, app):
+        """Test d'un mode de sérialisation des Decimal inconnu"""
+        app.config['JSON_DECIMAL_MODE'] = 'double'
+        
+        with pytest.raises(ValueError):
+            StdJSONProvider(app)
+    
+    def test_model_raw_values(self, app):
+        """Test de la réponse d'un modèle sérialisé sans conversion par champ"""
+        rate = ExchangeRate('USD', 'EUR', Decimal('0.91'), 'test').save()
+        
+        with app.test_request_context():
+            data = jsonify(rate.to_dict()).get_json()
+        
+        assert data['rate'] == 0.91
+        assert data['timestamp'] == rate.created_at.isoformat()
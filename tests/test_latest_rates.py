@@ -0,0 +1,43 @@
+# tests/test_latest_rates.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.extensions import db
+from app.models.exchange_rate import ExchangeRate
+from app.models.latest_exchange_rate import LatestExchangeRate
+
+
+class TestLatestRates:
+    """Tests pour la table des derniers taux"""
+    
+    def test_update_or_create_upserts_latest(self, app):
+        """Test de l'historique en ajout et du dernier taux mis à jour sur place"""
+        ExchangeRate.update_or_create('USD', 'EUR', '0.90', 'ecb')
+        ExchangeRate.update_or_create('USD', 'EUR', '0.91', 'ecb')
+        
+        assert ExchangeRate.query.count() == 2
+        assert LatestExchangeRate.query.count() == 1
+        
+        latest = ExchangeRate.get_latest_rate('usd', 'eur')
+        assert latest.rate == Decimal('0.91')
+        assert latest.provider == 'ecb'
+        assert not latest.is_stale()
+    
+    def test_out_of_order_write_is_ignored(self, app):
+        """Test d'une écriture plus ancienne que le dernier taux connu"""
+        now = datetime.utcnow()
+        LatestExchangeRate.upsert('USD', 'EUR', '0.91', 'ecb', timestamp=now)
+        LatestExchangeRate.upsert('USD', 'EUR', '0.80', 'ecb', timestamp=now - timedelta(minutes=5))
+        db.session.commit()
+        
+        assert LatestExchangeRate.get_latest('USD', 'EUR').rate == Decimal('0.91')
+    
+    def test_rebuild_from_history(self, app):
+        """Test de la reconstruction depuis l'historique"""
+        now = datetime.utcnow()
+        db.session.add(ExchangeRate('USD', 'EUR', '0.90', 'ecb', created_at=now - timedelta(hours=1)))
+        db.session.add(ExchangeRate('USD', 'EUR', '0.92', 'ecb', created_at=now))
+        db.session.add(ExchangeRate('USD', 'EUR', '0.93', 'fixer', created_at=now - timedelta(hours=2)))
+        db.session.commit()
+        
+        assert LatestExchangeRate.rebuild_from_history() == 2
+        assert LatestExchangeRate.get_latest('USD', 'EUR').rate == Decimal('0.92')
@@ -0,0 +1,54 @@
+# tests/test_pagination.py
+from datetime import datetime, timedelta
+import pytest
+from app.extensions import db
+from app.models.conversion import Conversion
+from app.models.user import User
+from app.services.conversion_service import ConversionService
+from app.utils.exceptions import ValidationError
+from app.utils.ids import new_id
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+class TestKeysetPagination:
+    """Tests de la pagination par curseur de l'historique"""
+    
+    def test_cursor_roundtrip(self):
+        """Test de l'encodage/décodage des curseurs"""
+        created_at = datetime(2024, 3, 15, 16, 0, 0, 123456)
+        row_id = new_id()
+        
+        assert decode_cursor(encode_cursor(created_at, row_id)) == (created_at, row_id)
+        
+        with pytest.raises(ValidationError):
+            decode_cursor('not-a-cursor')
+        with pytest.raises(ValidationError):
+            decode_cursor(encode_cursor(created_at, 'not-an-id'))
+    
+    def test_pages_cover_history(self, app):
+        """Test: les pages successives couvrent tout l'historique, sans doublon"""
+        user = User.create_user('pages@example.com', 'password123', 'Pages', 'Test')
+        same_time = datetime.utcnow() - timedelta(hours=1)
+        
+        # Plusieurs conversions à la même date pour vérifier le départage par id
+        for i in range(7):
+            created_at = same_time if i < 4 else same_time + timedelta(minutes=i)
+            db.session.add(Conversion('USD', 'EUR', 10 + i, 9 + i, '0.90',
+                                      user_id=user.id, created_at=created_at))
+        db.session.commit()
+        
+        service = ConversionService()
+        seen = []
+        cursor = None
+        while True:
+            page = service.get_user_conversion_page(user.id, limit=3, cursor=cursor, with_total=True)
+            seen.extend(item['id'] for item in page['history'])
+            assert page['approximate_total'] == 7
+            
+            if not page['has_more']:
+                break
+            cursor = page['next_cursor']
+        
+        expected = [conversion.id for conversion in Conversion.get_user_history(user.id, limit=10)]
+        assert seen == expected
+        assert len(set(seen)) == 7
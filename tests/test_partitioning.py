@@ -0,0 +1,44 @@
+# tests/test_partitioning.py
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.conversion import Conversion
+from app.models.exchange_rate import ExchangeRate
+from app.services.partition_service import PartitionService, add_months, month_start, partition_name
+
+
+class TestPartitioning:
+    """Tests du partitionnement mensuel et de la rétention"""
+    
+    def test_month_helpers(self):
+        """Test du calcul des bornes et noms de partitions"""
+        month = month_start(datetime(2024, 11, 17, 8, 30))
+        
+        assert month == datetime(2024, 11, 1)
+        assert add_months(month, 2) == datetime(2025, 1, 1)
+        assert add_months(month, -11) == datetime(2023, 12, 1)
+        assert partition_name('conversions', month) == 'conversions_p2024_11'
+    
+    def test_sqlite_is_not_partitioned(self, app):
+        """Test: sans PostgreSQL, aucune table n'est partitionnée"""
+        assert not PartitionService.is_partitioned('conversions')
+        assert PartitionService.maintain_partitions() == []
+    
+    def test_cleanup_old_rates(self, app):
+        """Test de la rétention des taux (suppression en masse hors partitionnement)"""
+        now = datetime.utcnow()
+        db.session.add(ExchangeRate('USD', 'EUR', '0.80', 'test', created_at=now - timedelta(days=400)))
+        db.session.add(ExchangeRate('USD', 'EUR', '0.90', 'test', created_at=now))
+        db.session.commit()
+        
+        assert ExchangeRate.cleanup_old_rates(days=365) == 1
+        assert ExchangeRate.query.count() == 1
+    
+    def test_cleanup_old_conversions(self, app):
+        """Test de la rétention des conversions"""
+        old = Conversion('USD', 'EUR', 100, 90, '0.90', created_at=datetime.utcnow() - timedelta(days=100))
+        recent = Conversion('USD', 'EUR', 100, 90, '0.90')
+        db.session.add_all([old, recent])
+        db.session.commit()
+        
+        assert Conversion.cleanup_old_conversions(days=90) == 1
+        assert Conversion.query.count() == 1
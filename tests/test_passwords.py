@@ -0,0 +1,82 @@
+# tests/test_passwords.py
+import pytest
+from werkzeug.security import generate_password_hash
+from app.extensions import db
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.password_service import PasswordService
+from app.utils.exceptions import ServiceBusyError, ValidationError
+
+
+class TestPasswords:
+    """Tests du hachage des mots de passe"""
+    
+    def test_bcrypt_with_configured_cost(self, app):
+        """Test: hash bcrypt au coût configuré, vérifiable"""
+        password_hash = PasswordService.hash('password123')
+        
+        assert password_hash.startswith('$2b$04$')
+        assert PasswordService.verify('password123', password_hash)
+        assert not PasswordService.verify('wrong-password', password_hash)
+        assert not PasswordService.needs_rehash(password_hash)
+        
+        app.config['BCRYPT_LOG_ROUNDS'] = 5
+        assert PasswordService.needs_rehash(password_hash)
+    
+    def test_password_over_bcrypt_limit_rejected(self, app):
+        """Test: au-delà de 72 octets (ignorés par bcrypt), le mot de passe est refusé"""
+        with pytest.raises(ValidationError):
+            AuthService.register_user('long@example.com', 'é' * 36 + 'a1', 'Long', 'Test')
+        
+        user = AuthService.register_user('long@example.com', 'a1' * 36, 'Long', 'Test')
+        with pytest.raises(ValidationError):
+            AuthService.change_password(user.id, 'a1' * 36, 'a1' * 36 + 'b')
+    
+    def test_legacy_hash_rehashed_on_login(self, app):
+        """Test: un hash werkzeug historique est remplacé à la connexion"""
+        user = User.create_user('legacy@example.com', 'password123', 'Legacy', 'Test')
+        user.password_hash = generate_password_hash('password123', method='pbkdf2:sha256:1000')
+        db.session.commit()
+        
+        assert PasswordService.needs_rehash(user.password_hash)
+        AuthService.authenticate_user('legacy@example.com', 'password123')
+        
+        assert User.find_by_email('legacy@example.com').password_hash.startswith('$2b$04$')
+    
+    def test_long_legacy_password_not_rehashed(self, app):
+        """Test: un hash historique d'un mot de passe de plus de 72 octets n'est pas converti en bcrypt"""
+        password = 'x' * 72 + 'SECRET-TAIL-1234'
+        user = User.create_user('long-legacy@example.com', 'password123', 'Legacy', 'Test')
+        user.password_hash = generate_password_hash(password, method='pbkdf2:sha256:1000')
+        db.session.commit()
+        
+        AuthService.authenticate_user('long-legacy@example.com', password)
+        
+        user = User.find_by_email('long-legacy@example.com')
+        assert user.password_hash.startswith('pbkdf2:sha256:1000$')
+        assert not user.check_password('x' * 72 + 'anything')
+    
+    def test_other_algorithms(self, app):
+        """Test: pbkdf2 configurable, hashes bcrypt existants toujours vérifiables"""
+        bcrypt_hash = PasswordService.hash('password123')
+        app.config.update(PASSWORD_HASH_ALGORITHM='pbkdf2', PBKDF2_ITERATIONS=1000)
+        
+        password_hash = PasswordService.hash('password123')
+        assert password_hash.startswith('pbkdf2:sha256:1000$')
+        assert PasswordService.verify('password123', password_hash)
+        assert PasswordService.verify('password123', bcrypt_hash)
+        assert PasswordService.needs_rehash(bcrypt_hash)
+    
+    def test_queue_limit(self, app):
+        """Test: au-delà de la file d'attente, la vérification est refusée immédiatement"""
+        app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_LIMIT=0)
+        PasswordService._pid = None
+        _, slots = PasswordService._pool()
+        
+        slots.acquire()
+        try:
+            with pytest.raises(ServiceBusyError):
+                PasswordService.verify('password123', '$2b$04$' + 'a' * 53)
+        finally:
+            slots.release()
+            PasswordService._pid = None
@@ -0,0 +1,53 @@
+# tests/test_popularity.py
+from datetime import datetime, timedelta
+from app.config.currencies import POPULAR_PAIRS
+from app.models.conversion import Conversion
+from app.services.popularity_service import PopularityService
+
+
+NOW = datetime(2024, 6, 30, 12, 30)
+
+
+class TestPopularity:
+    """Tests du classement des paires dans Redis"""
+    
+    def test_top_pairs(self, app, redis_client):
+        """Test: classement par nombre de conversions sur la fenêtre"""
+        for _ in range(3):
+            PopularityService.record('USD', 'EUR', NOW)
+        PopularityService.record('usd', 'gbp', NOW - timedelta(hours=2))
+        PopularityService.record('EUR', 'GBP', NOW - timedelta(days=3))
+        
+        assert PopularityService.top_pairs(window=timedelta(days=7), now=NOW) == [
+            {'from_currency': 'USD', 'to_currency': 'EUR', 'count': 3},
+            {'from_currency': 'EUR', 'to_currency': 'GBP', 'count': 1},
+            {'from_currency': 'USD', 'to_currency': 'GBP', 'count': 1},
+        ]
+        
+        # Fenêtre de 24 heures: la conversion d'il y a 3 jours est exclue
+        day = PopularityService.top_pairs(window=timedelta(hours=24), now=NOW)
+        assert [pair['to_currency'] for pair in day] == ['EUR', 'GBP']
+        assert PopularityService.top_pairs(window=timedelta(days=7), limit=1, now=NOW)[0]['count'] == 3
+    
+    def test_rebuild_from_rollups(self, app, redis_client):
+        """Test: rechargement des buckets depuis les agrégats horaires"""
+        Conversion('USD', 'EUR', 100, 90, '0.90').save()
+        Conversion('USD', 'EUR', 100, 90, '0.90').save()
+        
+        assert PopularityService.rebuild_from_rollups() == 1
+        assert PopularityService.top_pairs(window=timedelta(hours=1))[0]['count'] == 2
+    
+    def test_fallback_without_redis(self, app):
+        """Test: sans Redis, le classement est lu dans les agrégats SQL"""
+        app.config['REDIS_URL'] = 'redis://localhost:1/0'
+        
+        Conversion('EUR', 'GBP', 10, 8.5, '0.85').save()
+        PopularityService.record('EUR', 'GBP')  # Sans effet, sans erreur
+        
+        assert PopularityService.top_pairs(window=timedelta(days=1)) == [
+            {'from_currency': 'EUR', 'to_currency': 'GBP', 'count': 1}
+        ]
+        
+        pairs = PopularityService.prioritized_pairs(limit=5)
+        assert pairs[0] == ('EUR', 'GBP')
+        assert pairs[1:] == [pair for pair in POPULAR_PAIRS if pair != ('EUR', 'GBP')]
@@ -0,0 +1,141 @@
+# tests/test_query_plans.py
+"""Non-régression des plans d'exécution des requêtes chaudes
+
+Chaque requête est exécutée via le modèle, les requêtes émises sont capturées puis
+passés à EXPLAIN. Le test échoue si un plan lit une table entière ou trie des
+lignes faute d'index adapté.
+
+SQLite est vérifié par défaut; pour PostgreSQL, lancer la suite avec
+DATABASE_URL=postgresql://... pytest tests/test_query_plans.py
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from sqlalchemy import event
+from app.extensions import db
+from app.models.conversion import Conversion
+from app.models.exchange_rate import ExchangeRate
+from app.models.rate_candle import RateCandle
+from app.models.refresh_token import RefreshToken
+from app.models.session import Session
+from app.models.user import User
+from app.models.user_favorite_currency import UserFavoriteCurrency
+from app.services.session_service import SessionService
+from app.utils.pagination import encode_cursor
+
+
+HOT_TABLES = {
+    'conversions', 'exchange_rates', 'latest_exchange_rates',
+    'sessions', 'refresh_tokens', 'users', 'user_favorite_currencies',
+    'user_conversion_daily', 'pair_conversion_hourly', 'rate_candles'
+}
+
+
+@contextmanager
+def capture_queries():
+    """Capture les SELECT/UPDATE/DELETE (et leurs paramètres) émis dans le bloc"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            statements.append((statement, parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def explain(statement, parameters):
+    """Retourne les lignes du plan d'exécution d'une requête"""
+    connection = db.session.connection()
+    
+    if connection.dialect.name == 'postgresql':
+        # Tables vides: on interdit scans séquentiels et tris pour vérifier
+        # qu'un index adapté existe
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        connection.exec_driver_sql('SET LOCAL enable_sort = off')
+        rows = connection.exec_driver_sql(f'EXPLAIN {statement}', parameters).fetchall()
+        return [row[0] for row in rows]
+    
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+    return [row[-1] for row in rows]
+
+
+def plan_problems(plan, allow_sort=False):
+    """Liste les étapes du plan qui trahissent un scan complet ou un tri"""
+    problems = []
+    
+    for step in plan:
+        if db.engine.dialect.name == 'postgresql':
+            # Avec enable_* = off, le planner n'utilise un scan/tri que s'il n'a pas d'autre choix
+            if 'Seq Scan' in step or ('Sort' in step and not allow_sort):
+                problems.append(step)
+        else:
+            words = step.split()
+            if step.startswith('SCAN ') and len(words) > 1 and words[1] in HOT_TABLES:
+                problems.append(step)
+            elif ('USE TEMP B-TREE FOR ORDER BY' in step or 'USE TEMP B-TREE FOR GROUP BY' in step
+                  or 'ORDER BY' in step and 'LAST TERM' in step) and not allow_sort:
+                problems.append(step)
+    
+    return problems
+
+
+def assert_indexed(query_fn, allow_sort=False):
+    """Exécute une requête chaude et vérifie ses plans d'exécution"""
+    with capture_queries() as statements:
+        query_fn()
+    
+    assert statements, "Aucune requête capturée"
+    
+    for statement, parameters in statements:
+        plan = explain(statement, parameters)
+        problems = plan_problems(plan, allow_sort=allow_sort)
+        assert not problems, f"Plan non indexé pour:\n{statement}\n{plan}"
+
+
+class TestQueryPlans:
+    """Tests des plans d'exécution des requêtes chaudes"""
+    
+    user_id = '00000000-0000-0000-0000-000000000000'
+    since = datetime(2024, 1, 1)
+    
+    def test_exchange_rate_queries(self, app):
+        """Test des lectures de taux"""
+        assert_indexed(lambda: ExchangeRate.get_latest_rate('USD', 'EUR'))
+        assert_indexed(lambda: ExchangeRate.get_rate_as_of('USD', 'EUR', self.since))
+        assert_indexed(lambda: ExchangeRate.get_rate_series('USD', 'EUR', self.since))
+        assert_indexed(lambda: ExchangeRate.get_historical_rates('USD', 'EUR', days=30))
+        assert_indexed(lambda: RateCandle.get_candles('USD', 'EUR', '1d', self.since))
+    
+    def test_conversion_history(self, app):
+        """Test de l'historique des conversions"""
+        assert_indexed(lambda: Conversion.get_user_history(self.user_id, limit=50))
+        assert_indexed(lambda: Conversion.get_user_history_page(
+            self.user_id, limit=50, cursor=encode_cursor(self.since, self.user_id)
+        ))
+    
+    def test_conversion_stats(self, app):
+        """Test des statistiques lues dans les agrégats (tri autorisé sur les groupes agrégés)"""
+        assert_indexed(lambda: Conversion.get_user_stats(self.user_id, self.since), allow_sort=True)
+        assert_indexed(lambda: Conversion.get_popular_pairs(days=30), allow_sort=True)
+        assert_indexed(lambda: Conversion.get_volume_stats('USD', days=30))
+    
+    def test_session_queries(self, app):
+        """Test des requêtes de sessions et refresh tokens"""
+        assert_indexed(lambda: SessionService.get_user_sessions(self.user_id))
+        assert_indexed(lambda: Session.find_active_session('token'))
+        assert_indexed(lambda: Session.cleanup_expired_sessions())
+        assert_indexed(lambda: RefreshToken.find_by_jti('jti'))
+        assert_indexed(lambda: RefreshToken.cleanup_expired_tokens())
+        assert_indexed(lambda: SessionService.deactivate_sessions(self.user_id))
+    
+    def test_user_queries(self, app):
+        """Test des requêtes utilisateur"""
+        user = User.create_user('plans@example.com', 'password123', 'Plan', 'Test')
+        
+        assert_indexed(lambda: User.find_by_email('plans@example.com'))
+        assert_indexed(lambda: user.get_active_sessions_count())
+        assert_indexed(lambda: User.get_profile(user.id))
+        assert_indexed(lambda: UserFavoriteCurrency.get_user_favorites(user.id))
@@ -0,0 +1,68 @@
+# tests/test_rate_candles.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.extensions import db
+from app.models.exchange_rate import ExchangeRate
+from app.models.rate_candle import RateCandle, bucket_start
+
+
+DAY = datetime(2024, 3, 15)
+
+
+def add_rates(points):
+    """Ajoute des taux USD/EUR à l'historique et aux bougies"""
+    for created_at, rate in points:
+        db.session.add(ExchangeRate('USD', 'EUR', rate, 'test', created_at=created_at))
+        RateCandle.record('USD', 'EUR', rate, created_at)
+    db.session.commit()
+
+
+class TestRateCandles:
+    """Tests des bougies OHLC"""
+    
+    def test_bucket_start(self):
+        """Test de l'alignement des buckets"""
+        timestamp = datetime(2024, 3, 15, 16, 47, 31)
+        
+        assert bucket_start(timestamp, '1m') == datetime(2024, 3, 15, 16, 47)
+        assert bucket_start(timestamp, '5m') == datetime(2024, 3, 15, 16, 45)
+        assert bucket_start(timestamp, '1h') == datetime(2024, 3, 15, 16, 0)
+        assert bucket_start(timestamp, '1d') == datetime(2024, 3, 15)
+    
+    def test_incremental_candle(self, app):
+        """Test de la mise à jour incrémentale, y compris un taux arrivé en retard"""
+        add_rates([
+            (DAY + timedelta(hours=1), '0.91'),
+            (DAY + timedelta(hours=5), '0.95'),
+            (DAY + timedelta(hours=9), '0.92'),
+            (DAY + timedelta(minutes=30), '0.90'),  # En retard: nouvelle ouverture
+        ])
+        
+        candles = RateCandle.get_candles('USD', 'EUR', '1d', DAY, DAY + timedelta(days=1))
+        
+        assert len(candles) == 1
+        candle = candles[0]
+        assert (candle.open, candle.high, candle.low, candle.close) == (
+            Decimal('0.90'), Decimal('0.95'), Decimal('0.90'), Decimal('0.92')
+        )
+        assert candle.sample_count == 4
+        
+        hourly = RateCandle.get_candles('USD', 'EUR', '1h', DAY, DAY + timedelta(days=1))
+        assert [c.bucket_start.hour for c in hourly] == [0, 1, 5, 9]
+    
+    def test_rebuild_matches_incremental(self, app):
+        """Test: la reconstruction depuis l'historique donne les mêmes bougies"""
+        add_rates([(DAY + timedelta(minutes=7 * i), str(Decimal('0.90') + Decimal(i % 5) / 100))
+                   for i in range(40)])
+        
+        def snapshot():
+            return sorted(
+                (c.interval, c.bucket_start, c.open, c.high, c.low, c.close, c.sample_count)
+                for c in RateCandle.query.all()
+            )
+        
+        incremental = snapshot()
+        assert RateCandle.rebuild_from_history() == len(incremental)
+        db.session.expire_all()
+        
+        assert snapshot() == incremental
@@ -0,0 +1,68 @@
+# tests/test_rate_compaction.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.extensions import db
+from app.models.exchange_rate import ExchangeRate
+from app.models.rate_compaction_watermark import RateCompactionWatermark
+from app.services.rate_compaction_service import RateCompactionService
+
+
+NOW = datetime(2024, 6, 30, 12, 0)
+
+
+def add_day_of_rates(day, step_minutes=20):
+    """Ajoute une journée de taux USD/EUR toutes les step_minutes minutes"""
+    for i in range(24 * 60 // step_minutes):
+        created_at = day + timedelta(minutes=step_minutes * i)
+        db.session.add(ExchangeRate('USD', 'EUR', Decimal('0.9') + Decimal(i) / 10000, 'test', created_at=created_at))
+    db.session.commit()
+
+
+def count_between(start, end):
+    """Nombre de taux USD/EUR sur une période"""
+    return ExchangeRate.query.filter(
+        ExchangeRate.created_at >= start,
+        ExchangeRate.created_at < end
+    ).count()
+
+
+class TestRateCompaction:
+    """Tests de la compaction par paliers de l'historique des taux"""
+    
+    def test_tiers(self, app):
+        """Test: pleine résolution récente, horaire puis journalière"""
+        recent = datetime(2024, 6, 28)     # < 7 jours
+        hourly = datetime(2024, 5, 1)      # < 90 jours
+        daily = datetime(2024, 1, 10)      # > 90 jours
+        for day in (recent, hourly, daily):
+            add_day_of_rates(day)
+        
+        report = RateCompactionService.compact(now=NOW)
+        
+        assert count_between(recent, recent + timedelta(days=1)) == 72
+        assert count_between(hourly, hourly + timedelta(days=1)) == 24
+        assert count_between(daily, daily + timedelta(days=1)) == 1
+        assert report['deleted'] == (72 - 24) + (72 - 1)
+        
+        # Le taux conservé est le dernier du bucket: les réponses "as of" en fin de bucket sont inchangées
+        kept = ExchangeRate.get_rate_as_of('USD', 'EUR', daily + timedelta(days=1))
+        assert kept.created_at == daily + timedelta(minutes=20 * 71)
+    
+    def test_idempotent(self, app):
+        """Test: une seconde compaction ne supprime rien"""
+        add_day_of_rates(datetime(2024, 5, 1))
+        
+        RateCompactionService.compact(now=NOW)
+        assert RateCompactionService.compact(now=NOW)['deleted'] == 0
+    
+    def test_resumes_from_watermark(self, app):
+        """Test: la compaction suivante ne relit que les jours sortis d'un palier depuis"""
+        add_day_of_rates(datetime(2024, 1, 10))
+        RateCompactionService.compact(now=NOW)
+        
+        watermark = RateCompactionWatermark.query.one()
+        assert watermark.daily_until == datetime(2024, 4, 1)
+        assert watermark.hourly_until == datetime(2024, 6, 23)
+        
+        assert RateCompactionService.compact(now=NOW)['periods'] == 0
+        assert RateCompactionService.compact(now=NOW + timedelta(days=1))['periods'] == 2
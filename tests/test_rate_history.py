@@ -0,0 +1,64 @@
+# tests/test_rate_history.py
+from datetime import datetime, timedelta
+from decimal import Decimal
+from app.extensions import db
+from app.models.exchange_rate import ExchangeRate
+from app.services.rate_history_service import RateHistoryService
+
+
+def add_rates(points):
+    """Ajoute des taux USD/EUR aux dates données"""
+    for created_at, rate in points:
+        db.session.add(ExchangeRate('USD', 'EUR', rate, 'test', created_at=created_at))
+    db.session.commit()
+
+
+class TestRateHistory:
+    """Tests pour les taux historiques ("as of")"""
+    
+    def test_rate_as_of(self, app):
+        """Test du dernier taux connu à une date donnée"""
+        now = datetime.utcnow()
+        add_rates([
+            (now - timedelta(hours=3), '0.90'),
+            (now - timedelta(hours=2), '0.91'),
+            (now - timedelta(hours=1), '0.92'),
+        ])
+        RateHistoryService.invalidate()
+        
+        rate = RateHistoryService.get_rate_as_of('USD', 'EUR', now - timedelta(minutes=90))
+        assert rate['rate'] == Decimal('0.91')
+        
+        assert RateHistoryService.get_rate_as_of('USD', 'EUR', now - timedelta(hours=4)) is None
+    
+    def test_rate_as_of_outside_memory_window(self, app):
+        """Test d'une date antérieure à la fenêtre gardée en mémoire"""
+        old = datetime.utcnow() - timedelta(days=30)
+        add_rates([(old, '0.80')])
+        RateHistoryService.invalidate()
+        
+        rate = RateHistoryService.get_rate_as_of('USD', 'EUR', old + timedelta(days=1))
+        assert rate['rate'] == Decimal('0.80')
+        # Lecture ponctuelle: la série de la paire n'est pas chargée
+        assert ('USD', 'EUR') not in RateHistoryService._series
+    
+    def test_batch_rates_as_of(self, app):
+        """Test de la récupération en lot"""
+        now = datetime.utcnow()
+        add_rates([
+            (now - timedelta(hours=3), '0.90'),
+            (now - timedelta(hours=2), '0.91'),
+            (now - timedelta(hours=1), '0.92'),
+        ])
+        
+        timestamps = [
+            now,
+            now - timedelta(hours=4),
+            now - timedelta(minutes=150),
+            now - timedelta(hours=2),
+        ]
+        rates = ExchangeRate.get_rates_as_of('USD', 'EUR', timestamps)
+        
+        assert [point[1] if point else None for point in rates] == [
+            Decimal('0.92'), None, Decimal('0.90'), Decimal('0.91')
+        ]
@@ -0,0 +1,51 @@
+# tests/test_rate_limit_storage.py
+import threading
+import time
+from limits import parse
+from limits.strategies import FixedWindowRateLimiter
+from app.middleware.rate_limit_storage import LocalBucketStorage
+
+
+class TestLocalBucketStorage:
+    """Tests du stockage local réconcilié avec Redis"""
+    
+    def test_local_limit_without_redis(self):
+        """Test: Redis injoignable, la limite reste appliquée par processus"""
+        storage = LocalBucketStorage('local+redis://localhost:1/0', socket_timeout=0.05, sync_hits=5)
+        limiter = FixedWindowRateLimiter(storage)
+        limit = parse('10/minute')
+        
+        results = [limiter.hit(limit, 'user-1') for _ in range(12)]
+        
+        assert results == [True] * 10 + [False] * 2
+        assert limiter.hit(limit, 'user-2')
+        assert storage.get(limit.key_for('user-1')) == 12
+    
+    def test_full_key_waits_for_inflight_sync(self):
+        """Test: au seuil sync_hits, le coup attend le report en cours"""
+        storage = LocalBucketStorage('local+redis://localhost:1/0', socket_timeout=0.05,
+                                     sync_interval=60, sync_hits=2)
+        storage.incr('user-1', 60)
+        storage.sync_lock.acquire()
+        threading.Timer(0.2, storage.sync_lock.release).start()
+        
+        started = time.time()
+        storage.incr('user-1', 60)
+        
+        assert time.time() - started >= 0.2
+        assert storage.retry_at > 0
+    
+    def test_bounded_over_admission(self, app, redis_client):
+        """Test: deux processus partagent la limite à sync_hits coups près chacun"""
+        uri = f"local+{app.config['REDIS_URL']}"
+        storages = [LocalBucketStorage(uri, sync_interval=60, sync_hits=5) for _ in range(2)]
+        limiters = [FixedWindowRateLimiter(storage) for storage in storages]
+        limit = parse('20/minute')
+        
+        admitted = sum(limiters[i % 2].hit(limit, 'user-1') for i in range(100))
+        for storage in storages:
+            storage.sync()
+        
+        assert 20 <= admitted <= 20 + 2 * 5
+        assert int(redis_client.get(f"ratelimit:{limit.key_for('user-1')}")) == 100
+        assert 0 < redis_client.ttl(f"ratelimit:{limit.key_for('user-1')}") <= 60
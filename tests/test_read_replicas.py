@@ -0,0 +1,64 @@
+# tests/test_read_replicas.py
+import os
+import tempfile
+import pytest
+from sqlalchemy import create_engine
+from flask import g
+from app.database import is_sticky, read_only
+from app.extensions import cache, db
+from app.middleware.auth_middleware import AuthContext
+from app.models.currency import Currency
+from app.utils.ids import new_id
+
+
+@pytest.fixture
+def replica(app):
+    """Réplica SQLite distinct du primaire, contenant une devise absente du primaire"""
+    db_fd, db_path = tempfile.mkstemp()
+    engine = create_engine(f'sqlite:///{db_path}')
+    db.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(Currency.__table__.insert().values(
+            id=new_id(), code='JPY', name='Yen', symbol='¥', is_active=True,
+            created_at=db.func.now(), updated_at=db.func.now()
+        ))
+    
+    db.engines['replica_1'] = engine
+    yield engine
+    
+    del db.engines['replica_1']
+    engine.dispose()
+    os.close(db_fd)
+    os.unlink(db_path)
+
+
+class TestReadReplicas:
+    """Tests du routage des lectures vers les réplicas"""
+    
+    def test_reads_outside_read_only_use_primary(self, app, replica):
+        """Test: hors section en lecture seule, tout passe par le primaire"""
+        assert Currency.query.filter_by(code='JPY').first() is None
+    
+    def test_read_only_selects_use_replica(self, app, replica):
+        """Test: les SELECT d'une section en lecture seule vont au réplica"""
+        with read_only():
+            assert Currency.query.filter_by(code='JPY').first() is not None
+            assert Currency.query.filter_by(code='USD').first() is None
+    
+    def test_read_your_writes(self, app, replica):
+        """Test: après une écriture, la requête relit le primaire"""
+        with app.test_request_context():
+            with read_only():
+                Currency(code='CHF', name='Swiss Franc', symbol='CHF').save()
+                assert Currency.query.filter_by(code='CHF').first() is not None
+    
+    def test_sticky_checked_once_per_request(self, app, monkeypatch):
+        """Test: le marqueur d'un utilisateur est lu une fois par requête"""
+        calls = []
+        monkeypatch.setattr(cache, 'get', lambda key: calls.append(key))
+        
+        with app.test_request_context():
+            g.auth_context = AuthContext('user-1')
+            assert [is_sticky() for _ in range(3)] == [False] * 3
+        
+        assert calls == ['db_sticky:user-1']
@@ -0,0 +1,87 @@
+# tests/test_retention.py
+from datetime import datetime, timedelta
+from app.extensions import db
+from app.models.exchange_rate import ExchangeRate
+from app.models.rate_candle import RateCandle
+from app.models.refresh_token import RefreshToken
+from app.models.session import Session
+from app.models.user import User
+from app.services.retention_service import RetentionService
+
+
+def add_old_rates(count):
+    """Ajoute des taux plus anciens que la rétention"""
+    old = datetime.utcnow() - timedelta(days=400)
+    for i in range(count):
+        db.session.add(ExchangeRate('USD', 'EUR', '0.90', 'test', created_at=old + timedelta(minutes=i)))
+    db.session.commit()
+
+
+class TestRetention:
+    """Tests du moteur de rétention par lots"""
+    
+    def test_batched_delete(self, app):
+        """Test de la suppression par lots bornés"""
+        add_old_rates(5)
+        progress = []
+        
+        removed = ExchangeRate.cleanup_old_rates(
+            days=365, batch_size=2, pause=0,
+            progress=lambda table, rows, batches: progress.append((table, rows, batches))
+        )
+        
+        assert removed == 5
+        assert ExchangeRate.query.count() == 0
+        assert progress == [('exchange_rates', 2, 1), ('exchange_rates', 4, 2), ('exchange_rates', 5, 3)]
+    
+    def test_resumable(self, app):
+        """Test de la reprise d'une exécution limitée en nombre de lots"""
+        add_old_rates(5)
+        
+        report = RetentionService.process(
+            ExchangeRate, [ExchangeRate.created_at < datetime.utcnow()],
+            batch_size=2, pause=0, max_batches=1
+        )
+        assert report == {'rows': 2, 'batches': 1, 'complete': False}
+        
+        report = RetentionService.process(
+            ExchangeRate, [ExchangeRate.created_at < datetime.utcnow()],
+            batch_size=2, pause=0
+        )
+        assert report == {'rows': 3, 'batches': 2, 'complete': True}
+        assert ExchangeRate.query.count() == 0
+    
+    def test_candle_retention_per_interval(self, app):
+        """Test: bougies 1m supprimées par lots (clé composite), 1h conservées"""
+        old = datetime.utcnow() - timedelta(days=30)
+        for i in range(3):
+            RateCandle.record('USD', 'EUR', '0.90', old + timedelta(hours=i))
+        db.session.commit()
+        
+        removed = RateCandle.cleanup_old_candles({'1m': 7}, batch_size=2, pause=0)
+        
+        assert removed == 3
+        assert RetentionService.last_report['rate_candles:1m']['complete']
+        assert RateCandle.query.filter_by(interval='1m').count() == 0
+        assert RateCandle.query.filter_by(interval='1h').count() == 3
+    
+    def test_run_all_rules(self, app):
+        """Test de l'ensemble des règles: sessions désactivées, tokens supprimés"""
+        user = User.create_user('retention@example.com', 'password123', 'Retention', 'Test')
+        session = Session(user.id, 'expired-session')
+        session.expires_at = datetime.utcnow() - timedelta(days=1)
+        session.save()
+        
+        token = RefreshToken(user.id, session.id, 'expired-jti')
+        token.expires_at = datetime.utcnow() - timedelta(days=1)
+        token.save()
+        
+        report = RetentionService.run()
+        
+        assert report['sessions']['rows'] == 1
+        assert report['refresh_tokens']['rows'] == 1
+        assert report['exchange_rates']['complete']
+        
+        db.session.expire_all()
+        assert Session.query.get(session.id).is_active is False
+        assert RefreshToken.query.count() == 0
@@ -0,0 +1,116 @@
+# tests/test_revocation.py
+from app.services.revocation_service import RevocationService
+from app.utils.bloom import BloomFilter
+
+
+class TestBloomFilter:
+    """Tests du filtre de Bloom"""
+    
+    def test_no_false_negative(self):
+        """Test: tout élément ajouté est reconnu"""
+        bloom = BloomFilter(1000, 0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        
+        assert all(item in bloom for item in items)
+        assert not bloom.is_saturated()
+    
+    def test_false_positive_rate(self):
+        """Test: le taux de faux positifs reste proche du taux configuré"""
+        bloom = BloomFilter(10000, 0.01)
+        for i in range(10000):
+            bloom.add(f"revoked-{i}")
+        
+        false_positives = sum(f"valid-{i}" in bloom for i in range(10000))
+        assert false_positives < 200
+
+
+class TestRevocation:
+    """Tests de la révocation des tokens"""
+    
+    def test_revoke_across_workers(self, app, redis_client):
+        """Test: une révocation publiée est vue par un autre worker après synchronisation"""
+        RevocationService.revoke('revoked-jti', 60)
+        assert RevocationService.is_revoked('revoked-jti')
+        assert not RevocationService.is_revoked('valid-jti')
+        
+        # Autre worker: état local vide, rejoue le flux
+        del app.extensions['revocation']
+        assert RevocationService.is_revoked('revoked-jti')
+        assert redis_client.ttl('revoked:revoked-jti') <= 60
+    
+    def test_filter_hit_confirmed_in_redis(self, app, redis_client):
+        """Test: un faux positif du filtre est infirmé par Redis"""
+        RevocationService._state().filter.add('false-positive')
+        assert not RevocationService.is_revoked('false-positive')
+    
+    def test_valid_token_without_redis(self, app):
+        """Test: sans Redis, un token absent du filtre reste valide et un token révoqué
+        localement reste refusé"""
+        app.config['REDIS_URL'] = 'redis://localhost:1/0'
+        
+        RevocationService.revoke('local-jti', 60)
+        
+        assert not RevocationService.is_revoked('valid-jti')
+        assert RevocationService.is_revoked('local-jti')
+    
+    def test_logout_all_revokes_by_generation(self, app):
+        """Test: la déconnexion globale révoque les tokens émis avant, pas ceux émis après"""
+        from flask_jwt_extended import decode_token
+        from app.models.user import User
+        from app.services.auth_service import AuthService
+        
+        user_id = User.create_user('generation@example.com', 'password123', 'Gen', 'Test').id
+        before = AuthService.authenticate_user('generation@example.com', 'password123')
+        
+        AuthService.logout_user(user_id)
+        after = AuthService.authenticate_user('generation@example.com', 'password123')
+        
+        assert RevocationService.is_token_revoked(decode_token(before['access_token']))
+        assert RevocationService.is_token_revoked(decode_token(before['refresh_token']))
+        assert not RevocationService.is_token_revoked(decode_token(after['access_token']))
+    
+    def test_generation_checked_when_stream_unavailable(self, app):
+        """Test: sans flux lisible, un autre worker relit la génération à la source"""
+        from app.models.user import User
+        from app.services.auth_service import AuthService
+        
+        app.config['REDIS_URL'] = 'redis://localhost:1/0'
+        app.config['SESSION_BACKEND'] = 'redis'  # Nettoyage du backend en échec: la déconnexion aboutit
+        user_id = User.create_user('degraded@example.com', 'password123', 'Gen', 'Test').id
+        AuthService.logout_user(user_id)
+        
+        # Autre worker: aucune génération rejouée
+        del app.extensions['revocation']
+        assert RevocationService.is_token_revoked({'sub': user_id, 'gen': 0, 'jti': 'old'})
+        assert not RevocationService.is_token_revoked({'sub': user_id, 'gen': 1, 'jti': 'new'})
+    
+    def test_session_checked_when_stream_unavailable(self, app):
+        """Test: sans flux lisible, la révocation d'une session est relue en base"""
+        from app.models.session import Session
+        from app.models.user import User
+        from app.services.auth_service import AuthService
+        
+        app.config['REDIS_URL'] = 'redis://localhost:1/0'
+        user_id = User.create_user('degraded-session@example.com', 'password123', 'Sess', 'Test').id
+        session_id = Session(user_id, 'degraded-session').save().id
+        AuthService.logout_user(user_id, session_id)
+        
+        # Autre worker: filtre vide, flux illisible
+        del app.extensions['revocation']
+        payload = {'sub': user_id, 'gen': 0, 'jti': 'jti-1', 'session_id': session_id}
+        assert RevocationService.is_token_revoked(payload)
+    
+    def test_saturated_filter_rebuilt_once(self, app, redis_client):
+        """Test: le filtre saturé est reconstruit à la taille du flux, une seule fois par intervalle"""
+        app.config['REVOCATION_FILTER_CAPACITY'] = 10
+        RevocationService.revoke_many([f"jti-{i}" for i in range(30)], 60)
+        
+        del app.extensions['revocation']
+        assert RevocationService.is_revoked('jti-0')
+        
+        state = RevocationService._state()
+        assert state.filter.capacity >= 30
+        assert not state.filter.is_saturated()
+        assert all(RevocationService.is_revoked(f"jti-{i}") for i in range(30))
@@ -0,0 +1,103 @@
+# tests/test_session_queries.py
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.extensions import db
+from app.models.refresh_token import RefreshToken
+from app.models.session import Session
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.session_service import SessionService
+from app.services.revocation_service import RevocationService
+
+
+@contextmanager
+def count_queries():
+    """Compte les requêtes SQL émises dans le bloc"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def create_sessions(user_id, count, tokens_per_session=2):
+    """Crée des sessions actives, chacune avec ses refresh tokens"""
+    sessions = []
+    for i in range(count):
+        session = SessionService.create_session(user_id)
+        for j in range(tokens_per_session):
+            RefreshToken(user_id=user_id, session_id=session.id, jti=f"{user_id[-8:]}-{i}-{j}").save()
+        sessions.append(session.id)
+    return sessions
+
+
+class TestSessionQueries:
+    """Tests du nombre de requêtes des chemins utilisateur/session"""
+    
+    def test_logout_all_fixed_queries(self, app):
+        """Test: la déconnexion globale émet le même nombre de requêtes pour 1 ou 5 sessions"""
+        counts = []
+        for email, sessions in (('one@example.com', 1), ('five@example.com', 5)):
+            user_id = User.create_user(email, 'password123', 'Logout', 'Test').id
+            create_sessions(user_id, sessions)
+            
+            with count_queries() as statements:
+                AuthService.logout_user(user_id)
+            counts.append(len(statements))
+            
+            assert Session.query.filter_by(user_id=user_id, is_active=True).count() == 0
+            assert db.session.get(User, user_id).token_generation == 1
+        
+        # Incrément de la génération de tokens, désactivation des sessions
+        assert counts[0] == counts[1] == 2
+        assert RevocationService.is_token_revoked({'sub': user_id, 'gen': 0, 'jti': 'old'})
+        assert not RevocationService.is_token_revoked({'sub': user_id, 'gen': 1, 'jti': 'new'})
+    
+    def test_logout_single_session(self, app):
+        """Test: seule la session demandée est désactivée"""
+        user = User.create_user('single@example.com', 'password123', 'Logout', 'Test')
+        kept, closed = create_sessions(user.id, 2)
+        
+        AuthService.logout_user(user.id, closed)
+        
+        assert db.session.get(Session, kept).is_active
+        assert not db.session.get(Session, closed).is_active
+        assert RevocationService.is_token_revoked({'sub': user.id, 'session_id': closed, 'jti': 'a'})
+        assert not RevocationService.is_token_revoked({'sub': user.id, 'session_id': kept, 'jti': 'b'})
+        assert SessionService.deactivate_session(closed) is False
+    
+    def test_profile_fixed_queries(self, app):
+        """Test: profil complet en deux requêtes, quel que soit le nombre de favoris et de sessions"""
+        user = User.create_user('profile@example.com', 'password123', 'Profile', 'Test')
+        for code in ('USD', 'EUR', 'GBP'):
+            user.add_favorite_currency(code)
+        create_sessions(user.id, 3, tokens_per_session=0)
+        SessionService.deactivate_sessions(user.id, Session.query.first().id)
+        user_id = user.id
+        db.session.expunge_all()
+        
+        with count_queries() as statements:
+            profile = User.get_profile(user_id).to_dict(include_sensitive=True)
+        
+        assert len(statements) == 2
+        assert sorted(profile['favorite_currencies']) == ['EUR', 'GBP', 'USD']
+        assert profile['active_sessions'] == 2
+    
+    def test_session_listing_single_query(self, app):
+        """Test: la liste des sessions et leurs champs se lisent en une requête"""
+        user = User.create_user('listing@example.com', 'password123', 'Listing', 'Test')
+        create_sessions(user.id, 4, tokens_per_session=0)
+        user_id = user.id
+        db.session.expunge_all()
+        
+        with count_queries() as statements:
+            sessions = SessionService.get_user_sessions(user_id)
+            [(s.id, s.device_type, s.ip_address, s.created_at, s.last_activity) for s in sessions]
+        
+        assert len(sessions) == 4
+        assert len(statements) == 1
@@ -0,0 +1,116 @@
+# tests/test_session_store.py
+from contextlib import contextmanager
+import pytest
+from sqlalchemy import event
+from app.extensions import db
+from app.models.refresh_token import RefreshToken
+from app.models.session import Session
+from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.session_service import SessionService
+from app.services.session_store import RedisSessionStore, SqlSessionStore
+from app.utils.exceptions import AuthenticationError
+
+
+@contextmanager
+def count_queries():
+    """Compte les requêtes SQL émises dans le bloc"""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+@pytest.fixture
+def redis_sessions(app, redis_client):
+    """Backend de sessions Redis"""
+    app.config['SESSION_BACKEND'] = 'redis'
+    return redis_client
+
+
+class TestSessionStore:
+    """Tests des backends de sessions"""
+    
+    def test_backend_selection(self, app):
+        """Test: backend SQL par défaut, Redis sur configuration"""
+        assert SessionService.store() is SqlSessionStore
+        app.config['SESSION_BACKEND'] = 'redis'
+        assert SessionService.store() is RedisSessionStore
+    
+    def test_login_limit_without_sql_count(self, app, redis_sessions):
+        """Test: la limite de sessions est comptée dans Redis"""
+        User.create_user('redis@example.com', 'password123', 'Redis', 'Test')
+        for _ in range(app.config['MAX_SESSIONS_PER_USER']):
+            AuthService.authenticate_user('redis@example.com', 'password123')
+        
+        with pytest.raises(AuthenticationError):
+            AuthService.authenticate_user('redis@example.com', 'password123')
+    
+    def test_refresh_and_activity_flush(self, app, redis_sessions):
+        """Test: le rafraîchissement ne met pas à jour la session en base avant le flush"""
+        user_id = User.create_user('flush@example.com', 'password123', 'Flush', 'Test').id
+        login = AuthService.authenticate_user('flush@example.com', 'password123')
+        session_id = login['session'].id
+        jti = RefreshToken.query.filter_by(session_id=session_id).one().jti
+        created_activity = db.session.get(Session, session_id).last_activity
+        db.session.expunge_all()
+        
+        with count_queries() as statements:
+            AuthService.refresh_tokens(jti, user_id)
+        assert not any(statement.startswith('UPDATE sessions') for statement in statements)
+        
+        assert SessionService.flush_activity() == 1
+        db.session.expunge_all()
+        assert db.session.get(Session, session_id).last_activity > created_activity
+    
+    def test_listing_and_logout(self, app, redis_sessions):
+        """Test: liste des sessions lue dans Redis, retirées à la déconnexion"""
+        user_id = User.create_user('list@example.com', 'password123', 'List', 'Test').id
+        first = AuthService.authenticate_user('list@example.com', 'password123')['session'].id
+        AuthService.authenticate_user('list@example.com', 'password123')
+        
+        with count_queries() as statements:
+            sessions = SessionService.get_user_sessions(user_id)
+        assert len(sessions) == 2 and not statements
+        
+        AuthService.logout_user(user_id, first)
+        assert [session.id for session in SessionService.get_user_sessions(user_id)] != [first]
+        assert len(SessionService.get_user_sessions(user_id)) == 1
+        
+        AuthService.logout_user(user_id)
+        assert SessionService.get_user_sessions(user_id) == []
+    
+    def test_touch_after_logout_does_not_revive(self, app, redis_sessions):
+        """Test: une activité concurrente d'une déconnexion ne recrée pas la session"""
+        User.create_user('touch@example.com', 'password123', 'Touch', 'Test')
+        session = AuthService.authenticate_user('touch@example.com', 'password123')['session']
+        RedisSessionStore.remove([(session.id, session.user_id)])
+        
+        RedisSessionStore.touch(session)
+        
+        assert not RedisSessionStore.is_active(session)
+        assert not redis_sessions.sismember('sessions:dirty', session.id)
+    
+    def test_flush_skips_deleted_sessions(self, app, redis_sessions):
+        """Test: une session supprimée en base ne fait pas échouer le lot"""
+        User.create_user('deleted@example.com', 'password123', 'Deleted', 'Test')
+        kept, deleted = (
+            AuthService.authenticate_user('deleted@example.com', 'password123')['session']
+            for _ in range(2)
+        )
+        for session in (kept, deleted):
+            RedisSessionStore.touch(session)
+        Session.query.filter_by(id=deleted.id).delete()
+        db.session.commit()
+        
+        SessionService.flush_activity()
+        
+        assert redis_sessions.scard('sessions:dirty') == 0
+        db.session.expunge_all()
+        assert db.session.get(Session, kept.id).last_activity > kept.created_at